@@ -10,9 +10,11 @@ The example shows:
 - How to pass data between States (see AlarmThing.snooze_count).
 - How to branch into multiple States (see SnoozeState).
 - How to terminate an application with States (see AlarmThing.finished).
+- How to keep data that is only needed within a State (see
+    TriggeredContext).
 """
 
-from state_of_things import State, Thing
+from state_of_things import State, StateContext, Thing, TickRunner
 
 
 class AlarmStates:
@@ -109,29 +111,38 @@ class WaitingState(State):
 AlarmStates.waiting = WaitingState()
 
 
+class TriggeredContext(StateContext):
+    """Data only needed while the alarm is triggered. It is available
+    as thing.context while in TriggeredState, and is recycled when the
+    State is exited."""
+
+    __slots__ = ("last_whoop",)
+
+    def __init__(self):
+        super().__init__()
+        self.last_whoop = 0
+
+
 class TriggeredState(State):
     """Whoops every second and then snoozes."""
 
+    context_class = TriggeredContext
+
     def enter(self, thing: AlarmThing):
         print("Alarm has triggered!")
 
-        # triggered_last_whoop was not formally declared on AlarmThing.
-        # Be very careful when using this pattern, and only when the
-        # attribute is used within a single State.
-        thing.triggered_last_whoop = 0
-
     def update(self, thing: AlarmThing) -> State:
         if thing.time_active > thing.alarm_seconds:
             # time to snooze the alarm
             return AlarmStates.snooze
 
         # use int to round time down to the nearest second
-        if int(thing.time_active) > thing.triggered_last_whoop:
+        if int(thing.time_active) > thing.context.last_whoop:
             # time for another whoop!
             print("Whoop!")
 
             # wait a second for the next whoop
-            thing.triggered_last_whoop = thing.triggered_last_whoop + 1
+            thing.context.last_whoop = thing.context.last_whoop + 1
 
         return self
 
@@ -180,9 +191,8 @@ def main():
         seconds_until_alarm=5, alarm_seconds=4, snooze_seconds=3, snoozes=2
     )
 
-    # keep updating the alarm until it is finished
-    while not thing.finished:
-        thing.update()
+    # keep updating the alarm 10 times a second until it is finished
+    TickRunner(thing, rate=10).run(until=lambda: thing.finished)
 
 
 if __name__ == "__main__":
@@ -13,10 +13,11 @@ The example shows:
     observers are typically only used for logging purposes. Code external
     to the Thing should not have logic that references the internal
     States of a Thing.
+- How to update a Thing at a fixed rate without spinning the CPU (see
+    TickRunner usage).
 """
 
-import time
-from state_of_things import State, Thing, ThingObserver
+from state_of_things import State, Thing, ThingObserver, TickRunner
 
 
 class PingPongStates:
@@ -92,10 +93,8 @@ def main():
     ping_pong.observers.attach(LoggingObserver())
 
     # keep pinging and ponging for 10.5 seconds (extra half a second
-    # to end on a Pong)
-    time_to_stop = time.monotonic() + 10.5
-    while time.monotonic() < time_to_stop:
-        ping_pong.update()
+    # to end on a Pong), updating 100 times a second
+    TickRunner(ping_pong, rate=100).run(seconds=10.5)
 
 
 if __name__ == "__main__":
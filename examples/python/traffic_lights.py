@@ -10,13 +10,16 @@ This example shows:
     and TrafficLightThing.caution_mode).
 - How to provide custom strongly typed observers (see
     TrafficLightObserver).
+- How to nest States so that a parent State handles a shared
+    transition once (see NormalState).
 """
 
 import time
-from state_of_things import State, Thing, ThingObserver
+from state_of_things import State, StateContext, Thing, ThingObserver, TickRunner
 
 
 class TrafficLightStates:
+    normal: State
     stop: State
     go: State
     slow: State
@@ -73,19 +76,33 @@ class TrafficLightThing(Thing):
         print(f"Caution mode set to {enabled}")
 
 
+class NormalState(State):
+    """Parent of the stop, go and slow States, which will transition to
+    caution if caution mode is enabled."""
+
+    def update(self, thing: TrafficLightThing) -> State:
+        if thing.caution_mode:
+            # caution mode is enabled, immediately change to caution
+            # State
+            return TrafficLightStates.caution
+
+        # let the current child State update
+        return self
+
+
+TrafficLightStates.normal = NormalState()
+
+
 class StopState(State):
-    """This State will transition to go if requested, or to caution if
-    caution mode is enabled."""
+    """This State will transition to go if requested."""
+
+    parent = TrafficLightStates.normal
 
     def enter(self, thing: TrafficLightThing):
         # notify observers of stop event
         thing.observers.notify("changed_to_stop", self)
 
     def update(self, thing: TrafficLightThing) -> State:
-        if thing.caution_mode:
-            # caution mode is enabled, change to caution State
-            return TrafficLightStates.caution
-
         if thing.should_go:
             # go State requested
             return TrafficLightStates.go
@@ -97,18 +114,15 @@ TrafficLightStates.stop = StopState()
 
 
 class GoState(State):
-    """This State will transition to slow when stop is requested, or to
-    caution if caution mode is enabled."""
+    """This State will transition to slow when stop is requested."""
+
+    parent = TrafficLightStates.normal
 
     def enter(self, thing: TrafficLightThing):
         # notify observers of go event
         thing.observers.notify("changed_to_go", self)
 
     def update(self, thing: TrafficLightThing) -> State:
-        if thing.caution_mode:
-            # caution mode is enabled, change to caution State
-            return TrafficLightStates.caution
-
         if not thing.should_go:
             # stop State requested, but need to slow first
             return TrafficLightStates.slow
@@ -121,19 +135,15 @@ TrafficLightStates.go = GoState()
 
 class SlowState(State):
     """After a number of seconds, this State will transition to go or
-    stop based on the last traffic light request. If caution mode is
-    enabled, it will immediately switch to caution State."""
+    stop based on the last traffic light request."""
+
+    parent = TrafficLightStates.normal
 
     def enter(self, thing: TrafficLightThing):
         # notify observers of slow event
         thing.observers.notify("changed_to_slow", self)
 
     def update(self, thing: TrafficLightThing) -> State:
-        if thing.caution_mode:
-            # caution mode is enabled, immediately change to caution
-            # State
-            return TrafficLightStates.caution
-
         if thing.time_active < thing.slow_seconds:
             # always wait in this State before proceeding to go or stop
             return self
@@ -149,33 +159,43 @@ class SlowState(State):
 TrafficLightStates.slow = SlowState()
 
 
+class CautionContext(StateContext):
+    """Local data only used within the caution State."""
+
+    __slots__ = ("next_blink", "blink_count")
+
+    def __init__(self):
+        super().__init__()
+        self.next_blink = 0
+        self.blink_count = 0
+
+
 class CautionState(State):
     """Stays in this State as long as caution mode is enabled, sending a
     blink notification every second. If caution mode is disabled, it
     always changes to stop State even if go was requested."""
 
+    context_class = CautionContext
+
     def enter(self, thing: TrafficLightThing):
         # notify observers of caution event
         thing.observers.notify("changed_to_caution", self)
 
-        # local attributes only used within this State
-        thing.caution_next_blink = 0
-        thing.caution_blink_count = 0
-
     def update(self, thing: TrafficLightThing) -> State:
         if not thing.caution_mode:
             # caution mode is disabled, go to stop State
             thing.stop()
             return TrafficLightStates.stop
 
-        if time.monotonic() > thing.caution_next_blink:
+        context = thing.context
+        if time.monotonic() > context.next_blink:
             # it is time to blink again, and set next blink to 1 second
             # in the future.
-            thing.caution_next_blink = time.monotonic() + 1
-            thing.caution_blink_count = thing.caution_blink_count + 1
+            context.next_blink = time.monotonic() + 1
+            context.blink_count = context.blink_count + 1
 
             # notify observers of blink event
-            thing.observers.notify("caution_blink", self, thing.caution_blink_count)
+            thing.observers.notify("caution_blink", self, context.blink_count)
 
         return self
 
@@ -234,9 +254,7 @@ def update_thing(thing: Thing, seconds_to_update: float):
         thing (Thing): the Thing to update.
         seconds_to_update (float): number of seconds to update.
     """
-    time_until_done = time.monotonic() + seconds_to_update
-    while time.monotonic() < time_until_done:
-        thing.update()
+    TickRunner(thing, rate=100).run(seconds=seconds_to_update)
 
 
 def main():
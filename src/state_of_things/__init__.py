@@ -3,5 +3,15 @@
 # SPDX-License-Identifier: MIT
 """State of Things Library"""
 
+from .context import *
 from .state_of_things import *
+from .inputs import *
 from .observers import *
+from .monitor import *
+from .fleet import *
+from .runner import *
+from .scheduler import *
+from .pool import *
+from .bus import *
+from .history import *
+from .region import *
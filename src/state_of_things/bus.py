@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.bus`
+================================================================================
+
+A shared `EventBus` that many things publish to, so that fleet-wide
+monitoring subscribes once instead of attaching an observer to every
+`Thing`.
+
+.. code-block:: python
+
+    bus = EventBus()
+    # every TrafficLightThing publishes its events to the bus
+    TrafficLightThing.bus = bus
+
+    # notified when any traffic light changes to go
+    bus.subscribe(GoCounter(), events=["changed_to_go"])
+
+    # notified of state changes into caution, from any kind of Thing
+    bus.subscribe(
+        CautionLogger(),
+        events=["state_changed"],
+        state=TrafficLightStates.caution,
+    )
+
+Subscribers are observers, and their handlers are called with the same
+params as handlers attached to :attr:`Thing.observers`.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Dict, Iterable, List, Tuple, Type
+except ImportError:  # pragma: no cover
+    pass
+
+from .state_of_things import State, Thing
+
+
+class EventBus:
+    """
+    Routes events published by things to subscribed observers. Each
+    subscription can be limited to event names, to a `Thing` class
+    (including subclasses) and to the `State` that the publishing
+    `Thing` is in.
+
+    The handlers that match an event name, `Thing` class and `State`
+    are indexed the first time they are published, so publishing only
+    costs a lookup and a call for each matching subscriber.
+    """
+
+    def __init__(self) -> None:
+        self.__subscriptions: List[Tuple] = []
+        self.__routes: Dict[Tuple, Tuple] = {}
+
+    def subscribe(
+        self,
+        observer: object,
+        events: "Iterable[str]" = None,
+        thing_class: "Type[Thing]" = None,
+        state: State = None,
+    ):
+        """
+        Subscribe an observer to events published to this bus.
+
+        Args:
+            observer (object): the observer to notify.
+            events (Iterable[str], optional): names of the only events
+            the observer will be notified of. Defaults to every event
+            the observer handles.
+            thing_class (Type[Thing], optional): only notify events
+            published by instances of this class.
+            state (State, optional): only notify events published by
+            things in this `State`.
+        """
+        self.__subscriptions.append(
+            (
+                observer,
+                frozenset(events) if events is not None else None,
+                thing_class,
+                state,
+            )
+        )
+        self.__routes.clear()
+
+    def unsubscribe(self, observer: object):
+        """
+        Remove every subscription of an observer.
+
+        Args:
+            observer (object): the observer to unsubscribe.
+        """
+        self.__subscriptions = [
+            subscription
+            for subscription in self.__subscriptions
+            if subscription[0] is not observer
+        ]
+        self.__routes.clear()
+
+    def publish(self, thing: Thing, event_name: str, params: "Tuple"):
+        """
+        Notify subscribers of an event published by a `Thing`.
+
+        Args:
+            thing (Thing): the `Thing` that published the event.
+            event_name (str): the event that occurred.
+            params (Tuple): the event data.
+        """
+        key = (event_name, type(thing), thing.current_state)
+        handlers = self.__routes.get(key)
+        if handlers is None:
+            handlers = self.__route(key)
+        for handler in handlers:
+            handler(*params)
+
+    def __route(self, key: "Tuple") -> "Tuple":
+        event_name, thing_type, state = key
+
+        handlers = []
+        for observer, events, thing_class, subscribed_state in self.__subscriptions:
+            if events is not None and event_name not in events:
+                continue
+            if thing_class is not None and not issubclass(thing_type, thing_class):
+                continue
+            if subscribed_state is not None and subscribed_state is not state:
+                continue
+            handler = getattr(observer, event_name, None)
+            if callable(handler):
+                handlers.append(handler)
+
+        handlers = self.__routes[key] = tuple(handlers)
+        return handlers
+
+    def __len__(self) -> int:
+        return len(self.__subscriptions)
@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.composite`
+================================================================================
+
+Model a `Thing` made of many child things, such as a site with hundreds
+of devices, where only the children that have something to do are
+updated on each tick.
+
+.. code-block:: python
+
+    site = SiteThing()
+    for _ in range(500):
+        site.add_child(DeviceThing())
+
+    # input for one device only makes that device dirty
+    device.dispatch("door_opened")
+
+    # timers make a device dirty when they are due
+    site.wake_after(device, 30)
+
+    while True:
+        site.update()
+
+This module uses :mod:`heapq` for timers, and is not imported by
+default.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import heapq
+
+try:
+    from typing import Callable, Dict, List, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .state_of_things import State, Thing, ThingObserver
+
+
+class CompositeObserver(ThingObserver):
+    """
+    Implement the functions of this class to receive notifications when
+    the children of a `CompositeThing` change.
+    """
+
+    def children_changed(
+        self,
+        composite: "CompositeThing",
+        changes: "List[Tuple[Thing, State, State]]",
+    ):
+        """
+        Notified once per update of a `CompositeThing` in which any of
+        its children changed `State`.
+
+        Args:
+            composite (CompositeThing): the parent of the children.
+            changes (List[Tuple[Thing, State, State]]): each child that
+            changed, with the `State` it changed from and to, in order.
+        """
+        pass
+
+
+class _ChildChanges(ThingObserver):
+    """Collects the state changes of a composite's children."""
+
+    def __init__(self, changed: "Callable[[Thing, State, State], None]") -> None:
+        self.changed = changed
+
+    def state_changed(self, thing: Thing, old_state: State, new_state: State):
+        self.changed(thing, old_state, new_state)
+
+
+def _polls(state: State) -> bool:
+    # whether a State, or one of its parents, is updated on every tick
+    # because it does not declare its inputs
+    while state is not None:
+        if state.inputs is None:
+            return True
+        state = state.parent
+    return False
+
+
+class CompositeThing(Thing):
+    """
+    A `Thing` with child things that are only updated while they are
+    dirty: when they are first added, when an event is dispatched to
+    them or one of their `Input` attributes changes, when
+    :attr:`mark_dirty` is called, when a timer set by
+    :attr:`Thing.recheck_after` or :attr:`wake_after` is due, and on the
+    update after they changed `State`, so their new `State` is updated
+    too. A tick where no child is dirty costs the same no matter how
+    many children there are.
+
+    Like a `Thing` skipping updates, this relies on each `State` of a
+    child declaring its :attr:`State.inputs`. A child whose `State` does
+    not declare them, for instance because it polls
+    :attr:`Thing.time_active`, stays dirty and is updated on every tick.
+
+    Children are updated before the composite's own `State`, so it sees
+    their latest states. Their changes are aggregated into a single
+    :attr:`CompositeObserver.children_changed` notification per update.
+    """
+
+    def __init__(self, initial_state: State, name: str = None):
+        """
+        Constructor that stores the initial `State` but does not change
+        to it until :attr:`update` is called.
+
+        Args:
+            initial_state (State): the initial `State` for this thing
+            name (str, optional): the name of this thing, usually for
+            logging. Defaults to the class name.
+        """
+        super().__init__(initial_state, name)
+        self.__children: List[Thing] = []
+        self.__child_changes = _ChildChanges(self.__child_changed)
+        # ordered set of children to update on the next tick
+        self.__dirty: Dict[Thing, None] = {}
+        # (due time, sequence, child) of pending timers
+        self.__timers: List[Tuple[float, int, Thing]] = []
+        self.__timer_sequence = 0
+        self.__changes: List[Tuple[Thing, State, State]] = []
+
+    def add_child(self, child: Thing) -> Thing:
+        """
+        Add a child `Thing`, which is dirty until its first update. The
+        child's :attr:`Thing.wake_handler` is set to make it dirty.
+
+        Args:
+            child (Thing): the child to add.
+
+        Returns:
+            Thing: the added child.
+        """
+        assert child.wake_handler is None, "child already has a wake handler"
+        child.wake_handler = self.__wake_child
+        child.observers.attach(self.__child_changes, events=["state_changed"])
+        self.__children.append(child)
+        self.__dirty[child] = None
+        return child
+
+    def remove_child(self, child: Thing):
+        """
+        Remove a child, clearing its :attr:`Thing.wake_handler` and
+        discarding its timers, so that it can be added to a composite
+        again or released to a `ThingPool`.
+
+        Args:
+            child (Thing): a child of this composite.
+        """
+        self.__children.remove(child)
+        child.wake_handler = None
+        child.observers.detach(self.__child_changes)
+        self.__dirty.pop(child, None)
+        if any(timer[2] is child for timer in self.__timers):
+            self.__timers = [timer for timer in self.__timers if timer[2] is not child]
+            heapq.heapify(self.__timers)
+
+    def mark_dirty(self, child: Thing):
+        """
+        Update a child on the next tick.
+
+        Args:
+            child (Thing): a child of this composite.
+        """
+        self.__dirty[child] = None
+
+    def dispatch_to(
+        self, child: Thing, event: str, payload: object = None, coalesce: bool = False
+    ) -> bool:
+        """
+        Send an event to a child with :attr:`Thing.dispatch`, which
+        updates the child on the next tick.
+
+        Args:
+            child (Thing): a child of this composite.
+            event (str): the name of the event.
+            payload (object, optional): data sent with the event.
+            coalesce (bool, optional): do not queue the event if an
+            equal event and payload is already waiting.
+
+        Returns:
+            bool: False if the event was dropped because the child's
+            queue is full.
+        """
+        return child.dispatch(event, payload, coalesce)
+
+    def wake_after(self, child: Thing, seconds: float):
+        """
+        Update a child once a number of seconds have passed, on this
+        composite's clock. States of the child waiting on
+        :attr:`Thing.time_active` can call :attr:`Thing.recheck_after`
+        instead.
+
+        Args:
+            child (Thing): a child of this composite.
+            seconds (float): seconds from now, on this composite's
+            :attr:`Thing.clock`.
+        """
+        self.__timer_sequence += 1
+        heapq.heappush(
+            self.__timers, (self.clock() + seconds, self.__timer_sequence, child)
+        )
+
+    def __wake_child(self, child: Thing, seconds: float):
+        if seconds is None:
+            self.__dirty[child] = None
+        else:
+            self.wake_after(child, seconds)
+
+    def __child_changed(self, child: Thing, old_state: State, new_state: State):
+        self.__changes.append((child, old_state, new_state))
+        self.__dirty[child] = None
+
+    def update(self):
+        """
+        Update the dirty children, notify observers of their changes,
+        and then update this composite's own `State`.
+        """
+        timers = self.__timers
+        if timers:
+            now = self.clock()
+            while timers and timers[0][0] <= now:
+                self.__dirty[heapq.heappop(timers)[2]] = None
+
+        if self.__dirty:
+            # children made dirty while updating wait for the next tick
+            dirty = self.__dirty
+            self.__dirty = {}
+            for child in dirty:
+                child.update()
+                if _polls(child.current_state):
+                    self.__dirty[child] = None
+
+        if self.__changes:
+            changes = self.__changes
+            self.__changes = []
+            self.observers.notify("children_changed", self, changes)
+
+        super().update()
+
+    @property
+    def children(self) -> "List[Thing]":
+        """
+        The children of this composite.
+
+        Returns:
+            List[Thing]: the children, in the order they were added.
+        """
+        return list(self.__children)
+
+    @property
+    def dirty_count(self) -> int:
+        """
+        Number of children that will be updated on the next tick,
+        not counting timers that become due.
+
+        Returns:
+            int: the number of dirty children.
+        """
+        return len(self.__dirty)
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.context`
+================================================================================
+
+Scratch data that a `Thing` keeps only while it is in a `State`,
+recycled between things so that changing `State` does not allocate.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Dict, List, Type
+except ImportError:  # pragma: no cover
+    pass
+
+
+class StateContext:
+    """
+    Scratch data that a `Thing` keeps only while it is in a `State`.
+    Subclasses declare their fields in ``__slots__`` and initialize them
+    in ``__init__``:
+
+    .. code-block:: python
+
+        class BlinkContext(StateContext):
+            __slots__ = ("next_blink", "blink_count")
+
+            def __init__(self):
+                super().__init__()
+                self.next_blink = 0
+                self.blink_count = 0
+
+    Contexts are recycled between things once their `State` is exited,
+    so they must not be referenced after :attr:`State.exit`.
+    """
+
+    __slots__ = ()
+
+    max_pooled: int = 64
+    """Maximum number of released contexts of this class kept for reuse."""
+
+    def reset(self):
+        """
+        Initialize every field of this context again before it is
+        reused. Calls ``__init__`` by default, and can be overridden to
+        reuse what was already allocated.
+        """
+        self.__init__()  # pylint: disable=unnecessary-dunder-call
+
+
+# released contexts by class, waiting to be reused. Things may change
+# state on several threads (see DependencyScheduler), so pools are only
+# changed with single list and dict operations, which are atomic.
+_CONTEXT_POOLS: "Dict[Type[StateContext], List[StateContext]]" = {}
+
+
+def _acquire_context(context_class: "Type[StateContext]") -> StateContext:
+    pool = _CONTEXT_POOLS.get(context_class)
+    if pool:
+        try:
+            context = pool.pop()
+        except IndexError:
+            # another thread took the last released context
+            return context_class()
+        context.reset()
+        return context
+    return context_class()
+
+
+def _release_context(context: StateContext):
+    pool = _CONTEXT_POOLS.get(type(context))
+    if pool is None:
+        pool = _CONTEXT_POOLS.setdefault(type(context), [])
+    if len(pool) < context.max_pooled:
+        pool.append(context)
@@ -0,0 +1,263 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.fleet`
+================================================================================
+
+Manage a collection of `Thing` instances that are updated together.
+Each `Thing` added to a `Fleet` is assigned a dense integer id, starting
+at 0, that can be used as an index into arrays and exports.
+
+.. code-block:: python
+
+    fleet = Fleet()
+    for _ in range(100):
+        fleet.add(TrafficLightThing(slow_seconds=3))
+
+    while True:
+        fleet.update()
+
+Commands can be applied to a selection of things in one call:
+
+.. code-block:: python
+
+    # send an event to every light that is stopped, and update them
+    fleet.apply("caution", state=TrafficLightStates.stop, update=True)
+
+    # call a function on some things
+    fleet.apply(lambda light: light.reset(), ids=range(100))
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Callable, Dict, Iterable, Iterator, List, Union
+except ImportError:  # pragma: no cover
+    pass
+
+from .monitor import IntervalMonitor
+from .observers import Observers
+from .state_of_things import State, Thing
+
+
+def _in_state(thing: Thing, state: State) -> bool:
+    # whether the current State of a Thing is, or is nested in, a State
+    current = thing.current_state
+    while current is not None:
+        if current is state:
+            return True
+        current = current.parent
+    return False
+
+
+class FleetObserver:
+    """
+    Implement the functions of this class to receive notifications when
+    a `Fleet` changes.
+    """
+
+    def thing_adding(self, fleet: "Fleet", thing: Thing, thing_id: int):
+        """
+        Notified before a `Thing` is added to a `Fleet`. Raise an
+        exception to reject the `Thing`, leaving the `Fleet` unchanged.
+
+        Args:
+            fleet (Fleet): the `Fleet` that the `Thing` is added to.
+            thing (Thing): the `Thing` being added.
+            thing_id (int): the id the `Thing` will be assigned.
+        """
+        pass
+
+    def thing_added(self, fleet: "Fleet", thing: Thing, thing_id: int):
+        """
+        Notified when a `Thing` is added to a `Fleet`.
+
+        Args:
+            fleet (Fleet): the `Fleet` that the `Thing` was added to.
+            thing (Thing): the `Thing` that was added.
+            thing_id (int): the id assigned to the `Thing`.
+        """
+        pass
+
+
+class Fleet:
+    """
+    A collection of `Thing` instances that are updated together. Things
+    are updated in the order they were added.
+    """
+
+    def __init__(self, things: "Iterable[Thing]" = None):
+        """
+        Constructor that optionally adds an initial set of things.
+
+        Args:
+            things (Iterable[Thing], optional): things to add to this
+            fleet.
+        """
+        self.__things: List[Thing] = []
+        self.__ids: Dict[Thing, int] = {}
+        self.__observers = Observers()
+        self.__monitor: IntervalMonitor = None
+
+        if things is not None:
+            for thing in things:
+                self.add(thing)
+
+    def add(self, thing: Thing) -> int:
+        """
+        Add a `Thing` to this fleet and notify observers. Observers may
+        reject the `Thing` by raising from
+        :attr:`FleetObserver.thing_adding`, in which case it is not
+        added.
+
+        Args:
+            thing (Thing): the `Thing` to add.
+
+        Returns:
+            int: the id assigned to the `Thing`.
+        """
+        assert thing not in self.__ids, "thing is already in this fleet"
+
+        thing_id = len(self.__things)
+        self.__observers.notify("thing_adding", self, thing, thing_id)
+
+        self.__things.append(thing)
+        self.__ids[thing] = thing_id
+
+        self.__observers.notify("thing_added", self, thing, thing_id)
+
+        return thing_id
+
+    def id_of(self, thing: Thing) -> int:
+        """
+        The id that was assigned to a `Thing` when it was added.
+
+        Args:
+            thing (Thing): a `Thing` in this fleet.
+
+        Returns:
+            int: the id of the `Thing`.
+        """
+        return self.__ids[thing]
+
+    def update(self):
+        """Update every `Thing` in this fleet once."""
+        monitor = self.__monitor
+        if monitor is None:
+            for thing in self.__things:
+                thing.update()
+            return
+
+        for thing in self.__things:
+            thing.update()
+            monitor.record(thing.time_elapsed, thing)
+
+    def select(
+        self,
+        ids: "Iterable[int]" = None,
+        state: State = None,
+        predicate: "Callable[[Thing], bool]" = None,
+    ) -> "List[Thing]":
+        """
+        Select the things that match every filter given.
+
+        Args:
+            ids (Iterable[int], optional): ids of the things to select.
+            Defaults to every `Thing` in this fleet.
+            state (State, optional): only select things whose
+            :attr:`Thing.current_state` is this `State`, or is nested in
+            it (see :attr:`State.parent`).
+            predicate (Callable[[Thing], bool], optional): only select
+            things it returns True for.
+
+        Returns:
+            List[Thing]: the selected things.
+        """
+        things = self.__things
+        if ids is not None:
+            things = [things[thing_id] for thing_id in ids]
+        if state is not None:
+            things = [thing for thing in things if _in_state(thing, state)]
+        if predicate is not None:
+            things = [thing for thing in things if predicate(thing)]
+        if things is self.__things:
+            things = list(things)
+        return things
+
+    def apply(  # pylint: disable=too-many-arguments
+        self,
+        command: "Union[str, Callable[[Thing], None]]",
+        payload: object = None,
+        ids: "Iterable[int]" = None,
+        state: State = None,
+        predicate: "Callable[[Thing], bool]" = None,
+        update: bool = False,
+    ) -> int:
+        """
+        Apply a command to the things selected by :attr:`select`.
+
+        Args:
+            command (Union[str, Callable[[Thing], None]]): the name of an
+            event sent with :attr:`Thing.dispatch`, or a function called
+            with each `Thing`.
+            payload (object, optional): data sent with an event.
+            ids (Iterable[int], optional): ids of the things to select.
+            state (State, optional): only select things in this `State`.
+            predicate (Callable[[Thing], bool], optional): only select
+            things it returns True for.
+            update (bool, optional): update each selected `Thing` once
+            after the command was applied to all of them.
+
+        Returns:
+            int: the number of things the command was applied to.
+        """
+        things = self.select(ids, state, predicate)
+        if isinstance(command, str):
+            for thing in things:
+                thing.dispatch(command, payload)
+        else:
+            for thing in things:
+                command(thing)
+
+        if update:
+            for thing in things:
+                thing.update()
+        return len(things)
+
+    @property
+    def monitor(self) -> IntervalMonitor:
+        """
+        Optional monitor that records :attr:`Thing.time_elapsed` of
+        every `Thing` updated by :attr:`update`, or by a scheduler that
+        updates this fleet.
+
+        Returns:
+            IntervalMonitor: the monitor, or None if not monitored.
+        """
+        return self.__monitor
+
+    @monitor.setter
+    def monitor(self, monitor: IntervalMonitor):
+        self.__monitor = monitor
+
+    @property
+    def observers(self) -> Observers:
+        """
+        The observers that will be notified by this `Fleet`, such as
+        implementations of `FleetObserver`.
+
+        Returns:
+            Observers: this `Fleet`'s observers.
+        """
+        return self.__observers
+
+    def __len__(self) -> int:
+        return len(self.__things)
+
+    def __iter__(self) -> "Iterator[Thing]":
+        return iter(self.__things)
+
+    def __getitem__(self, thing_id: int) -> Thing:
+        return self.__things[thing_id]
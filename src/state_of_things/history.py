@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.history`
+================================================================================
+
+Keep the last transitions of a `Thing`, to debug things that change
+state unexpectedly after the fact, without attaching observers ahead
+of time.
+
+.. code-block:: python
+
+    thing.history = TransitionHistory(capacity=32)
+    ...
+    for old_state, new_state, changed_at, dwell in thing.history.entries():
+        print(f"{old_state.name} -> {new_state.name} after {dwell:.3f}s")
+
+* Author(s): Aaron Silinskas
+
+"""
+
+from array import array
+
+try:
+    from typing import List, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .state_of_things import State
+
+
+class TransitionHistory:
+    """
+    A ring buffer of the most recent transitions of a `Thing`, stored
+    as :attr:`State.id` values and times in arrays that are allocated
+    up front, so recording a transition does not allocate. Once full,
+    the oldest transitions are overwritten.
+
+    The initial `State` is recorded as a transition from None.
+    """
+
+    def __init__(self, capacity: int = 16):
+        """
+        Constructor that allocates the buffer.
+
+        Args:
+            capacity (int, optional): maximum number of transitions
+            kept. Defaults to 16.
+        """
+        assert capacity > 0, "capacity must be greater than zero"
+        self.__capacity = capacity
+        # -1 is used for no State
+        self.__old_ids = array("i", [-1] * capacity)
+        self.__new_ids = array("i", [-1] * capacity)
+        self.__changed_at = array("d", [0.0] * capacity)
+        self.__dwells = array("d", [0.0] * capacity)
+        self.__next = 0
+        self.__count = 0
+
+    def record(
+        self, old_state: State, new_state: State, changed_at: float, dwell: float
+    ):
+        """
+        Record a transition. Called by `Thing` when it changes `State`.
+
+        Args:
+            old_state (State): the `State` changed from, or None.
+            new_state (State): the `State` changed to.
+            changed_at (float): when the transition happened, from
+            :attr:`Thing.clock`.
+            dwell (float): seconds spent in `old_state`.
+        """
+        index = self.__next
+        self.__old_ids[index] = old_state.id if old_state is not None else -1
+        self.__new_ids[index] = new_state.id
+        self.__changed_at[index] = changed_at
+        self.__dwells[index] = dwell
+
+        self.__next = (index + 1) % self.__capacity
+        if self.__count < self.__capacity:
+            self.__count += 1
+
+    def entries(self) -> "List[Tuple[State, State, float, float]]":
+        """
+        The recorded transitions, oldest first.
+
+        Returns:
+            List[Tuple[State, State, float, float]]: the `State` changed
+            from (or None), the `State` changed to, when it changed and
+            the seconds spent in the old `State`.
+        """
+        registry = State.registry
+        first = (self.__next - self.__count) % self.__capacity
+        entries = []
+        for offset in range(self.__count):
+            index = (first + offset) % self.__capacity
+            old_id = self.__old_ids[index]
+            entries.append(
+                (
+                    registry[old_id] if old_id >= 0 else None,
+                    registry[self.__new_ids[index]],
+                    self.__changed_at[index],
+                    self.__dwells[index],
+                )
+            )
+        return entries
+
+    def clear(self):
+        """Discard the recorded transitions."""
+        self.__next = 0
+        self.__count = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Maximum number of transitions kept.
+
+        Returns:
+            int: the capacity.
+        """
+        return self.__capacity
+
+    def __len__(self) -> int:
+        return self.__count
@@ -0,0 +1,499 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.ingest`
+================================================================================
+
+Feed line-delimited records, such as JSON lines from a log file or a
+local socket, into the things of a `Fleet`. Records are read in
+chunks, routed to a `Thing` by key and applied in batches between
+fleet updates, without blocking the update loop.
+
+.. code-block:: python
+
+    ingestor = Ingestor(
+        fleet,
+        sources=[FileSource("sensors.jsonl"), SocketSource.connect("/tmp/in")],
+        record_key=lambda record: record["sensor"],
+        apply=lambda thing, record: thing.dispatch("reading", record["value"]),
+    )
+
+    # apply up to batch_size lines, then update the fleet, each tick
+    TickRunner(ingestor, rate=100).run()
+
+    print(ingestor.records_per_second, ingestor.lag)
+
+This module uses :mod:`json` and :mod:`socket`, and is not imported by
+default.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import json
+import os
+import socket
+import time
+
+try:
+    from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .fleet import Fleet, FleetObserver
+from .state_of_things import Thing
+
+
+class LineSource:
+    """
+    Reads complete lines from a stream in chunks, without blocking.
+    Memory is bounded by the chunk size and the longest line allowed.
+    Lines longer than that are discarded up to their line ending, and
+    counted in :attr:`discarded`.
+    """
+
+    def __init__(
+        self,
+        read: "Callable[[int], bytes]",
+        chunk_size: int = 65536,
+        max_line: int = 1048576,
+    ):
+        """
+        Constructor for a line source.
+
+        Args:
+            read (Callable[[int], bytes]): reads up to a number of bytes
+            that are available now. Returns empty bytes if none are
+            available yet, or None once the stream is closed.
+            chunk_size (int, optional): bytes read at a time. Defaults
+            to 64 KiB.
+            max_line (int, optional): longest line allowed, in bytes.
+            Defaults to 1 MiB.
+        """
+        self.__read = read
+        self.__chunk_size = chunk_size
+        self.__max_line = max_line
+        self.__buffer = bytearray()
+        self.__closed = False
+        # skipping the rest of a line that was too long
+        self.__discarding = False
+        self.__discarded = 0
+        self.__bytes_read = 0
+
+    def lines(self, max_lines: int) -> "Iterator[bytes]":
+        """
+        Generate the complete lines that are available now, without
+        their line endings.
+
+        Args:
+            max_lines (int): maximum number of lines to generate.
+
+        Returns:
+            Iterator[bytes]: the lines.
+        """
+        buffer = self.__buffer
+        start = 0
+        count = 0
+        try:
+            while count < max_lines:
+                newline = buffer.find(b"\n", start)
+                if newline >= 0:
+                    line = bytes(buffer[start:newline])
+                    start = newline + 1
+                    count += 1
+                    yield line.rstrip(b"\r")
+                    continue
+
+                if self.__closed:
+                    break
+                chunk = self.__read(self.__chunk_size)
+                if chunk is None:
+                    self.__closed = True
+                    # end the last line, if it is missing a line ending
+                    if start < len(buffer) and not self.__discarding:
+                        buffer.extend(b"\n")
+                    continue
+                if not chunk:
+                    break
+
+                self.__bytes_read += len(chunk)
+                if self.__discarding:
+                    newline = chunk.find(b"\n")
+                    if newline < 0:
+                        continue
+                    chunk = chunk[newline + 1 :]
+                    self.__discarding = False
+                del buffer[:start]
+                start = 0
+                buffer.extend(chunk)
+                if len(buffer) > self.__max_line and buffer.find(b"\n") < 0:
+                    # drop the line, and the rest of it as it arrives
+                    del buffer[:]
+                    self.__discarding = True
+                    self.__discarded += 1
+        finally:
+            del buffer[:start]
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the stream is closed and every line was read.
+
+        Returns:
+            bool: True if no more lines will be read.
+        """
+        return self.__closed and not self.__buffer
+
+    @property
+    def bytes_read(self) -> int:
+        """
+        Total number of bytes read from the stream.
+
+        Returns:
+            int: the number of bytes.
+        """
+        return self.__bytes_read
+
+    @property
+    def discarded(self) -> int:
+        """
+        Total number of lines discarded for being longer than allowed.
+
+        Returns:
+            int: the number of lines.
+        """
+        return self.__discarded
+
+
+class FileSource(LineSource):
+    """
+    Reads lines appended to a file, like ``tail -f``. Reaching the end
+    of the file is not the end of the source: lines appended later are
+    read by the next poll.
+    """
+
+    def __init__(self, file: object, chunk_size: int = 65536, max_line: int = 1048576):
+        """
+        Constructor that opens the file, if needed.
+
+        Args:
+            file (object): the path of the file, or a file object opened
+            in binary mode.
+            chunk_size (int, optional): bytes read at a time.
+            max_line (int, optional): longest line allowed, in bytes.
+        """
+        if isinstance(file, str):
+            self.__descriptor = os.open(file, os.O_RDONLY)
+            self.__file = None
+        else:
+            self.__descriptor = None
+            self.__file = file
+        super().__init__(self.__read, chunk_size, max_line)
+
+    def __read(self, size: int) -> bytes:
+        if self.__file is None:
+            return os.read(self.__descriptor, size)
+        return self.__file.read(size) or b""
+
+    def close(self):
+        """Close the file."""
+        if self.__file is None:
+            os.close(self.__descriptor)
+        else:
+            self.__file.close()
+
+
+class SocketSource(LineSource):
+    """Reads lines from a stream socket, such as a Unix socket."""
+
+    def __init__(
+        self, sock: socket.socket, chunk_size: int = 65536, max_line: int = 1048576
+    ):
+        """
+        Constructor that makes the socket non-blocking.
+
+        Args:
+            sock (socket.socket): a connected stream socket.
+            chunk_size (int, optional): bytes read at a time.
+            max_line (int, optional): longest line allowed, in bytes.
+        """
+        sock.setblocking(False)
+        self.__socket = sock
+        super().__init__(self.__read, chunk_size, max_line)
+
+    @classmethod
+    def connect(cls, path: str, **kwargs) -> "SocketSource":
+        """
+        Connect to a Unix socket.
+
+        Args:
+            path (str): the path of the socket.
+
+        Returns:
+            SocketSource: the source reading from the socket.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        return cls(sock, **kwargs)
+
+    def __read(self, size: int) -> bytes:
+        try:
+            return self.__socket.recv(size) or None
+        except BlockingIOError:
+            return b""
+
+    def close(self):
+        """Close the socket."""
+        self.__socket.close()
+
+
+def _dispatch_record(thing: Thing, record: object) -> bool:
+    return thing.dispatch("record", record)
+
+
+class Ingestor(FleetObserver):
+    """
+    Reads records from line sources, routes each one to a `Thing` in a
+    `Fleet` with a hash index of keys, and applies them in batches.
+
+    Lines that can not be parsed, or are too long, are counted as
+    :attr:`errors`, and records whose key matches no `Thing` as
+    :attr:`unrouted`. Neither stops ingestion.
+
+    When a `Thing` can not take a record yet, for instance because its
+    event queue is full, the record and every later one for that `Thing`
+    are kept in the :attr:`backlog` and applied first on the next poll.
+    The backlog counts toward `batch_size`, so reading slows down
+    instead of dropping records.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        fleet: Fleet,
+        sources: "Iterable[LineSource]",
+        record_key: "Callable[[object], object]" = None,
+        thing_key: "Callable[[Thing], object]" = None,
+        apply: "Callable[[Thing, object], bool]" = None,
+        parse: "Callable[[bytes], object]" = json.loads,
+        timestamp: "Callable[[object], float]" = None,
+        batch_size: int = 1000,
+        clock: "Callable[[], float]" = time.time,
+    ):
+        """
+        Constructor that indexes every `Thing` in the fleet, including
+        things added later.
+
+        Args:
+            fleet (Fleet): the `Fleet` to feed.
+            sources (Iterable[LineSource]): where records are read from.
+            record_key (Callable[[object], object], optional): the key
+            of a record. Defaults to its ``"name"`` item.
+            thing_key (Callable[[Thing], object], optional): the key of
+            a `Thing`, which must be unique within the fleet. Defaults to
+            :attr:`Thing.name`, so things must be given unique names.
+            apply (Callable[[Thing, object], bool], optional): applies a
+            record to its `Thing`, returning False if the `Thing` can
+            not take it yet. Defaults to dispatching a ``"record"``
+            event with the record as payload.
+            parse (Callable[[bytes], object], optional): parses a line
+            into a record. Defaults to :func:`json.loads`.
+            timestamp (Callable[[object], float], optional): when a
+            record was produced, on `clock`, used to measure
+            :attr:`lag`.
+            batch_size (int, optional): maximum number of lines read,
+            plus records in the backlog, per poll. Defaults to 1000.
+            clock (Callable[[], float], optional): clock, in seconds.
+            Defaults to :func:`time.time`.
+        """
+        assert batch_size > 0, "batch_size must be greater than zero"
+        self.__fleet = fleet
+        self.__sources: List[LineSource] = list(sources)
+        self.__record_key = (
+            record_key if record_key is not None else lambda record: record["name"]
+        )
+        self.__thing_key = (
+            thing_key if thing_key is not None else lambda thing: thing.name
+        )
+        self.__apply = apply if apply is not None else _dispatch_record
+        self.__parse = parse
+        self.__timestamp = timestamp
+        self.__batch_size = batch_size
+        self.__clock = clock
+
+        self.__index: Dict[object, Thing] = {}
+        self.__started: float = None
+        self.__backlog: List[Tuple[Thing, object]] = []
+        self.__records = 0
+        self.__deferred = 0
+        self.__unrouted = 0
+        self.__errors = 0
+        self.__lag = 0.0
+
+        for thing in fleet:
+            thing_id = fleet.id_of(thing)
+            self.thing_adding(fleet, thing, thing_id)
+            self.thing_added(fleet, thing, thing_id)
+        fleet.observers.attach(self)
+
+    def thing_adding(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Reject a `Thing` whose key is already routed to another."""
+        key = self.__thing_key(thing)
+        assert key not in self.__index, f"thing key {key!r} is not unique"
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Route records to a `Thing` that was added to the fleet."""
+        self.__index[self.__thing_key(thing)] = thing
+
+    def poll(self) -> int:
+        """
+        Apply the records in the backlog, then read lines that are
+        available now, up to `batch_size` in total, and apply their
+        records to their things in the order they were read.
+
+        Returns:
+            int: the number of records applied.
+        """
+        if self.__started is None:
+            self.__started = self.__clock()
+
+        parse = self.__parse
+        record_key = self.__record_key
+        index = self.__index
+        batch = self.__backlog
+        self.__backlog = []
+        remaining = self.__batch_size - len(batch)
+
+        for source in self.__sources:
+            if remaining <= 0:
+                break
+            for line in source.lines(remaining):
+                remaining -= 1
+                if not line:
+                    continue
+                try:
+                    record = parse(line)
+                    key = record_key(record)
+                except (ValueError, KeyError, TypeError):
+                    self.__errors += 1
+                    continue
+
+                thing = index.get(key)
+                if thing is None:
+                    self.__unrouted += 1
+                else:
+                    batch.append((thing, record))
+
+        return self.__apply_batch(batch)
+
+    def __apply_batch(self, batch: "List[Tuple[Thing, object]]") -> int:
+        apply = self.__apply
+        backlog = self.__backlog
+        # things that could not take a record, kept in order
+        blocked = set()
+        applied = None
+        for thing, record in batch:
+            if thing in blocked or apply(thing, record) is False:
+                blocked.add(thing)
+                backlog.append((thing, record))
+            else:
+                applied = record
+
+        count = len(batch) - len(backlog)
+        self.__records += count
+        self.__deferred += len(backlog)
+        if applied is not None and self.__timestamp is not None:
+            self.__lag = self.__clock() - self.__timestamp(applied)
+        return count
+
+    def update(self):
+        """Apply a batch of records, and then update the fleet."""
+        self.poll()
+        self.__fleet.update()
+
+    @property
+    def records(self) -> int:
+        """
+        Total number of records applied.
+
+        Returns:
+            int: the number of records.
+        """
+        return self.__records
+
+    @property
+    def backlog(self) -> int:
+        """
+        Number of records waiting for their `Thing` to take them.
+
+        Returns:
+            int: the number of records.
+        """
+        return len(self.__backlog)
+
+    @property
+    def deferred(self) -> int:
+        """
+        Total number of times a record was kept in the backlog instead of
+        being applied, because its `Thing` could not take it.
+
+        Returns:
+            int: the number of deferrals.
+        """
+        return self.__deferred
+
+    @property
+    def unrouted(self) -> int:
+        """
+        Total number of records whose key matched no `Thing`.
+
+        Returns:
+            int: the number of records.
+        """
+        return self.__unrouted
+
+    @property
+    def errors(self) -> int:
+        """
+        Total number of lines that could not be parsed into a record
+        with a key, or were discarded for being too long.
+
+        Returns:
+            int: the number of lines.
+        """
+        return self.__errors + sum(source.discarded for source in self.__sources)
+
+    @property
+    def bytes_read(self) -> int:
+        """
+        Total number of bytes read from every source.
+
+        Returns:
+            int: the number of bytes.
+        """
+        return sum(source.bytes_read for source in self.__sources)
+
+    @property
+    def records_per_second(self) -> float:
+        """
+        Average number of records applied per second since the first
+        poll.
+
+        Returns:
+            float: the throughput, or 0 before any time has passed.
+        """
+        if self.__started is None:
+            return 0.0
+        seconds = self.__clock() - self.__started
+        return self.__records / seconds if seconds > 0 else 0.0
+
+    @property
+    def lag(self) -> float:
+        """
+        How long before being applied the most recent record was
+        produced, when records have a `timestamp`.
+
+        Returns:
+            float: the lag, in seconds.
+        """
+        return self.__lag
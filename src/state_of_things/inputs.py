@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.inputs`
+================================================================================
+
+Track changes to the attributes of a `Thing` that its states read, so
+that a `State` declaring its :attr:`State.inputs` is only updated when
+one of them changes.
+
+.. code-block:: python
+
+    class TrafficLightThing(Thing):
+        should_go = Input(False)
+        caution_mode = Input(False)
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Dict, Tuple, Type
+except ImportError:  # pragma: no cover
+    pass
+
+# prefix of the attribute that holds the value of each input on a Thing
+_ATTRIBUTE_PREFIX = "_input_"
+
+# number of inputs declared by each Thing class, including inherited ones
+_INPUT_COUNTS: "Dict[type, int]" = {}
+
+# bits of the inputs that each State depends on, by Thing class
+_INPUT_MASKS: "Dict[Tuple[type, object], int]" = {}
+
+
+class Input:
+    """
+    An attribute of a `Thing` whose changes are tracked, so that states
+    that declare it in :attr:`State.inputs` are only updated when it
+    changes. Setting an input to a value equal to its current one is not
+    a change, and :attr:`Thing.reset` returns every input to its
+    default.
+
+    Each input is assigned a bit when its class is created, after the
+    bits of the inputs it inherits, so a class declaring inputs should
+    only inherit inputs through one of its base classes.
+    """
+
+    def __init__(self, default: object = None):
+        """
+        Constructor for an input attribute.
+
+        Args:
+            default (object, optional): the value of the input until it
+            is set.
+        """
+        self.__default = default
+        self.__attribute: str = None
+        self.bit = 0
+        """The bit that marks this input as changed."""
+
+    def __set_name__(self, owner: type, name: str):
+        self.__attribute = _ATTRIBUTE_PREFIX + name
+
+        count = 0
+        for klass in owner.__mro__:
+            if klass in _INPUT_COUNTS:
+                count = _INPUT_COUNTS[klass]
+                break
+        self.bit = 1 << count
+        _INPUT_COUNTS[owner] = count + 1
+
+    def __get__(self, thing: "Thing", owner: type = None) -> object:
+        if thing is None:
+            return self
+        return thing.__dict__.get(self.__attribute, self.__default)
+
+    def __set__(self, thing: "Thing", value: object):
+        values = thing.__dict__
+        if values.get(self.__attribute, self.__default) != value:
+            values[self.__attribute] = value
+            thing._input_changed(self.bit)
+
+
+def _input_mask(thing_class: "Type[Thing]", state: "State") -> int:
+    key = (thing_class, state)
+    mask = _INPUT_MASKS.get(key)
+    if mask is None:
+        mask = 0
+        for name in state.inputs:
+            attribute = getattr(thing_class, name, None)
+            assert isinstance(attribute, Input), f"{name} is not an Input"
+            mask |= attribute.bit
+        _INPUT_MASKS[key] = mask
+    return mask
+
+
+def _clear_inputs(thing: "Thing"):
+    # return every input of a Thing to its default
+    values = thing.__dict__
+    for attribute in [name for name in values if name.startswith(_ATTRIBUTE_PREFIX)]:
+        del values[attribute]
@@ -0,0 +1,372 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.loadtest`
+================================================================================
+
+Measure how many things per second this library can update for a given
+shape of state machine, to help size hardware. Synthetic state machines
+and fleets are built from the real `State`, `Thing`, `Observers` and
+`Fleet` classes, so results reflect production behavior.
+
+Run it from the command line:
+
+.. code-block:: shell
+
+    python -m state_of_things.loadtest --things 10000 --states 8 \\
+        --branching 2 --timer-density 0.5 --observers 2 --ticks 1000
+
+or from code:
+
+.. code-block:: python
+
+    result = run_load_test(LoadTestConfig(things=10000, ticks=1000))
+    print(result.report())
+
+With the default virtual clock, each tick advances time by
+``tick_seconds`` so timer-driven states transition at the same rate no
+matter how fast the host is. With ``--clock real``, things use
+:func:`time.monotonic`.
+
+This module uses :mod:`argparse`, :mod:`random` and :mod:`tracemalloc`,
+and is not imported by default.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+try:
+    from typing import Callable, List, Sequence, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .fleet import Fleet
+from .monitor import IntervalMonitor
+from .state_of_things import State, Thing, ThingObserver
+
+# ticks run while measuring memory, which is slow with tracemalloc
+_MEMORY_TICKS = 100
+
+
+class VirtualClock:
+    """A clock that only advances when told to."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        """
+        Move the clock forward.
+
+        Args:
+            seconds (float): number of seconds to advance.
+        """
+        self.now += seconds
+
+
+class LoadTestConfig:
+    """The shape of the synthetic state machines and fleet."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        things: int = 1000,
+        states: int = 8,
+        branching: int = 2,
+        timer_density: float = 0.5,
+        observers: int = 1,
+        ticks: int = 1000,
+        tick_seconds: float = 0.01,
+        virtual_clock: bool = True,
+        seed: int = 0,
+    ):
+        """
+        Constructor for a load test configuration.
+
+        Args:
+            things (int, optional): number of things in the fleet.
+            states (int, optional): number of states in the machine.
+            branching (int, optional): number of states each state can
+            transition to.
+            timer_density (float, optional): fraction of states that
+            transition after a dwell time. The rest transition randomly,
+            as if driven by input.
+            observers (int, optional): state change observers attached
+            to each `Thing`.
+            ticks (int, optional): number of times the fleet is updated.
+            tick_seconds (float, optional): seconds that the virtual
+            clock advances each tick.
+            virtual_clock (bool, optional): use a virtual clock instead
+            of :func:`time.monotonic`.
+            seed (int, optional): seed for generating the machine.
+        """
+        assert states > 0, "states must be greater than zero"
+        self.things = things
+        self.states = states
+        self.branching = min(max(branching, 1), states)
+        self.timer_density = timer_density
+        self.observers = observers
+        self.ticks = ticks
+        self.tick_seconds = tick_seconds
+        self.virtual_clock = virtual_clock
+        self.seed = seed
+
+
+class SyntheticState(State):
+    """
+    A generated `State` that changes to one of its next states after a
+    dwell time, or with a fixed chance on each update.
+    """
+
+    def __init__(self, name: str, dwell: float, chance: float, rng: random.Random):
+        self.__name = name
+        self.next_states: List[State] = []
+        self.__dwell = dwell
+        self.__chance = chance
+        self.__random = rng.random
+
+    @property
+    def name(self):
+        return self.__name
+
+    def update(self, thing: Thing) -> State:
+        if self.__dwell is not None:
+            if thing.time_active < self.__dwell:
+                return self
+        elif self.__random() >= self.__chance:
+            return self
+
+        next_states = self.next_states
+        return next_states[int(self.__random() * len(next_states))]
+
+
+class CountingObserver(ThingObserver):
+    """Counts state changes, as a stand-in for a real observer."""
+
+    def __init__(self) -> None:
+        self.changes = 0
+
+    def state_changed(self, thing: Thing, old_state: State, new_state: State):
+        self.changes += 1
+
+
+def build_states(config: LoadTestConfig) -> "List[SyntheticState]":
+    """
+    Generate the states of a synthetic state machine.
+
+    Args:
+        config (LoadTestConfig): the machine's shape.
+
+    Returns:
+        List[SyntheticState]: the states, starting with the initial one.
+    """
+    rng = random.Random(config.seed)
+    timed = round(config.states * config.timer_density)
+
+    states = []
+    for index in range(config.states):
+        if index < timed:
+            # dwell between 10 and 100 ticks
+            dwell = config.tick_seconds * rng.randint(10, 100)
+            states.append(SyntheticState(f"Timed{index}", dwell, 0, rng))
+        else:
+            # change on about 1 in 50 updates
+            states.append(SyntheticState(f"Input{index}", None, 0.02, rng))
+    rng.shuffle(states)
+
+    for index, state in enumerate(states):
+        # always include the following state, so every state is reachable
+        targets = [states[(index + 1) % len(states)]]
+        others = [other for other in states if other not in targets]
+        targets.extend(rng.sample(others, config.branching - 1))
+        state.next_states = targets
+
+    return states
+
+
+class LoadTestResult:
+    """Measurements from a load test run."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        config: LoadTestConfig,
+        seconds: float,
+        tick_latency: IntervalMonitor,
+        transitions: int,
+        peak_memory: int,
+    ):
+        self.config = config
+        """The configuration that was run."""
+
+        self.seconds = seconds
+        """Wall clock seconds spent updating the fleet."""
+
+        self.tick_latency = tick_latency
+        """Wall clock seconds that each tick took."""
+
+        self.transitions = transitions
+        """Number of state changes observed."""
+
+        self.peak_memory = peak_memory
+        """
+        Peak bytes allocated while building the fleet and running up to
+        100 ticks, measured in a separate pass that is not timed.
+        """
+
+    @property
+    def updates_per_second(self) -> float:
+        """Number of `Thing` updates per wall clock second."""
+        if self.seconds <= 0:
+            return 0.0
+        return self.config.things * self.config.ticks / self.seconds
+
+    def report(self) -> str:
+        """
+        A human readable summary of the results.
+
+        Returns:
+            str: the report.
+        """
+        latency = self.tick_latency
+        return "\n".join(
+            [
+                f"things:              {self.config.things}",
+                f"states:              {self.config.states}"
+                f" (branching {self.config.branching},"
+                f" timer density {self.config.timer_density})",
+                f"observers per thing: {self.config.observers}",
+                f"ticks:               {self.config.ticks}"
+                f" ({'virtual' if self.config.virtual_clock else 'real'} clock)",
+                f"updates/second:      {self.updates_per_second:,.0f}",
+                f"transitions:         {self.transitions}",
+                "tick latency (ms):   "
+                f"p50 {latency.percentile(50) * 1000:.3f}"
+                f"  p90 {latency.percentile(90) * 1000:.3f}"
+                f"  p99 {latency.percentile(99) * 1000:.3f}"
+                f"  max {latency.max * 1000:.3f}",
+                f"peak memory:         {self.peak_memory / 1024 / 1024:.1f} MiB",
+            ]
+        )
+
+
+def _build_fleet(
+    config: LoadTestConfig,
+) -> "Tuple[Fleet, List[CountingObserver], Callable[[], float]]":
+    clock = VirtualClock() if config.virtual_clock else time.monotonic
+
+    class SyntheticThing(Thing):
+        """A `Thing` that runs on the load test's clock."""
+
+    SyntheticThing.clock = clock
+
+    states = build_states(config)
+    observers = [CountingObserver() for _ in range(config.observers)]
+    fleet = Fleet()
+    for index in range(config.things):
+        thing = SyntheticThing(states[0], name=f"thing-{index}")
+        for observer in observers:
+            thing.observers.attach(observer)
+        fleet.add(thing)
+    return fleet, observers, clock
+
+
+def _measure_memory(config: LoadTestConfig) -> int:
+    # tracing allocations slows updates down several times over, so
+    # memory is measured on a separate fleet that is not timed
+    tracemalloc.start()
+    try:
+        fleet, _, clock = _build_fleet(config)
+        for _ in range(min(config.ticks, _MEMORY_TICKS)):
+            fleet.update()
+            if config.virtual_clock:
+                clock.advance(config.tick_seconds)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_load_test(config: LoadTestConfig) -> LoadTestResult:
+    """
+    Build a synthetic fleet and update it for a number of ticks, and
+    then measure its memory use in a separate, untimed pass.
+
+    Args:
+        config (LoadTestConfig): the shape of the load test.
+
+    Returns:
+        LoadTestResult: the measurements.
+    """
+    fleet, observers, clock = _build_fleet(config)
+
+    tick_latency = IntervalMonitor(window=config.ticks)
+    perf_counter = time.perf_counter
+    started = perf_counter()
+    for _ in range(config.ticks):
+        tick_started = perf_counter()
+        fleet.update()
+        tick_latency.record(perf_counter() - tick_started)
+        if config.virtual_clock:
+            clock.advance(config.tick_seconds)
+    seconds = perf_counter() - started
+
+    transitions = observers[0].changes if observers else 0
+    return LoadTestResult(
+        config, seconds, tick_latency, transitions, _measure_memory(config)
+    )
+
+
+def main(argv: "Sequence[str]" = None) -> int:
+    """
+    Run a load test configured from command line arguments and print
+    its report.
+
+    Args:
+        argv (Sequence[str], optional): the arguments. Defaults to
+        :data:`sys.argv`.
+
+    Returns:
+        int: the exit code.
+    """
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m state_of_things.loadtest",
+        description="Measure State of Things update throughput.",
+    )
+    parser.add_argument("--things", type=int, default=defaults.things)
+    parser.add_argument("--states", type=int, default=defaults.states)
+    parser.add_argument("--branching", type=int, default=defaults.branching)
+    parser.add_argument("--timer-density", type=float, default=defaults.timer_density)
+    parser.add_argument("--observers", type=int, default=defaults.observers)
+    parser.add_argument("--ticks", type=int, default=defaults.ticks)
+    parser.add_argument("--tick-seconds", type=float, default=defaults.tick_seconds)
+    parser.add_argument("--clock", choices=["virtual", "real"], default="virtual")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args(argv)
+
+    result = run_load_test(
+        LoadTestConfig(
+            things=args.things,
+            states=args.states,
+            branching=args.branching,
+            timer_density=args.timer_density,
+            observers=args.observers,
+            ticks=args.ticks,
+            tick_seconds=args.tick_seconds,
+            virtual_clock=args.clock == "virtual",
+            seed=args.seed,
+        )
+    )
+    print(result.report())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.monitor`
+================================================================================
+
+Track the distribution of :attr:`Thing.time_elapsed`, the interval
+between updates, to detect when a loop falls behind.
+
+.. code-block:: python
+
+    monitor = IntervalMonitor(window=1000)
+    monitor.add_threshold(0.1, lambda elapsed, thing: print(
+        f"{thing.name} waited {elapsed:.3f}s between updates"
+    ))
+
+    # monitor one thing...
+    thing.monitor = monitor
+    # ...or every thing updated by a fleet
+    fleet.monitor = monitor
+
+    print(monitor.percentile(99), monitor.histogram)
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Callable, List, Sequence, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+"""Default upper bounds, in seconds, of the histogram buckets."""
+
+
+class IntervalMonitor:
+    """
+    Records update intervals into a sliding window, for min, max and
+    percentiles, and into a histogram of fixed buckets that counts every
+    interval ever recorded. Callbacks can be notified whenever an
+    interval exceeds a threshold.
+    """
+
+    def __init__(self, window: int = 100, buckets: "Sequence[float]" = None):
+        """
+        Constructor that allocates the window and histogram.
+
+        Args:
+            window (int, optional): number of most recent intervals used
+            for min, max and percentiles. Defaults to 100.
+            buckets (Sequence[float], optional): ascending upper bounds,
+            in seconds, of the histogram buckets. An extra bucket counts
+            intervals above the last bound. Defaults to
+            `DEFAULT_BUCKETS`.
+        """
+        assert window > 0, "window must be greater than zero"
+        self.__window: List[float] = [0.0] * window
+        self.__next = 0
+        self.__count = 0
+
+        self.__buckets = tuple(buckets if buckets is not None else DEFAULT_BUCKETS)
+        self.__histogram: List[int] = [0] * (len(self.__buckets) + 1)
+
+        self.__thresholds: List[Tuple[float, Callable]] = []
+        self.__lowest_threshold = None
+
+    def add_threshold(
+        self, seconds: float, callback: "Callable[[float, object], None]"
+    ):
+        """
+        Call a function whenever a recorded interval exceeds a number of
+        seconds.
+
+        Args:
+            seconds (float): the interval threshold, in seconds.
+            callback (Callable[[float, object], None]): called with the
+            interval and the `Thing` that was updated, if known.
+        """
+        self.__thresholds.append((seconds, callback))
+        self.__lowest_threshold = min(seconds for seconds, _ in self.__thresholds)
+
+    def record(self, elapsed: float, thing: object = None):
+        """
+        Record an update interval.
+
+        Args:
+            elapsed (float): the interval, in seconds.
+            thing (object, optional): the `Thing` that was updated.
+        """
+        window = self.__window
+        window[self.__next] = elapsed
+        self.__next = (self.__next + 1) % len(window)
+        self.__count += 1
+
+        bucket = 0
+        for bound in self.__buckets:
+            if elapsed <= bound:
+                break
+            bucket += 1
+        self.__histogram[bucket] += 1
+
+        if self.__lowest_threshold is not None and elapsed > self.__lowest_threshold:
+            for seconds, callback in self.__thresholds:
+                if elapsed > seconds:
+                    callback(elapsed, thing)
+
+    def __recent(self) -> "List[float]":
+        window = self.__window
+        if self.__count < len(window):
+            return window[: self.__count]
+        return window
+
+    @property
+    def count(self) -> int:
+        """
+        Total number of intervals recorded.
+
+        Returns:
+            int: the number of intervals.
+        """
+        return self.__count
+
+    @property
+    def min(self) -> float:
+        """
+        Shortest interval in the window.
+
+        Returns:
+            float: the interval, in seconds, or 0 if none were recorded.
+        """
+        recent = self.__recent()
+        return min(recent) if recent else 0.0
+
+    @property
+    def max(self) -> float:
+        """
+        Longest interval in the window.
+
+        Returns:
+            float: the interval, in seconds, or 0 if none were recorded.
+        """
+        recent = self.__recent()
+        return max(recent) if recent else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Interval that a percentage of the intervals in the window are at
+        or below, using the nearest-rank method.
+
+        Args:
+            percent (float): the percentile, from 0 to 100.
+
+        Returns:
+            float: the interval, in seconds, or 0 if none were recorded.
+        """
+        recent = sorted(self.__recent())
+        if not recent:
+            return 0.0
+        rank = int(percent / 100 * len(recent) + 0.5)
+        return recent[min(max(rank, 1), len(recent)) - 1]
+
+    @property
+    def buckets(self) -> "Tuple[float, ...]":
+        """
+        Upper bounds of the histogram buckets.
+
+        Returns:
+            Tuple[float, ...]: the bucket bounds, in seconds.
+        """
+        return self.__buckets
+
+    @property
+    def histogram(self) -> "List[int]":
+        """
+        Number of intervals recorded in each bucket. The last count is
+        for intervals above the largest bucket bound.
+
+        Returns:
+            List[int]: the count of each bucket.
+        """
+        return list(self.__histogram)
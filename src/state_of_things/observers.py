@@ -49,12 +49,65 @@ Observers are maintained and notified via an `Observers` instance:
     # seconds
     observers.notify("on_release", "w", 1.2)
 
+Observers may also define ``async`` handlers, which are awaited
+concurrently when an event is notified with `Observers.anotify`:
+
+.. code-block:: python
+
+    class SocketObserver(KeyObserver):
+        async def on_press(self, key_code: str):
+            await self.writer.drain()
+
+    await observers.anotify("on_press", "w", timeout=0.5)
+
+Events notified by a `Thing` use `Observers.notify`, which can not await
+``async`` handlers, so observers attached to a `Thing` should handle
+them synchronously, for instance by scheduling a task.
+
+Observers that block, for instance on disk or network I/O, can be
+attached with an executor so that their handlers run on a thread pool
+instead of blocking the code that notified the event:
+
+.. code-block:: python
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    disk_observer = observers.attach(DiskLoggingObserver(), executor=executor)
+
+    # later, check whether the observer is keeping up
+    print(disk_observer.queue_depth, disk_observer.max_handler_time)
+
+To find out which observers make notifying slow, profile them for a
+while and look at the report:
+
+.. code-block:: python
+
+    observers.start_profiling(slow_threshold=0.01, on_slow=print)
+    ...
+    observers.stop_profiling()
+    for (observer, event_name), cost in observers.profile_report().items():
+        print(cost.observer_class, event_name, cost.count, cost.max_time)
+
 * Author(s): Aaron Silinskas
 
 """
 
+import time
+
+try:
+    import asyncio
+    import warnings
+except ImportError:  # pragma: no cover
+    pass
+
 try:
-    from typing import List
+    import threading
+    import weakref
+    from collections import deque
+except ImportError:  # pragma: no cover
+    pass
+
+try:
+    from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 except ImportError:  # pragma: no cover
     pass
 
@@ -63,20 +116,66 @@ class Observers:
     """
     Maintain a list of observers that will be notified when an event
     occurs.
+
+    The handlers for each event name are looked up once and indexed, so
+    notifying an event only calls observers that handle it. The index is
+    rebuilt whenever an observer is attached or detached.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, clock: "Callable[[], float]" = time.monotonic) -> None:
+        """
+        Constructor for an empty list of observers.
+
+        Args:
+            clock (Callable[[], float], optional): monotonic clock, in
+            seconds, that times the windows of :attr:`rate_limit` and
+            :attr:`coalesce`. Defaults to :func:`time.monotonic`.
+        """
+        self.__clock = clock
         self.__observers: List = []
+        self.__events: List = []
+        self.__handlers: Dict[str, Tuple] = {}
+        self.__handler_observers: Dict[str, Tuple] = {}
+        self.__costs: Dict[Tuple[object, str], HandlerCost] = None
+        self.__report: Dict[Tuple[object, str], HandlerCost] = {}
+        self.__slow_threshold: float = None
+        self.__on_slow: Callable = None
+        self.__limits: Dict[str, _EventLimit] = {}
+        self.__pending: Dict[str, _EventLimit] = {}
+        # results of async handlers, collected while in anotify
+        self.__awaiting: List = None
 
-    def attach(self, observer: object):
+    def attach(
+        self,
+        observer: object,
+        executor: object = None,
+        events: "Iterable[str]" = None,
+    ) -> object:
         """
         Attach an observer that will be notified of events that it
         supports.
 
         Args:
             observer (object): the observer to attach.
+            executor (concurrent.futures.Executor, optional): executor
+            that runs the observer's handlers, wrapping the observer in
+            an `ExecutorObserver`, which is shared by every `Observers`
+            the observer is attached to with this executor. Defaults to
+            calling handlers immediately when an event is notified.
+            events (Iterable[str], optional): names of the only events
+            the observer will be notified of. Defaults to every event
+            that the observer handles.
+
+        Returns:
+            object: the attached observer, or its `ExecutorObserver`.
         """
+        if executor is not None:
+            observer = _executor_observer(observer, executor)
         self.__observers.append(observer)
+        self.__events.append(frozenset(events) if events is not None else None)
+        self.__handlers.clear()
+        self.__handler_observers.clear()
+        return observer
 
     def detach(self, observer: object):
         """
@@ -84,9 +183,47 @@ class Observers:
         events occur.
 
         Args:
-            observer (object): the observer to detach.
+            observer (object): the observer to detach, or the observer
+            wrapped by an attached `ExecutorObserver`.
         """
-        self.__observers.remove(observer)
+        for attached in self.__observers:
+            if isinstance(attached, ExecutorObserver) and attached.observer is observer:
+                observer = attached
+                break
+        index = self.__observers.index(observer)
+        del self.__observers[index]
+        del self.__events[index]
+        self.__handlers.clear()
+        self.__handler_observers.clear()
+
+    def handlers(self, event_name: str) -> "Tuple":
+        """
+        The handlers that will be called when an event is notified, in
+        the order their observers were attached.
+
+        Args:
+            event_name (str): the event name.
+
+        Returns:
+            Tuple: the handler functions.
+        """
+        handlers = self.__handlers.get(event_name)
+        if handlers is not None:
+            return handlers
+
+        matches = []
+        observers = []
+        for observer, events in zip(self.__observers, self.__events):
+            if events is not None and event_name not in events:
+                continue
+            handler = getattr(observer, event_name, None)
+            if callable(handler):
+                matches.append(handler)
+                observers.append(observer)
+
+        handlers = self.__handlers[event_name] = tuple(matches)
+        self.__handler_observers[event_name] = tuple(observers)
+        return handlers
 
     def notify(self, event_name: str, *params: object):
         """
@@ -94,11 +231,492 @@ class Observers:
         observer with a defined function that matches the event name
         will called with the passed in event's params.
 
+        Handlers defined with ``async def`` can not be awaited here, so
+        their coroutines are closed without running and a
+        :class:`RuntimeWarning` is issued. Use :attr:`anotify` instead.
+        Events notified by a `Thing` use this function.
+
+        Events limited by :attr:`rate_limit` or :attr:`coalesce` may be
+        suppressed or delayed.
+
         Args:
             event_name (str): event that has occurred.
             *params (object): optional event data.
         """
-        for observer in self.__observers:
-            handler = getattr(observer, event_name, None)
-            if callable(handler):
+        if self.__limits:
+            limit = self.__limits.get(event_name)
+            if limit is not None and not self.__admit(event_name, limit, params):
+                return
+
+        self._deliver(event_name, params)
+
+    def _deliver(self, event_name: str, params: "Tuple"):
+        handlers = self.__handlers.get(event_name)
+        if handlers is None:
+            handlers = self.handlers(event_name)
+
+        if self.__costs is not None or self.__awaiting is not None:
+            observers = self.__handler_observers[event_name]
+            for observer, handler in zip(observers, handlers):
+                self._call_handler(observer, handler, event_name, params)
+            return
+
+        for handler in handlers:
+            result = handler(*params)
+            if result is not None:
+                _check_awaited(result, event_name)
+
+    def _call_handler(
+        self, observer: object, handler: "Callable", event_name: str, params: "Tuple"
+    ):
+        # call a handler, recording its cost while profiling and keeping
+        # its coroutine while in anotify
+        costs = self.__costs
+        if costs is None:
+            result = handler(*params)
+        else:
+            started = time.monotonic()
+            result = handler(*params)
+            self.__record_cost(observer, event_name, time.monotonic() - started)
+
+        if result is None:
+            return
+        if self.__awaiting is not None and asyncio.iscoroutine(result):
+            self.__awaiting.append(result)
+        else:
+            _check_awaited(result, event_name)
+
+    def __record_cost(self, observer: object, event_name: str, elapsed: float):
+        costs = self.__costs
+        if isinstance(observer, ExecutorObserver):
+            observer = observer.observer
+        key = (observer, event_name)
+        cost = costs.get(key)
+        if cost is None:
+            cost = costs[key] = HandlerCost(type(observer).__qualname__)
+        cost.count += 1
+        cost.total_time += elapsed
+        cost.max_time = max(cost.max_time, elapsed)
+
+        if self.__slow_threshold is not None and elapsed > self.__slow_threshold:
+            self.__on_slow(observer, event_name, elapsed)
+
+    @property
+    def profiling(self) -> bool:
+        """
+        Whether handler costs are being recorded.
+
+        Returns:
+            bool: True between :attr:`start_profiling` and
+            :attr:`stop_profiling`.
+        """
+        return self.__costs is not None
+
+    def start_profiling(
+        self,
+        slow_threshold: float = None,
+        on_slow: "Callable[[object, str, float], None]" = None,
+    ):
+        """
+        Start recording how long each observer's handlers take, by
+        observer and event name. Costs recorded by an earlier profile
+        are cleared.
+
+        Args:
+            slow_threshold (float, optional): seconds a handler can take
+            before `on_slow` is called.
+            on_slow (Callable[[object, str, float], None], optional):
+            called with the observer, event name and seconds taken by
+            each handler slower than `slow_threshold`.
+        """
+        assert (slow_threshold is None) == (
+            on_slow is None
+        ), "slow_threshold and on_slow must be set together"
+        self.__costs = {}
+        self.__slow_threshold = slow_threshold
+        self.__on_slow = on_slow
+
+    def stop_profiling(self):
+        """Stop recording handler costs, keeping the last report."""
+        self.__report = self.profile_report()
+        self.__costs = None
+
+    def profile_report(self) -> "Dict[Tuple[object, str], HandlerCost]":
+        """
+        The handler costs recorded since profiling started. Observers
+        attached with an executor are reported as the observer they
+        wrap.
+
+        Returns:
+            Dict[Tuple[object, str], HandlerCost]: the cost of each
+            observer and event name.
+        """
+        if self.__costs is None:
+            return self.__report
+        return dict(self.__costs)
+
+    def rate_limit(self, event_name: str, max_events: int, seconds: float):
+        """
+        Notify observers of at most a number of events with a name
+        within each window of time. Events over the limit are dropped.
+
+        Args:
+            event_name (str): the event to limit.
+            max_events (int): events notified per window.
+            seconds (float): length of each window, in seconds.
+        """
+        self.__limits[event_name] = _EventLimit(seconds, max_events)
+
+    def coalesce(self, event_name: str, seconds: float):
+        """
+        Notify observers of at most one event with a name within each
+        window of time. The first event is notified immediately, and
+        only the latest of the events that follow it in the window is
+        notified once the window has passed, by :attr:`flush` or the
+        next event with that name.
+
+        Args:
+            event_name (str): the event to coalesce.
+            seconds (float): length of each window, in seconds.
+        """
+        self.__limits[event_name] = _EventLimit(seconds)
+
+    def unlimit(self, event_name: str):
+        """
+        Remove the rate limit or coalescing of an event, notifying any
+        event held back by coalescing.
+
+        Args:
+            event_name (str): the limited event.
+        """
+        limit = self.__limits.pop(event_name, None)
+        if limit is not None and self.__pending.pop(event_name, None) is not None:
+            params, limit.pending = limit.pending, None
+            self._deliver(event_name, params)
+
+    def suppressed(self, event_name: str) -> int:
+        """
+        Number of events with a name that were dropped by a rate limit or
+        replaced by a later event while coalescing.
+
+        Args:
+            event_name (str): the limited event.
+
+        Returns:
+            int: the number of suppressed events.
+        """
+        limit = self.__limits.get(event_name)
+        return limit.suppressed if limit is not None else 0
+
+    def flush(self):
+        """
+        Notify observers of coalesced events whose window has passed.
+        A `Thing` calls this on every update.
+        """
+        if not self.__pending:
+            return
+
+        now = self._now()
+        for event_name, limit in list(self.__pending.items()):
+            if now - limit.window_start >= limit.seconds:
+                del self.__pending[event_name]
+                params, limit.pending = limit.pending, None
+                limit.window_start = now
+                self._deliver(event_name, params)
+
+    def reset_limits(self):
+        """
+        Discard events held back by coalescing, without notifying them,
+        and start every rate limit and coalescing window over. The
+        limits themselves are kept. Called by :attr:`Thing.reset`.
+        """
+        self.__pending.clear()
+        for limit in self.__limits.values():
+            limit.window_start = -limit.seconds
+            limit.count = 0
+            limit.pending = None
+            limit.suppressed = 0
+
+    def _now(self) -> float:
+        # the time on the clock that times rate limit and coalesce windows
+        return self.__clock()
+
+    def __admit(self, event_name: str, limit: "_EventLimit", params: "Tuple") -> bool:
+        now = self._now()
+        window_over = now - limit.window_start >= limit.seconds
+
+        if limit.max_events is not None:
+            # rate limit
+            if window_over:
+                limit.window_start = now
+                limit.count = 0
+            if limit.count < limit.max_events:
+                limit.count += 1
+                return True
+            limit.suppressed += 1
+            return False
+
+        # coalesce
+        if window_over:
+            limit.window_start = now
+            if limit.pending is not None:
+                # the held back event happened before this one
+                del self.__pending[event_name]
+                pending, limit.pending = limit.pending, None
+                self._deliver(event_name, pending)
+            return True
+
+        if limit.pending is not None:
+            limit.suppressed += 1
+        limit.pending = params
+        self.__pending[event_name] = limit
+        return False
+
+    async def anotify(self, event_name: str, *params: object, timeout: float = None):
+        """
+        Notify all observers that an event has occurred, awaiting any
+        ``async`` handlers concurrently. Synchronous handlers are called
+        immediately, in the order observers were attached.
+
+        Events are limited, profiled and delivered exactly like
+        :attr:`notify`. An event held back by :attr:`coalesce` is
+        delivered later by :attr:`flush` or :attr:`notify`, which can
+        not await its handlers.
+
+        If any handler raises an exception, the first one is raised
+        once every handler has finished.
+
+        Args:
+            event_name (str): event that has occurred.
+            *params (object): optional event data.
+            timeout (float, optional): seconds that each ``async``
+            handler may take before it is cancelled and
+            :class:`asyncio.TimeoutError` is raised. Defaults to no
+            timeout.
+        """
+        previous = self.__awaiting
+        pending = self.__awaiting = []
+        try:
+            self.notify(event_name, *params)
+        finally:
+            self.__awaiting = previous
+
+        if not pending:
+            return
+        if timeout is not None:
+            pending = [asyncio.wait_for(result, timeout) for result in pending]
+
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+
+    def clear(self):
+        """Detach all observers."""
+        self.__observers.clear()
+        self.__events.clear()
+        self.__handlers.clear()
+        self.__handler_observers.clear()
+
+    def __len__(self) -> int:
+        return len(self.__observers)
+
+    def __iter__(self) -> "Iterator[object]":
+        return iter(self.__observers)
+
+
+def _check_awaited(result: object, event_name: str):
+    # a coroutine returned to notify would never run, so say so now
+    # instead of when it is garbage collected
+    if asyncio.iscoroutine(result):
+        result.close()
+        warnings.warn(
+            f"async handler for {event_name} was not awaited, use anotify",
+            RuntimeWarning,
+            stacklevel=4,
+        )
+
+
+class HandlerCost:
+    """Time spent by the handler of an observer for an event."""
+
+    def __init__(self, observer_class: str = None) -> None:
+        self.observer_class = observer_class
+        """Name of the observer's class, to label reports."""
+
+        self.count = 0
+        """Number of times the handler was called."""
+
+        self.total_time = 0.0
+        """Total seconds spent in the handler."""
+
+        self.max_time = 0.0
+        """Longest seconds spent in a single call of the handler."""
+
+    @property
+    def average_time(self) -> float:
+        """Average seconds spent in each call of the handler."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"HandlerCost(observer_class={self.observer_class!r}, "
+            f"count={self.count}, total_time={self.total_time:.6f}, "
+            f"max_time={self.max_time:.6f})"
+        )
+
+
+# the ExecutorObserver of each attached (observer, executor) pair, kept
+# only while it is attached somewhere
+_EXECUTOR_OBSERVERS: "weakref.WeakValueDictionary" = None
+
+
+def _executor_observer(observer: object, executor: object) -> "ExecutorObserver":
+    # share one wrapper between every Observers an observer is attached
+    # to, so its events are still handled one at a time and in order.
+    # The wrapper keeps the observer and executor alive, so their ids
+    # are not reused while it is kept.
+    global _EXECUTOR_OBSERVERS  # pylint: disable=global-statement
+    if _EXECUTOR_OBSERVERS is None:
+        _EXECUTOR_OBSERVERS = weakref.WeakValueDictionary()
+
+    key = (id(observer), id(executor))
+    wrapper = _EXECUTOR_OBSERVERS.get(key)
+    if wrapper is None:
+        wrapper = _EXECUTOR_OBSERVERS.setdefault(
+            key, ExecutorObserver(observer, executor)
+        )
+    return wrapper
+
+
+class _EventLimit:
+    """Rate limit or coalescing state of an event name."""
+
+    def __init__(self, seconds: float, max_events: int = None) -> None:
+        self.seconds = seconds
+        self.max_events = max_events
+        self.window_start = -seconds
+        self.count = 0
+        self.pending: Tuple = None
+        self.suppressed = 0
+
+
+class ExecutorObserver:
+    """
+    Wraps an observer so that its handlers are called by an executor,
+    such as a :class:`concurrent.futures.ThreadPoolExecutor`, instead of
+    by the code that notified the event. Events are handled one at a
+    time, in the order they were notified. An observer attached with the
+    same executor to several `Observers`, such as those of every `Thing`
+    in a `Fleet`, has a single `ExecutorObserver`, so this holds across
+    all of them.
+
+    Handler exceptions can not be raised to the notifying code, so they
+    are counted in :attr:`failures` and the last one is kept in
+    :attr:`last_error`.
+    """
+
+    def __init__(self, observer: object, executor: object):
+        """
+        Constructor that wraps an observer.
+
+        Args:
+            observer (object): the observer to wrap.
+            executor (concurrent.futures.Executor): the executor that
+            calls the observer's handlers.
+        """
+        self.__observer = observer
+        self.__executor = executor
+        self.__lock = threading.Lock()
+        self.__queue = deque()
+        self.__draining = False
+
+        self.__max_queue_depth = 0
+        self.__handled = 0
+        self.__failures = 0
+        self.__last_error: BaseException = None
+        self.__total_handler_time = 0.0
+        self.__max_handler_time = 0.0
+
+    def __getattr__(self, event_name: str):
+        if event_name.startswith("_"):
+            raise AttributeError(event_name)
+        handler = getattr(self.__observer, event_name, None)
+        if not callable(handler):
+            raise AttributeError(event_name)
+
+        def submit(*params: object):
+            self.__submit(handler, params)
+
+        return submit
+
+    def __submit(self, handler, params):
+        with self.__lock:
+            self.__queue.append((handler, params))
+            self.__max_queue_depth = max(self.__max_queue_depth, len(self.__queue))
+            if self.__draining:
+                # the running drain will handle this event in order
+                return
+            self.__draining = True
+        self.__executor.submit(self.__drain)
+
+    def __drain(self):
+        while True:
+            with self.__lock:
+                if not self.__queue:
+                    self.__draining = False
+                    return
+                handler, params = self.__queue.popleft()
+
+            started = time.monotonic()
+            try:
                 handler(*params)
+            except Exception as error:  # pylint: disable=broad-except
+                self.__failures += 1
+                self.__last_error = error
+            handler_time = time.monotonic() - started
+
+            self.__handled += 1
+            self.__total_handler_time += handler_time
+            self.__max_handler_time = max(self.__max_handler_time, handler_time)
+
+    @property
+    def observer(self) -> object:
+        """The wrapped observer."""
+        return self.__observer
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be handled."""
+        return len(self.__queue)
+
+    @property
+    def max_queue_depth(self) -> int:
+        """Largest number of events that were waiting to be handled."""
+        return self.__max_queue_depth
+
+    @property
+    def handled(self) -> int:
+        """Number of events that have been handled."""
+        return self.__handled
+
+    @property
+    def failures(self) -> int:
+        """Number of handlers that raised an exception."""
+        return self.__failures
+
+    @property
+    def last_error(self) -> BaseException:
+        """The last exception raised by a handler, or None."""
+        return self.__last_error
+
+    @property
+    def average_handler_time(self) -> float:
+        """Average seconds spent in each handler."""
+        if not self.__handled:
+            return 0.0
+        return self.__total_handler_time / self.__handled
+
+    @property
+    def max_handler_time(self) -> float:
+        """Longest seconds spent in a handler."""
+        return self.__max_handler_time
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.pool`
+================================================================================
+
+Recycle `Thing` instances instead of constructing new ones, for
+workloads that create and discard many short-lived things.
+
+.. code-block:: python
+
+    pool = ThingPool(SessionThing, observers=[LoggingObserver()])
+
+    session = pool.acquire()
+    ...
+    pool.release(session)
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Callable, Iterable, List
+except ImportError:  # pragma: no cover
+    pass
+
+from .state_of_things import Thing
+
+
+class ThingPool:
+    """
+    A pool of reusable things. Released things are reset with
+    :attr:`Thing.reset` and handed out again by :attr:`acquire`.
+
+    Template observers are attached once, when a `Thing` is first
+    created. Observers attached while a `Thing` was in use are detached
+    when it is released.
+    """
+
+    def __init__(
+        self,
+        factory: "Callable[[], Thing]",
+        observers: "Iterable[object]" = None,
+        max_size: int = 1024,
+    ):
+        """
+        Constructor that configures how things are created.
+
+        Args:
+            factory (Callable[[], Thing]): creates a new `Thing` when the
+            pool is empty.
+            observers (Iterable[object], optional): template observers
+            attached to every `Thing` created by the pool.
+            max_size (int, optional): maximum number of released things
+            kept for reuse. Defaults to 1024.
+        """
+        self.__factory = factory
+        self.__observers = tuple(observers) if observers is not None else ()
+        self.__max_size = max_size
+        self.__free: List[Thing] = []
+        self.__created = 0
+
+    def acquire(self) -> Thing:
+        """
+        Take a `Thing` from the pool, creating one if the pool is empty.
+
+        Returns:
+            Thing: a `Thing` that has not entered its initial `State`.
+        """
+        if self.__free:
+            return self.__free.pop()
+
+        thing = self.__factory()
+        for observer in self.__observers:
+            thing.observers.attach(observer)
+        self.__created += 1
+        return thing
+
+    def release(self, thing: Thing):
+        """
+        Reset a `Thing` and return it to the pool. The `Thing` must not
+        be used after it is released, so a child of a `CompositeThing`
+        must be removed with :attr:`CompositeThing.remove_child` first.
+
+        Args:
+            thing (Thing): a `Thing` acquired from this pool.
+        """
+        thing.reset()
+
+        observers = thing.observers
+        if not self.__has_template_observers(observers):
+            observers.clear()
+            for observer in self.__observers:
+                observers.attach(observer)
+
+        if len(self.__free) < self.__max_size:
+            self.__free.append(thing)
+
+    def __has_template_observers(self, observers) -> bool:
+        if len(observers) != len(self.__observers):
+            return False
+        for observer, template in zip(observers, self.__observers):
+            if observer is not template:
+                return False
+        return True
+
+    @property
+    def created(self) -> int:
+        """
+        Total number of things created by this pool.
+
+        Returns:
+            int: the number of things created.
+        """
+        return self.__created
+
+    def __len__(self) -> int:
+        return len(self.__free)
@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.region`
+================================================================================
+
+Independent `State` machines inside a `Thing`, for concerns that change
+state concurrently, such as connectivity, power and alarms.
+
+.. code-block:: python
+
+    class DeviceThing(Thing):
+        def __init__(self):
+            super().__init__(DeviceStates.booting)
+            self.power = self.add_region(Region(PowerStates.mains, "power"))
+            self.link = self.add_region(Region(LinkStates.offline, "link"))
+
+* Author(s): Aaron Silinskas
+
+"""
+
+try:
+    from typing import Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .context import StateContext, _acquire_context, _release_context
+from .state_of_things import State, Thing, _handle_event, _lineage, _transition_path
+
+
+class RegionObserver:
+    """
+    Implement the functions of this class, and attach it to the
+    :attr:`Thing.observers` of a `Thing`, to receive notifications when
+    one of its regions changes `State`. Regions do not notify
+    :attr:`ThingObserver.state_changed` or
+    :attr:`ThingObserver.state_entered`, which are only for the
+    :attr:`Thing.current_state` of a `Thing`.
+    """
+
+    def region_state_changed(
+        self, region: "Region", old_state: State, new_state: State
+    ):
+        """
+        Notified when a `Region` changes from one `State` to another.
+
+        Args:
+            region (Region): the `Region` that changed `State`, whose
+            :attr:`Region.thing` is the `Thing` it belongs to.
+            old_state (State): the previous `State`.
+            new_state (State): the new current `State`.
+        """
+        pass
+
+    def region_state_entered(self, region: "Region", state: State):
+        """
+        Notified each time a `Region` enters a `State`, including its
+        initial `State` and each :attr:`State.parent` entered along the
+        way, like :attr:`ThingObserver.state_entered`.
+
+        Args:
+            region (Region): the `Region` that entered the `State`.
+            state (State): the `State` that was entered.
+        """
+        pass
+
+
+class Region:
+    """
+    An independent `State` machine inside a `Thing`. Regions share their
+    `Thing`'s clock read, update call and observers, instead of being
+    separate things, and are added with :attr:`Thing.add_region`.
+
+    A `Region` is passed as the ``thing`` to the :attr:`State.enter`,
+    :attr:`State.exit`, :attr:`State.update` and :attr:`State.on_event`
+    functions of its states, so :attr:`current_state`,
+    :attr:`time_active` and :attr:`context` are the region's own, and
+    any other attribute is looked up on the `Thing`. Assigning an
+    attribute that the `Thing` already has assigns it on the `Thing`,
+    so attributes the `Thing` does not have yet must be created through
+    :attr:`thing`. Its changes are
+    notified to the `Thing`'s observers as
+    :attr:`RegionObserver.region_state_changed` and
+    :attr:`RegionObserver.region_state_entered`, and events sent with
+    :attr:`Thing.dispatch` are handled by every region.
+    """
+
+    def __init__(self, initial_state: State, name: str = None):
+        """
+        Constructor that stores the initial `State` but does not change
+        to it until the `Thing` is updated.
+
+        Args:
+            initial_state (State): the initial `State` for this region.
+            name (str, optional): the name of this region. Defaults to
+            the class name.
+        """
+        assert initial_state, "initial_state is required"
+        self.__initial_state = initial_state
+        self.__name = name if name is not None else type(self).__name__
+        self.__thing: Thing = None
+
+        self.__current_state: State = None
+        self.__previous_state: State = None
+        self.__parents: Tuple[State, ...] = ()
+        self.__time_active: float = 0
+        self.__context: StateContext = None
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.__thing, name)
+
+    def __setattr__(self, name: str, value: object):
+        # write through to the Thing, instead of shadowing its attribute.
+        # Private names are checked first, since they are set every tick
+        thing = None if name.startswith("_") else self.__dict__.get("_Region__thing")
+        if (
+            thing is not None
+            and name not in self.__dict__
+            and not hasattr(type(self), name)
+            and hasattr(thing, name)
+        ):
+            setattr(thing, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    def added_to(self, thing: Thing):
+        """
+        Called by :attr:`Thing.add_region` when this region is added.
+
+        Args:
+            thing (Thing): the `Thing` this region belongs to.
+        """
+        self.__thing = thing
+
+    def __go_to_state(self, new_state: State):
+        old_state = self.__current_state
+        if new_state.parent is None and (old_state is None or old_state.parent is None):
+            exits = (old_state,) if old_state is not None else ()
+            enters = (new_state,)
+            self.__parents = ()
+        else:
+            exits, enters = _transition_path(old_state, new_state)
+            self.__parents = _lineage(new_state)[:-1]
+
+        for state in exits:
+            state.exit(self)
+        if self.__context is not None:
+            _release_context(self.__context)
+            self.__context = None
+
+        self.__previous_state = old_state
+        self.__current_state = new_state
+
+        observers = self.__thing.observers
+        if old_state is not None:
+            observers.notify("region_state_changed", self, old_state, new_state)
+
+        self.__time_active = 0
+
+        if new_state.context_class is not None:
+            self.__context = _acquire_context(new_state.context_class)
+        for state in enters:
+            state.enter(self)
+        for state in enters:
+            observers.notify("region_state_entered", self, state)
+        if not enters:
+            observers.notify("region_state_entered", self, new_state)
+
+    def tick(self, elapsed: float):
+        """
+        Update the current `State` of this region. Called by the `Thing`
+        on every update, after its own `State`.
+
+        Args:
+            elapsed (float): :attr:`Thing.time_elapsed`, already read
+            from the `Thing`'s clock.
+        """
+        if self.__current_state is None:
+            self.__go_to_state(self.__initial_state)
+        self.__time_active += elapsed
+
+        for parent in self.__parents:
+            next_state = parent.update(self)
+            if next_state is not parent:
+                break
+        else:
+            next_state = self.__current_state.update(self)
+        if next_state != self.__current_state:
+            self.__go_to_state(next_state)
+
+    def handle_event(self, event: str, payload: object):
+        """
+        Offer an event to the current `State` of this region, and then
+        to its parents. Called by the `Thing` for each dispatched event,
+        in order.
+
+        Args:
+            event (str): the name of the event.
+            payload (object): data sent with the event.
+        """
+        if self.__current_state is None:
+            self.__go_to_state(self.__initial_state)
+
+        state = self.__current_state
+        next_state = _handle_event(self, state, self.__parents, event, payload)
+        if next_state != state:
+            self.__go_to_state(next_state)
+
+    def reset(self):
+        """
+        Exit the current `State` without notifying observers, so that
+        the initial `State` is entered again. Called by
+        :attr:`Thing.reset`.
+        """
+        if self.__current_state is not None:
+            self.__current_state.exit(self)
+            for parent in reversed(self.__parents):
+                parent.exit(self)
+        if self.__context is not None:
+            _release_context(self.__context)
+            self.__context = None
+
+        self.__current_state = None
+        self.__previous_state = None
+        self.__parents = ()
+        self.__time_active = 0
+
+    @property
+    def name(self) -> str:
+        """
+        Name of this region.
+
+        Returns:
+            str: the name of this region.
+        """
+        return self.__name
+
+    @property
+    def thing(self) -> Thing:
+        """
+        The `Thing` this region was added to.
+
+        Returns:
+            Thing: the `Thing`, or None if not added yet.
+        """
+        return self.__thing
+
+    @property
+    def current_state(self) -> State:
+        """
+        The current `State` of this region.
+
+        Returns:
+            State: the current `State`, or None if it does not have one.
+        """
+        return self.__current_state
+
+    @property
+    def previous_state(self) -> State:
+        """
+        The previous `State` of this region.
+
+        Returns:
+            State: the previous `State`, or None if it has not changed
+            States.
+        """
+        return self.__previous_state
+
+    @property
+    def time_elapsed(self) -> float:
+        """
+        The amount of time that has elapsed since the `Thing`'s last
+        update call.
+
+        Returns:
+            float: the amount of elapsed time, in seconds.
+        """
+        return self.__thing.time_elapsed
+
+    @property
+    def time_active(self) -> float:
+        """
+        The total amount of time that this region has been in the
+        current `State`.
+
+        Returns:
+            float: the amount of time active in the current `State`, in
+            seconds.
+        """
+        return self.__time_active
+
+    @property
+    def context(self) -> StateContext:
+        """
+        The context of the current `State` of this region.
+
+        Returns:
+            StateContext: the current context, or None if the current
+            `State` does not have one.
+        """
+        return self.__context
@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.runner`
+================================================================================
+
+Update a `Thing`, a `Fleet`, or anything else with an ``update()``
+function at a fixed rate, sleeping between ticks instead of spinning.
+
+.. code-block:: python
+
+    thing = PingPongThing()
+
+    # update 100 times a second for 10 seconds
+    runner = TickRunner(thing, rate=100)
+    runner.run(seconds=10)
+
+    print(f"{runner.achieved_rate:.1f} Hz, jitter {runner.jitter:.6f}s")
+
+Ticks are scheduled against absolute deadlines, so time lost to
+oversleeping or slow updates does not accumulate as drift. When an
+update takes longer than a whole period it is counted as an overrun,
+and any deadlines missed entirely are skipped rather than bursting to
+catch up.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import math
+import time
+
+try:
+    from typing import Callable
+except ImportError:  # pragma: no cover
+    pass
+
+
+class TickRunner:
+    """
+    Calls ``update()`` on a target at a fixed rate and tracks how
+    closely the rate was achieved.
+    """
+
+    def __init__(
+        self,
+        target: object,
+        rate: float,
+        clock: "Callable[[], float]" = time.monotonic,
+        sleep: "Callable[[float], None]" = time.sleep,
+    ):
+        """
+        Constructor that configures the target and its tick rate.
+
+        Args:
+            target (object): the object to update, such as a `Thing` or
+            `Fleet`.
+            rate (float): target number of ticks per second.
+            clock (Callable[[], float], optional): monotonic clock, in
+            seconds. Defaults to :func:`time.monotonic`.
+            sleep (Callable[[float], None], optional): sleeps for a
+            number of seconds. Defaults to :func:`time.sleep`.
+        """
+        assert rate > 0, "rate must be greater than zero"
+        self.__target = target
+        self.__period = 1 / rate
+        self.__clock = clock
+        self.__sleep = sleep
+
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__elapsed = 0.0
+        self.__max_lateness = 0.0
+        self.__interval_sum = 0.0
+        self.__interval_sum_squares = 0.0
+
+    def run(self, seconds: float = None, until: "Callable[[], bool]" = None):
+        """
+        Tick the target until a number of seconds have passed or a
+        condition is met, whichever comes first. Statistics are reset
+        at the start of each run.
+
+        Args:
+            seconds (float, optional): number of seconds to run for.
+            Defaults to running until the condition is met.
+            until (Callable[[], bool], optional): returns True when the
+            runner should stop. Defaults to running for `seconds`.
+        """
+        assert seconds is not None or until is not None, "seconds or until is required"
+
+        clock = self.__clock
+        period = self.__period
+        update = self.__target.update
+
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__max_lateness = 0.0
+        self.__interval_sum = 0.0
+        self.__interval_sum_squares = 0.0
+
+        started = clock()
+        stop_at = started + seconds if seconds is not None else None
+        deadline = started
+        last_tick = None
+
+        while True:
+            now = clock()
+            if now < deadline:
+                self.__sleep(deadline - now)
+                now = clock()
+
+            if stop_at is not None and now >= stop_at:
+                break
+            if until is not None and until():
+                break
+
+            # track how late this tick started and its interval from the
+            # previous tick
+            self.__max_lateness = max(self.__max_lateness, now - deadline)
+            if last_tick is not None:
+                interval = now - last_tick
+                self.__interval_sum += interval
+                self.__interval_sum_squares += interval * interval
+            last_tick = now
+
+            update()
+            self.__ticks += 1
+
+            finished = clock()
+            if finished - now > period:
+                self.__overruns += 1
+
+            # a late next deadline still runs immediately, but deadlines
+            # that a whole period has passed since are skipped, keeping
+            # the schedule on the original grid without bursting
+            deadline += period
+            if finished - deadline >= period:
+                deadline += period * math.floor((finished - deadline) / period)
+
+        self.__elapsed = clock() - started
+
+    @property
+    def period(self) -> float:
+        """
+        Target number of seconds between ticks.
+
+        Returns:
+            float: the tick period, in seconds.
+        """
+        return self.__period
+
+    @property
+    def ticks(self) -> int:
+        """
+        Number of ticks in the last run.
+
+        Returns:
+            int: the number of ticks.
+        """
+        return self.__ticks
+
+    @property
+    def overruns(self) -> int:
+        """
+        Number of ticks in the last run whose update took longer than
+        the tick period.
+
+        Returns:
+            int: the number of overruns.
+        """
+        return self.__overruns
+
+    @property
+    def achieved_rate(self) -> float:
+        """
+        Average number of ticks per second in the last run.
+
+        Returns:
+            float: the achieved tick rate, or 0 if nothing has run.
+        """
+        if self.__elapsed <= 0:
+            return 0.0
+        return self.__ticks / self.__elapsed
+
+    @property
+    def jitter(self) -> float:
+        """
+        Standard deviation of the time between tick starts in the last
+        run.
+
+        Returns:
+            float: the tick jitter, in seconds.
+        """
+        intervals = self.__ticks - 1
+        if intervals < 1:
+            return 0.0
+        mean = self.__interval_sum / intervals
+        variance = self.__interval_sum_squares / intervals - mean * mean
+        return max(variance, 0.0) ** 0.5
+
+    @property
+    def max_lateness(self) -> float:
+        """
+        Longest time that a tick in the last run started after its
+        scheduled deadline.
+
+        Returns:
+            float: the maximum lateness, in seconds.
+        """
+        return self.__max_lateness
@@ -0,0 +1,517 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.scheduler`
+================================================================================
+
+Schedulers decide which things in a `Fleet` are updated on each tick.
+A scheduler has an ``update()`` function, so it can be ticked by a
+`TickRunner` in place of the fleet.
+
+.. code-block:: python
+
+    fleet = Fleet(SensorThing() for _ in range(100_000))
+    scheduler = RoundRobinScheduler(fleet, budget=0.005)
+    scheduler.set_priority(fleet[0], Priority.CRITICAL)
+
+    TickRunner(scheduler, rate=100).run(seconds=60)
+
+Like :attr:`Fleet.update`, schedulers record the
+:attr:`Thing.time_elapsed` of every `Thing` they update in
+:attr:`Fleet.monitor`, when it is set. `AdaptiveScheduler` skips
+things that it is backing off, whose intervals are expected to be long.
+
+Things that read other things can declare it, so they see fresh state:
+
+.. code-block:: python
+
+    scheduler = DependencyScheduler(fleet, executor=ThreadPoolExecutor())
+    for light in lights:
+        scheduler.depends_on(intersection, light)
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import math
+import time
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # pragma: no cover
+    ThreadPoolExecutor = None
+
+try:
+    from typing import Callable, Dict, List
+except ImportError:  # pragma: no cover
+    pass
+
+from .fleet import Fleet, FleetObserver
+from .state_of_things import State, Thing, ThingObserver
+
+
+class Priority:
+    """Priority classes that a scheduler can assign to a `Thing`."""
+
+    CRITICAL = 0
+    """Updated on every tick, regardless of the time budget."""
+
+    BACKGROUND = 1
+    """Updated in turn, as the time budget allows."""
+
+
+class RoundRobinScheduler(FleetObserver):
+    """
+    Updates a `Fleet` within a time budget per tick. Critical things
+    are updated on every tick. Background things are updated in
+    round-robin order until the budget is spent, and the next tick
+    resumes where the last one stopped, so no `Thing` starves no matter
+    how large the fleet grows.
+
+    At least one background `Thing` is updated per tick, even if the
+    critical things spent the whole budget.
+    """
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        budget: float,
+        clock: "Callable[[], float]" = time.monotonic,
+    ):
+        """
+        Constructor that schedules every `Thing` in the fleet as
+        background, including things added later.
+
+        Args:
+            fleet (Fleet): the `Fleet` to update.
+            budget (float): seconds that each tick may spend updating.
+            clock (Callable[[], float], optional): monotonic clock, in
+            seconds. Defaults to :func:`time.monotonic`.
+        """
+        assert budget > 0, "budget must be greater than zero"
+        self.__fleet = fleet
+        self.__budget = budget
+        self.__clock = clock
+
+        self.__priorities: List[int] = []
+        self.__last_updates: List[float] = []
+        self.__critical: List[int] = []
+        self.__background: List[int] = []
+        self.__next = 0
+
+        for thing in fleet:
+            self.thing_added(fleet, thing, fleet.id_of(thing))
+        fleet.observers.attach(self)
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Schedule a `Thing` that was added to the fleet as background."""
+        self.__priorities.append(Priority.BACKGROUND)
+        self.__last_updates.append(self.__clock())
+        self.__background.append(thing_id)
+
+    def set_priority(self, thing: Thing, priority: int):
+        """
+        Change the priority class of a `Thing`.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+            priority (int): the new `Priority` class.
+        """
+        thing_id = self.__fleet.id_of(thing)
+        if self.__priorities[thing_id] == priority:
+            return
+
+        if priority == Priority.CRITICAL:
+            index = self.__background.index(thing_id)
+            del self.__background[index]
+            if index < self.__next:
+                self.__next -= 1
+            self.__critical.append(thing_id)
+        else:
+            self.__critical.remove(thing_id)
+            self.__background.append(thing_id)
+        self.__priorities[thing_id] = priority
+
+    def priority(self, thing: Thing) -> int:
+        """
+        The priority class of a `Thing`.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+
+        Returns:
+            int: the `Priority` class of the `Thing`.
+        """
+        return self.__priorities[self.__fleet.id_of(thing)]
+
+    def update(self):
+        """
+        Update every critical `Thing`, and then background things until
+        the time budget is spent or all of them have been updated.
+        """
+        clock = self.__clock
+        fleet = self.__fleet
+        monitor = fleet.monitor
+        last_updates = self.__last_updates
+
+        started = clock()
+        deadline = started + self.__budget
+
+        for thing_id in self.__critical:
+            thing = fleet[thing_id]
+            thing.update()
+            if monitor is not None:
+                monitor.record(thing.time_elapsed, thing)
+            last_updates[thing_id] = clock()
+
+        background = self.__background
+        count = len(background)
+        next_index = self.__next
+        for _ in range(count):
+            if next_index >= count:
+                next_index = 0
+
+            thing_id = background[next_index]
+            thing = fleet[thing_id]
+            thing.update()
+            if monitor is not None:
+                monitor.record(thing.time_elapsed, thing)
+            next_index += 1
+
+            now = clock()
+            last_updates[thing_id] = now
+            if now >= deadline:
+                break
+        self.__next = next_index
+
+    def staleness(self, thing: Thing) -> float:
+        """
+        Time since a `Thing` was last updated by this scheduler, or
+        since it was added if it has not been updated yet.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+
+        Returns:
+            float: the staleness of the `Thing`, in seconds.
+        """
+        return self.__clock() - self.__last_updates[self.__fleet.id_of(thing)]
+
+    @property
+    def max_staleness(self) -> float:
+        """
+        The staleness of the least recently updated `Thing`.
+
+        Returns:
+            float: the largest staleness in the fleet, in seconds.
+        """
+        if not self.__last_updates:
+            return 0.0
+        return self.__clock() - min(self.__last_updates)
+
+
+class AdaptiveScheduler(ThingObserver, FleetObserver):
+    """
+    Updates a `Fleet`, backing off how often each `Thing` is updated
+    while its `State` stays unchanged. The first update without a
+    transition delays the next one by `min_interval`, and each further
+    update without a transition multiplies the delay by `backoff`.
+
+    The delay is capped at `max_interval`, and at a fraction of how long
+    things have been observed to stay in the current `State`, so that
+    states that usually change after a few seconds are still checked
+    often enough. A `Thing` returns to being updated on every tick as
+    soon as it changes `State`, an event is dispatched to it, one of its
+    inputs changes, or :attr:`wake` is called. Each `Thing`'s
+    :attr:`Thing.wake_handler` is set to do this, and to update it in
+    time for :attr:`Thing.recheck_after`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        fleet: Fleet,
+        min_interval: float = 0.01,
+        max_interval: float = 1.0,
+        backoff: float = 2.0,
+        dwell_fraction: float = 0.1,
+        clock: "Callable[[], float]" = time.monotonic,
+    ):
+        """
+        Constructor that schedules every `Thing` in the fleet, including
+        things added later.
+
+        Args:
+            fleet (Fleet): the `Fleet` to update.
+            min_interval (float, optional): first delay, in seconds,
+            after an update without a transition. Defaults to 0.01.
+            max_interval (float, optional): longest delay, in seconds,
+            between updates. Defaults to 1.0.
+            backoff (float, optional): multiplier applied to the delay
+            after each update without a transition. Defaults to 2.0.
+            dwell_fraction (float, optional): fraction of the average
+            time spent in a `State` that the delay can reach. Defaults
+            to 0.1.
+            clock (Callable[[], float], optional): monotonic clock, in
+            seconds. Defaults to :func:`time.monotonic`.
+        """
+        assert 0 < min_interval <= max_interval, "invalid interval range"
+        assert backoff >= 1, "backoff must be at least 1"
+        self.__fleet = fleet
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__backoff = backoff
+        self.__dwell_fraction = dwell_fraction
+        self.__clock = clock
+
+        self.__intervals: List[float] = []
+        self.__next_updates: List[float] = []
+        self.__entered: List[float] = []
+        self.__average_dwell: Dict[State, float] = {}
+        self.__skipped = 0
+
+        for thing in fleet:
+            self.thing_added(fleet, thing, fleet.id_of(thing))
+        fleet.observers.attach(self)
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Schedule a `Thing` that was added to the fleet."""
+        assert thing.wake_handler is None, "thing already has a wake handler"
+        self.__intervals.append(0.0)
+        self.__next_updates.append(0.0)
+        self.__entered.append(self.__clock())
+        thing.wake_handler = self.__wake_thing
+        thing.observers.attach(self)
+
+    def state_changed(self, thing: Thing, old_state: State, new_state: State):
+        """Learn how long the old `State` lasted and stop backing off."""
+        thing_id = self.__fleet.id_of(thing)
+        now = self.__clock()
+        dwell = now - self.__entered[thing_id]
+        self.__entered[thing_id] = now
+
+        average = self.__average_dwell.get(old_state)
+        self.__average_dwell[old_state] = (
+            dwell if average is None else average + (dwell - average) / 8
+        )
+
+        self.wake(thing)
+
+    def wake(self, thing: Thing):
+        """
+        Update a `Thing` on every tick again, until it backs off.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+        """
+        thing_id = self.__fleet.id_of(thing)
+        self.__intervals[thing_id] = 0.0
+        self.__next_updates[thing_id] = 0.0
+
+    def __wake_thing(self, thing: Thing, seconds: float):
+        if seconds is None:
+            self.wake(thing)
+        else:
+            thing_id = self.__fleet.id_of(thing)
+            self.__next_updates[thing_id] = min(
+                self.__next_updates[thing_id], self.__clock() + seconds
+            )
+
+    def update(self):
+        """Update every `Thing` in the fleet that is due."""
+        now = self.__clock()
+        monitor = self.__fleet.monitor
+        intervals = self.__intervals
+        next_updates = self.__next_updates
+
+        thing_id = 0
+        for thing in self.__fleet:
+            if now < next_updates[thing_id]:
+                self.__skipped += 1
+                thing_id += 1
+                continue
+
+            state = thing.current_state
+            # backing off is not an overrun, so only monitor things
+            # updated on every tick
+            monitored = monitor is not None and not intervals[thing_id]
+            # lowered by the wake handler if the Thing asks to be
+            # rechecked sooner than it would back off to
+            next_updates[thing_id] = math.inf
+            thing.update()
+            if monitored:
+                monitor.record(thing.time_elapsed, thing)
+            if thing.current_state is state:
+                interval = intervals[thing_id]
+                interval = (
+                    interval * self.__backoff if interval else self.__min_interval
+                )
+                intervals[thing_id] = min(interval, self.__interval_limit(state))
+                next_updates[thing_id] = min(
+                    next_updates[thing_id], now + intervals[thing_id]
+                )
+            else:
+                # entered a State, so update on every tick
+                next_updates[thing_id] = 0.0
+
+            thing_id += 1
+
+    def __interval_limit(self, state: State) -> float:
+        average = self.__average_dwell.get(state)
+        if average is None:
+            return self.__max_interval
+        return max(
+            self.__min_interval,
+            min(self.__max_interval, average * self.__dwell_fraction),
+        )
+
+    def interval(self, thing: Thing) -> float:
+        """
+        The current delay between updates of a `Thing`.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+
+        Returns:
+            float: the delay, in seconds, or 0 if the `Thing` is updated
+            on every tick.
+        """
+        return self.__intervals[self.__fleet.id_of(thing)]
+
+    @property
+    def skipped(self) -> int:
+        """
+        Total number of updates that were skipped while backing off.
+
+        Returns:
+            int: the number of skipped updates.
+        """
+        return self.__skipped
+
+
+class DependencyScheduler(FleetObserver):
+    """
+    Updates a `Fleet` in dependency order, so that a `Thing` that reads
+    other things is updated after them on the same tick, instead of
+    seeing their state from the previous tick.
+
+    Things are grouped into levels: a `Thing` with no dependencies is in
+    the first level, and every other `Thing` is in the level after its
+    deepest dependency. Levels are updated in order, and the things in a
+    level can be updated in parallel by an executor, since none of them
+    depend on each other. Things in a level must not share other
+    mutable data, and their observers are notified from the executor's
+    workers.
+
+    Only thread pools are supported, since things must be updated in
+    this process. On CPython the global interpreter lock still runs one
+    thread at a time, so a thread pool only speeds up levels whose
+    updates wait on I/O or call code that releases the lock.
+    """
+
+    def __init__(self, fleet: Fleet, executor: object = None):
+        """
+        Constructor that schedules every `Thing` in the fleet, including
+        things added later.
+
+        Args:
+            fleet (Fleet): the `Fleet` to update.
+            executor (concurrent.futures.ThreadPoolExecutor, optional):
+            executor that updates the things of each level in parallel.
+            Defaults to updating them one at a time.
+        """
+        assert executor is None or (
+            ThreadPoolExecutor is not None and isinstance(executor, ThreadPoolExecutor)
+        ), "executor must be a ThreadPoolExecutor"
+        self.__fleet = fleet
+        self.__executor = executor
+        self.__dependencies: List[List[int]] = []
+        self.__levels: List[List[Thing]] = None
+
+        for thing in fleet:
+            self.thing_added(fleet, thing, fleet.id_of(thing))
+        fleet.observers.attach(self)
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Schedule a `Thing` that was added to the fleet."""
+        self.__dependencies.append([])
+        self.__levels = None
+
+    def depends_on(self, thing: Thing, dependency: Thing):
+        """
+        Declare that a `Thing` reads another `Thing`, so the dependency
+        is always updated first.
+
+        Args:
+            thing (Thing): a `Thing` in the fleet.
+            dependency (Thing): a `Thing` in the fleet that `thing` reads.
+        """
+        fleet = self.__fleet
+        dependency_id = fleet.id_of(dependency)
+        dependencies = self.__dependencies[fleet.id_of(thing)]
+        if dependency_id not in dependencies:
+            dependencies.append(dependency_id)
+            self.__levels = None
+
+    @property
+    def levels(self) -> "List[List[Thing]]":
+        """
+        The things of the fleet, grouped into the levels that are
+        updated in order. Computed again only after things or
+        dependencies are added.
+
+        Returns:
+            List[List[Thing]]: the things of each level.
+        """
+        if self.__levels is None:
+            self.__levels = self.__compute_levels()
+        return self.__levels
+
+    def __compute_levels(self) -> "List[List[Thing]]":
+        # Kahn's algorithm, one level at a time
+        dependencies = self.__dependencies
+        dependents: List[List[int]] = [[] for _ in dependencies]
+        waiting = [len(thing_dependencies) for thing_dependencies in dependencies]
+        for thing_id, thing_dependencies in enumerate(dependencies):
+            for dependency_id in thing_dependencies:
+                dependents[dependency_id].append(thing_id)
+
+        level = [thing_id for thing_id, count in enumerate(waiting) if count == 0]
+        levels = []
+        scheduled = 0
+        while level:
+            levels.append([self.__fleet[thing_id] for thing_id in level])
+            scheduled += len(level)
+
+            next_level = []
+            for thing_id in level:
+                for dependent_id in dependents[thing_id]:
+                    waiting[dependent_id] -= 1
+                    if waiting[dependent_id] == 0:
+                        next_level.append(dependent_id)
+            level = next_level
+
+        assert scheduled == len(dependencies), "dependencies have a cycle"
+        return levels
+
+    def update(self):
+        """Update every `Thing` in the fleet, one level at a time."""
+        executor = self.__executor
+        monitor = self.__fleet.monitor
+        for level in self.levels:
+            if executor is None or len(level) == 1:
+                for thing in level:
+                    thing.update()
+            else:
+                # wait for the whole level, raising any update's error
+                for _ in executor.map(_update_thing, level):
+                    pass
+
+            if monitor is not None:
+                # recorded here, since monitors are not thread-safe
+                for thing in level:
+                    monitor.record(thing.time_elapsed, thing)
+
+
+def _update_thing(thing: Thing):
+    thing.update()
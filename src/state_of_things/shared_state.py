@@ -0,0 +1,292 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.shared_state`
+================================================================================
+
+Mirror the current `State` of every `Thing` in a `Fleet` into shared
+memory, so that other processes on the same host can read it without
+any IPC into the process that updates the fleet.
+
+The control process creates a `SharedStateTable` for its fleet:
+
+.. code-block:: python
+
+    fleet = Fleet(TrafficLightThing(slow_seconds=3) for _ in range(100))
+    table = SharedStateTable(fleet)
+    print(table.name)  # pass this name to readers
+
+Monitoring processes attach a `SharedStateReader` to the table's name:
+
+.. code-block:: python
+
+    reader = SharedStateReader(name)
+    for thing_id in range(len(reader)):
+        print(thing_id, reader.read(thing_id))
+
+This module requires CPython's :mod:`multiprocessing.shared_memory` and
+is not imported by default.
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import struct
+import time
+from multiprocessing import shared_memory
+
+try:
+    from typing import FrozenSet, Iterable, List, Tuple
+except ImportError:  # pragma: no cover
+    pass
+
+from .fleet import Fleet, FleetObserver
+from .state_of_things import State, Thing, ThingObserver
+
+# magic, capacity, count, size of the encoded state names
+_HEADER = struct.Struct("<4sIII")
+# sequence, state id, entered at
+_RECORD = struct.Struct("<IId")
+# state id, entered at, following the sequence
+_PAYLOAD = struct.Struct("<Id")
+_HEADER_COUNT = struct.Struct("<I")
+_SEQUENCE = struct.Struct("<I")
+_MAGIC = b"SOT1"
+_COUNT_OFFSET = 8
+
+
+def _names_size(names: bytes) -> int:
+    # keep records 8-byte aligned
+    return (len(names) + 7) & ~7
+
+
+class SharedStateTable(ThingObserver, FleetObserver):
+    """
+    Writes the current `State` id and the time it was entered for each
+    `Thing` in a `Fleet` into a shared memory block. Things added to the
+    fleet after the table is created are mirrored as well, up to the
+    table's capacity.
+
+    Records hold :attr:`State.id` plus 1, and the names of every `State`
+    in :attr:`State.registry` are stored with the table, so states must
+    be created before the table. Id 0 means the `Thing` has not entered
+    a known `State`. Entered at times are seconds since the epoch
+    (see :func:`time.time`).
+
+    Each record is protected by a sequence counter, so readers never
+    block the control loop and retry if they observe a partial write.
+    """
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        states: "Iterable[State]" = None,
+        capacity: int = None,
+        name: str = None,
+    ):
+        """
+        Constructor that creates the shared memory block and starts
+        mirroring the fleet.
+
+        Args:
+            fleet (Fleet): the `Fleet` to mirror.
+            states (Iterable[State], optional): the only states that are
+            known to the table. Defaults to every registered `State`.
+            capacity (int, optional): maximum number of things that can
+            be mirrored. Defaults to the current size of the fleet.
+            name (str, optional): name of the shared memory block.
+            Defaults to a generated name.
+        """
+        self.__fleet = fleet
+        self.__known: FrozenSet[State] = (
+            frozenset(states) if states is not None else None
+        )
+        registered = list(State.registry)
+        self.__state_count = len(registered)
+        self.__capacity = capacity if capacity is not None else len(fleet)
+        assert self.__capacity > 0, "capacity must be greater than zero"
+
+        names = "\n".join(
+            state.name if self.__is_known(state) else "" for state in registered
+        ).encode()
+        self.__records_offset = _HEADER.size + _names_size(names)
+
+        self.__memory = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=self.__records_offset + _RECORD.size * self.__capacity,
+        )
+        buffer = self.__memory.buf
+        _HEADER.pack_into(buffer, 0, _MAGIC, self.__capacity, 0, len(names))
+        buffer[_HEADER.size : _HEADER.size + len(names)] = names
+
+        for thing in fleet:
+            self.thing_added(fleet, thing, fleet.id_of(thing))
+        fleet.observers.attach(self)
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block, used to open a
+        `SharedStateReader`.
+
+        Returns:
+            str: the shared memory block name.
+        """
+        return self.__memory.name
+
+    def thing_adding(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Reject a `Thing` that would exceed the table's capacity."""
+        if thing_id >= self.__capacity:
+            raise IndexError(f"{thing.name} exceeds capacity {self.__capacity}")
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        """Start mirroring a `Thing` that was added to the fleet."""
+        self.thing_adding(fleet, thing, thing_id)
+        thing.observers.attach(self)
+        self.__write(thing_id, thing.current_state)
+        _HEADER_COUNT.pack_into(self.__memory.buf, _COUNT_OFFSET, thing_id + 1)
+
+    def state_entered(self, thing: Thing, state: State):
+        """Mirror the `State` that a `Thing` entered."""
+        self.__write(self.__fleet.id_of(thing), state)
+
+    def __is_known(self, state: State) -> bool:
+        return self.__known is None or state in self.__known
+
+    def __write(self, thing_id: int, state: State):
+        buffer = self.__memory.buf
+        offset = self.__records_offset + _RECORD.size * thing_id
+        sequence = _SEQUENCE.unpack_from(buffer, offset)[0]
+        state_id = (
+            state.id + 1
+            if state is not None
+            and state.id < self.__state_count
+            and self.__is_known(state)
+            else 0
+        )
+
+        # an odd sequence marks the record as being written, and the even
+        # sequence is only written once the payload is complete
+        _SEQUENCE.pack_into(buffer, offset, (sequence + 1) & 0xFFFFFFFF)
+        _PAYLOAD.pack_into(
+            buffer,
+            offset + _SEQUENCE.size,
+            state_id,
+            time.time() if state is not None else 0.0,
+        )
+        _SEQUENCE.pack_into(buffer, offset, (sequence + 2) & 0xFFFFFFFF)
+
+    def close(self):
+        """
+        Stop mirroring the fleet and close this process' access to the
+        shared memory block.
+        """
+        self.__fleet.observers.detach(self)
+        for thing in self.__fleet:
+            if self.__fleet.id_of(thing) < self.__capacity:
+                thing.observers.detach(self)
+        self.__memory.close()
+
+    def unlink(self):
+        """
+        Request that the shared memory block is destroyed once every
+        process has closed it.
+        """
+        self.__memory.unlink()
+
+
+class SharedStateReader:
+    """
+    Reads the records written by a `SharedStateTable`, possibly from
+    another process. Reads never take a lock.
+    """
+
+    def __init__(self, name: str):
+        """
+        Constructor that attaches to an existing shared memory block.
+
+        Args:
+            name (str): the name of the `SharedStateTable`.
+        """
+        self.__memory = shared_memory.SharedMemory(name=name)
+        magic, capacity, _, names_size = _HEADER.unpack_from(self.__memory.buf, 0)
+        assert magic == _MAGIC, f"{name} is not a shared state table"
+
+        self.__capacity = capacity
+        names = bytes(self.__memory.buf[_HEADER.size : _HEADER.size + names_size])
+        self.__state_names: List[str] = [None] + [
+            name or None for name in names.decode().split("\n")
+        ]
+        self.__records_offset = _HEADER.size + _names_size(names)
+
+    @property
+    def state_names(self) -> "List[str]":
+        """
+        The `State` names known to the table, indexed by state id, which
+        is :attr:`State.id` plus 1. Id 0, and states that are not known,
+        are None.
+
+        Returns:
+            List[str]: the state names.
+        """
+        return self.__state_names
+
+    def read_ids(self, thing_id: int, retries: int = 10000) -> "Tuple[int, float]":
+        """
+        Read the state id and entered at time of a `Thing`.
+
+        Args:
+            thing_id (int): the id of the `Thing` in its `Fleet`.
+            retries (int, optional): times to read again while the
+            record is being written before giving up. Defaults to 10000.
+
+        Returns:
+            Tuple[int, float]: the state id and the time it was entered,
+            in seconds since the epoch.
+
+        Raises:
+            TimeoutError: if the record was still being written after
+            every retry, for instance because the writer died while
+            writing it.
+        """
+        if not 0 <= thing_id < len(self):
+            raise IndexError(thing_id)
+
+        buffer = self.__memory.buf
+        offset = self.__records_offset + _RECORD.size * thing_id
+        for _ in range(retries + 1):
+            sequence, state_id, entered_at = _RECORD.unpack_from(buffer, offset)
+            if sequence & 1:
+                # the writer is in the middle of updating this record
+                continue
+            if _SEQUENCE.unpack_from(buffer, offset)[0] == sequence:
+                return state_id, entered_at
+        raise TimeoutError(f"record {thing_id} is still being written")
+
+    def read(self, thing_id: int, retries: int = 10000) -> "Tuple[str, float]":
+        """
+        Read the state name and entered at time of a `Thing`.
+
+        Args:
+            thing_id (int): the id of the `Thing` in its `Fleet`.
+            retries (int, optional): times to read again while the
+            record is being written, see :attr:`read_ids`.
+
+        Returns:
+            Tuple[str, float]: the `State` name, or None if the `Thing`
+            has not entered a known `State`, and the time it was entered.
+        """
+        state_id, entered_at = self.read_ids(thing_id, retries)
+        return self.__state_names[state_id], entered_at
+
+    def close(self):
+        """Close this process' access to the shared memory block."""
+        self.__memory.close()
+
+    def __len__(self) -> int:
+        return min(
+            _HEADER_COUNT.unpack_from(self.__memory.buf, _COUNT_OFFSET)[0],
+            self.__capacity,
+        )
@@ -16,25 +16,201 @@ See examples directory for ideas on usage.
 """
 
 import time
-from .observers import Observers
+from .context import StateContext, _acquire_context, _release_context
+from .inputs import _clear_inputs, _input_mask
+from .monitor import IntervalMonitor
+from .observers import ExecutorObserver, Observers
+
+try:
+    from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Type
+except ImportError:  # pragma: no cover
+    pass
+
+
+# states from the root ancestor down to each nested state
+_LINEAGES: "Dict[State, Tuple[State, ...]]" = {}
+
+# states exited and entered by each transition between nested states
+_TRANSITION_PATHS: (
+    "Dict[Tuple[State, State], Tuple[Tuple[State, ...], Tuple[State, ...]]]"
+) = {}
+
+
+def _lineage(state: "State") -> "Tuple[State, ...]":
+    lineage = _LINEAGES.get(state)
+    if lineage is None:
+        states = [state]
+        parent = state.parent
+        while parent is not None:
+            assert parent not in states, "state hierarchy has a cycle"
+            assert (
+                parent.context_class is None
+            ), f"parent state {parent.name} can not have a context_class"
+            states.append(parent)
+            parent = parent.parent
+        lineage = _LINEAGES[state] = tuple(reversed(states))
+    return lineage
+
+
+def _transition_path(
+    old_state: "State", new_state: "State"
+) -> "Tuple[Tuple[State, ...], Tuple[State, ...]]":
+    key = (old_state, new_state)
+    path = _TRANSITION_PATHS.get(key)
+    if path is None:
+        old_lineage = _lineage(old_state) if old_state is not None else ()
+        new_lineage = _lineage(new_state)
+
+        # skip the ancestors shared by both states, which stay active
+        common = 0
+        while (
+            common < len(old_lineage)
+            and common < len(new_lineage)
+            and old_lineage[common] is new_lineage[common]
+        ):
+            common += 1
+
+        path = _TRANSITION_PATHS[key] = (
+            tuple(reversed(old_lineage[common:])),
+            new_lineage[common:],
+        )
+    return path
+
+
+class StateRegistry:
+    """
+    Assigns every `State` a dense integer id, starting at 0, when it is
+    created. Ids are stable for the life of the process, and can be used
+    as indexes into arrays, in serialized data and in metrics labels.
+    Every `State` is registered in :attr:`State.registry`.
+
+    States are expected to be created once, when their module is
+    imported, since the registry keeps every `State` it assigned an id.
+    """
+
+    def __init__(self) -> None:
+        self.__states: List[State] = []
+
+    def register(self, state: "State") -> int:
+        """
+        Assign the next id to a `State`.
+
+        Args:
+            state (State): the `State` to register.
+
+        Returns:
+            int: the id assigned to the `State`.
+        """
+        state_id = len(self.__states)
+        self.__states.append(state)
+        return state_id
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def __iter__(self) -> "Iterator[State]":
+        return iter(self.__states)
+
+    def __getitem__(self, state_id: int) -> "State":
+        return self.__states[state_id]
 
 
 class State:
     """
     Represents a state that a `Thing` can enter and exit. The state can
     transition a `Thing` into another state when it is updated.
+
+    States can be nested by setting :attr:`parent`. A parent `State`
+    handles transitions shared by all of its children once, instead of
+    repeating them in each child:
+
+    .. code-block:: python
+
+        class NormalState(State):
+            def update(self, thing):
+                if thing.caution_mode:
+                    return TrafficLightStates.caution
+                return self
+
+        TrafficLightStates.normal = NormalState()
+
+        class StopState(State):
+            parent = TrafficLightStates.normal
+            ...
+    """
+
+    registry: StateRegistry = StateRegistry()
+    """The `StateRegistry` that assigns the :attr:`id` of every state."""
+
+    context_class: "Type[StateContext]" = None
+    """
+    Optional `StateContext` subclass. A new context is available as
+    :attr:`Thing.context` while a `Thing` is in this state. A `Thing`
+    only has the context of its current state, so a :attr:`parent` state
+    can not have a context, and shared data belongs on the `Thing`.
+    """
+
+    inputs: "Tuple[str, ...]" = None
+    """
+    Optional names of the `Input` attributes of a `Thing` that
+    :attr:`update` depends on. When set, :attr:`update` is only called
+    on the first update after this state is entered, after one of these
+    inputs changed, or once a time set with :attr:`Thing.recheck_after`
+    is reached, since it would otherwise return the same `State`:
+
+    .. code-block:: python
+
+        class GoState(State):
+            inputs = ("should_go",)
+
+            def update(self, thing):
+                if not thing.should_go:
+                    return TrafficLightStates.slow
+                return self
+
+    States that depend on time, such as :attr:`Thing.time_active`, must
+    call :attr:`Thing.recheck_after`. Inputs are only tracked for the
+    states of a `Thing`, not those of a `Region`.
     """
 
+    parent: "State" = None
+    """
+    Optional `State` that this state is nested in. While a `Thing` is
+    in this state it is also in every ancestor, which are updated first,
+    starting from the root. Changing to another `State` only exits and
+    enters the states that are not shared by both, and these paths are
+    computed once per pair of states, so the hierarchy must not change
+    once things use it.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        # assign the id and name before any subclass __init__ runs
+        state = super().__new__(cls)
+        state.__name = cls.__name__
+        state.__id = State.registry.register(state)
+        return state
+
+    @property
+    def id(self) -> int:
+        """
+        The dense integer id assigned to this state by
+        :attr:`registry` when it was created.
+
+        Returns:
+            int: the id of this state.
+        """
+        return self.__id
+
     @property
     def name(self):
         """The state's name, defaulting to the class name."""
-        return type(self).__name__
+        return self.__name
 
     def enter(self, thing: "Thing"):
         """
         Called when a `Thing` enters this state. Typically used for
         one-time setup where state-specific context is added to the
-        Thing.
+        Thing (see :attr:`context_class`).
 
         Args:
             thing (Thing): the `Thing` that entered this state.
@@ -57,6 +233,10 @@ class State:
         function determines whether the `Thing` should remain in this
         state or change to another state.
 
+        When this state is a :attr:`parent`, returning this state lets
+        the child states update, and returning any other `State`
+        changes to it without updating the children.
+
         Often :attr:`Thing.time_elapsed` and :attr:`Thing.time_active`
         are referenced when a `Thing` should transition to another state
         after a given amount of time.
@@ -70,6 +250,69 @@ class State:
         """
         return self
 
+    def on_event(self, thing: "Thing", event: str, payload: object) -> "State":
+        """
+        Called for each event sent with :attr:`Thing.dispatch` while a
+        `Thing` is in this state, in the order they were dispatched.
+        Each event is handled, including any change of state, before the
+        next one.
+
+        Events that the current state does not change state for are
+        offered to its :attr:`parent` states, from the nearest one up.
+
+        Args:
+            thing (Thing): the `Thing` that received the event.
+            event (str): the name of the event.
+            payload (object): data sent with the event, if any.
+
+        Returns:
+            State: the next state for the Thing, or this state if the
+            `Thing` should remain unchanged.
+        """
+        return self
+
+
+def _handle_event(
+    thing: "Thing",
+    state: State,
+    parents: "Tuple[State, ...]",
+    event: str,
+    payload: object,
+) -> State:
+    # offer an event to the current State, and then to its parents
+    next_state = state.on_event(thing, event, payload)
+    if next_state is state:
+        for parent in reversed(parents):
+            next_state = parent.on_event(thing, event, payload)
+            if next_state is not parent:
+                return next_state
+        return state
+    return next_state
+
+
+def _exit_states(thing: "Thing", states: "Tuple[State, ...]", tracer: "Tracer"):
+    # exit states in order, recording each one when traced
+    if tracer is None:
+        for state in states:
+            state.exit(thing)
+        return
+    for state in states:
+        started = tracer.clock()
+        state.exit(thing)
+        tracer.record(thing, "exit", state.name, started)
+
+
+def _enter_states(thing: "Thing", states: "Tuple[State, ...]", tracer: "Tracer"):
+    # enter states in order, recording each one when traced
+    if tracer is None:
+        for state in states:
+            state.enter(thing)
+        return
+    for state in states:
+        started = tracer.clock()
+        state.enter(thing)
+        tracer.record(thing, "enter", state.name, started)
+
 
 class ThingObserver:
     """
@@ -91,6 +334,167 @@ class ThingObserver:
         """
         pass
 
+    def state_entered(self, thing: "Thing", state: State):
+        """
+        Notified each time a `Thing` enters a `State`, including its
+        initial `State` on the first update, and each :attr:`State.parent`
+        entered along the way, from the root down. Changing from a
+        `State` to one of its parents notifies the parent, which becomes
+        the current `State` without being entered again.
+
+        Args:
+            thing (Thing): the `Thing` that entered the `State`.
+            state (State): the `State` that was entered.
+        """
+        pass
+
+
+class ThingObservers(Observers):
+    """
+    The `Observers` of a `Thing`. In addition to event name filters,
+    observers can subscribe to only some :attr:`ThingObserver.state_changed`
+    notifications, which are indexed by the `State` changed from and to:
+
+    .. code-block:: python
+
+        # only notified when changing into caution
+        thing.observers.attach(CautionAlarm(), new_state=TrafficLightStates.caution)
+
+        # only notified when changing from go to slow
+        thing.observers.attach(
+            SlowingLogger(),
+            old_state=TrafficLightStates.go,
+            new_state=TrafficLightStates.slow,
+        )
+
+    Every event notified is also published to the :attr:`Thing.bus` of
+    the `Thing`, if it has one. Rate limit and coalesce windows are timed
+    by :attr:`Thing.clock`.
+    """
+
+    def __init__(self, thing: "Thing" = None) -> None:
+        """
+        Constructor for the observers of a `Thing`.
+
+        Args:
+            thing (Thing, optional): the `Thing` that notifies events,
+            used to publish them to its :attr:`Thing.bus`.
+        """
+        super().__init__()
+        self.__thing = thing
+        self.__transitions: Dict[Tuple[State, State], List] = {}
+
+    def attach(  # pylint: disable=too-many-arguments
+        self,
+        observer: object,
+        executor: object = None,
+        events: "Iterable[str]" = None,
+        old_state: State = None,
+        new_state: State = None,
+    ) -> object:
+        """
+        Attach an observer that will be notified of events that it
+        supports.
+
+        When `old_state` or `new_state` is set, the observer is only
+        notified of state changes that match them, and only of the other
+        events listed in `events`.
+
+        Args:
+            observer (object): the observer to attach.
+            executor (concurrent.futures.Executor, optional): executor
+            that runs the observer's handlers.
+            events (Iterable[str], optional): names of the only events
+            the observer will be notified of.
+            old_state (State, optional): only notify changes from this
+            `State`.
+            new_state (State, optional): only notify changes to this
+            `State`.
+
+        Returns:
+            object: the attached observer, or its `ExecutorObserver`.
+        """
+        if old_state is None and new_state is None:
+            return super().attach(observer, executor, events)
+
+        other_events = (
+            [event for event in events if event != "state_changed"]
+            if events is not None
+            else ()
+        )
+        attached = super().attach(observer, executor, other_events)
+
+        handler = getattr(attached, "state_changed", None)
+        if callable(handler):
+            key = (old_state, new_state)
+            if key not in self.__transitions:
+                self.__transitions[key] = []
+            self.__transitions[key].append((attached, handler))
+
+        return attached
+
+    def detach(self, observer: object):
+        """
+        Detach an observer, including its state change subscriptions.
+
+        Args:
+            observer (object): the observer to detach.
+        """
+        for key, subscriptions in list(self.__transitions.items()):
+            subscriptions[:] = [
+                (attached, handler)
+                for attached, handler in subscriptions
+                if attached is not observer
+                and not (
+                    isinstance(attached, ExecutorObserver)
+                    and attached.observer is observer
+                )
+            ]
+            if not subscriptions:
+                del self.__transitions[key]
+        super().detach(observer)
+
+    def clear(self):
+        """Detach all observers, including state change subscriptions."""
+        self.__transitions.clear()
+        super().clear()
+
+    def _now(self) -> float:
+        # rate limit and coalesce windows follow the Thing's clock
+        thing = self.__thing
+        return thing.clock() if thing is not None else super()._now()
+
+    def _deliver(self, event_name: str, params: "Tuple"):
+        thing = self.__thing
+        tracer = thing.tracer if thing is not None else None
+        if tracer is not None and tracer.traces(thing):
+            started = tracer.clock()
+            self.__deliver(event_name, params)
+            tracer.record(thing, "notify", event_name, started)
+        else:
+            self.__deliver(event_name, params)
+
+    def __deliver(self, event_name: str, params: "Tuple"):
+        # also notify subscriptions that match a state change, and
+        # publish to the Thing's bus
+        super()._deliver(event_name, params)
+
+        if self.__transitions and event_name == "state_changed":
+            _, old_state, new_state = params
+            for key in (
+                (old_state, new_state),
+                (old_state, None),
+                (None, new_state),
+            ):
+                subscriptions = self.__transitions.get(key)
+                if subscriptions:
+                    for attached, handler in subscriptions:
+                        self._call_handler(attached, handler, event_name, params)
+
+        thing = self.__thing
+        if thing is not None and thing.bus is not None:
+            thing.bus.publish(thing, event_name, params)
+
 
 class Thing:
     """
@@ -99,6 +503,35 @@ class Thing:
     implementations to update and transition between states.
     """
 
+    clock = time.monotonic
+    """
+    The monotonic clock, in seconds, used to track time for this thing.
+    Can be replaced with any callable, such as a virtual clock in
+    simulations and tests, on a class before its things are created or
+    on a single thing. Each thing keeps the clock of its class when it
+    is created, so plain functions are never bound as methods.
+    """
+
+    tracer: "Tracer" = None
+    """
+    Optional `Tracer` that records the activity of this thing. Set by
+    :attr:`Tracer.start`, and checked once per update and transition
+    while unset.
+    """
+
+    bus: "EventBus" = None
+    """
+    Optional `EventBus` that every event notified by this thing is
+    published to. Set it on `Thing`, or a subclass, to publish from
+    every instance without any per-thing registration.
+    """
+
+    max_events: int = 16
+    """
+    Maximum number of events waiting to be handled by each thing (see
+    :attr:`dispatch`).
+    """
+
     def __init__(self, initial_state: State, name: str = None):
         """
         Constructor that stores the initial `State` but does not change
@@ -112,28 +545,72 @@ class Thing:
         assert initial_state, "initial_state is required"
         self.__initial_state = initial_state
         self.__name = name if name is not None else type(self).__name__
+        # read from the class, so a plain function is not bound to self
+        self.clock = type(self).clock
 
-        self.__observers = Observers()
+        self.__observers = ThingObservers(self)
 
         self.__current_state: State = None
         self.__previous_state: State = None
         self.__time_last_update: float = 0
         self.__time_elapsed: float = 0
         self.__time_active: float = 0
+        self.__monitor: IntervalMonitor = None
+        self.__history: "TransitionHistory" = None
+        self.__context: StateContext = None
+        self.__parents: Tuple[State, ...] = ()
+        self.__regions: List["Region"] = []
+        self.__events: List[Tuple[str, object]] = []
+        # bits of inputs changed since the last update, or -1 to update
+        # every State
+        self.__changed_inputs = -1
+        self.__recheck_at: float = None
+        self.__wake_handler: "Callable[[Thing, float], None]" = None
 
     def __go_to_state(self, new_state: State):
         """
         Change this thing to a new `State`. Notifies all observers of the
-        state change if moving from a previous `State`.
+        state change if moving from a previous `State`, and that the new
+        `State` was entered.
 
         Args:
             new_state (State): the target `State` for this thing.
         """
         assert new_state, "new_state can not be None"
 
-        # if changing from a previous State, exit it
-        if self.__current_state:
-            self.__current_state.exit(self)
+        tracer = self.tracer
+        if tracer is None or not tracer.traces(self):
+            self.__change_state(new_state, None)
+            return
+
+        started = tracer.clock()
+        old_state = self.__current_state
+        self.__change_state(new_state, tracer)
+        tracer.record(
+            self,
+            "transition",
+            f"{old_state.name if old_state else None} -> {new_state.name}",
+            started,
+        )
+
+    def __change_state(self, new_state: State, tracer: "Tracer"):
+        old_state = self.__current_state
+        if new_state.parent is None and (old_state is None or old_state.parent is None):
+            exits = (old_state,) if old_state is not None else ()
+            enters = (new_state,)
+            self.__parents = ()
+        else:
+            exits, enters = _transition_path(old_state, new_state)
+            self.__parents = _lineage(new_state)[:-1]
+
+        # exit the previous State, and any parents that are not shared
+        # with the new State
+        _exit_states(self, exits, tracer)
+
+        # recycle the exited State's context
+        if self.__context is not None:
+            _release_context(self.__context)
+            self.__context = None
 
         # update the thing's state
         self.__previous_state = self.__current_state
@@ -145,13 +622,33 @@ class Thing:
                 "state_changed", self, self.__previous_state, self.__current_state
             )
 
-        # reset time tracking properties
-        self.__time_last_update = time.monotonic()
+        # reset time tracking properties, after recording how long the
+        # previous State lasted
+        self.__time_last_update = self.clock()
+        if self.__history is not None:
+            self.__history.record(
+                self.__previous_state,
+                new_state,
+                self.__time_last_update,
+                self.__time_active,
+            )
         self.__time_elapsed = 0
         self.__time_active = 0
-
-        # enter the new State
-        self.__current_state.enter(self)
+        self.__changed_inputs = -1
+        self.__recheck_at = None
+
+        # enter any parents not yet entered and then the new State, with
+        # a fresh context if it has one
+        if new_state.context_class is not None:
+            self.__context = _acquire_context(new_state.context_class)
+        _enter_states(self, enters, tracer)
+
+        for state in enters:
+            self.observers.notify("state_entered", self, state)
+        if not enters:
+            # changed from a child State back to one of its parents, which
+            # was not entered again but is now the current State
+            self.observers.notify("state_entered", self, new_state)
 
     def update(self):
         """
@@ -162,21 +659,190 @@ class Thing:
         current one, then this thing will transition to the returned
         `State`.
         """
+        tracer = self.tracer
+        if tracer is not None and tracer.traces(self):
+            started = tracer.clock()
+            self.__update()
+            tracer.record(self, "update", self.__current_state.name, started)
+        else:
+            self.__update()
+
+    def __update(self):
         # if the Thing is not in it's initial State, change to it
         if self.__current_state is None:
             self.__go_to_state(self.__initial_state)
 
         # update time tracking properties
-        now = time.monotonic()
+        now = self.clock()
         self.__time_elapsed = now - self.__time_last_update
         self.__time_last_update = now
         self.__time_active += self.__time_elapsed
-
-        # update the current State
-        next_state = self.__current_state.update(self)
+        if self.__monitor is not None:
+            self.__monitor.record(self.__time_elapsed, self)
+
+        # notify events held back by coalescing
+        self.__observers.flush()
+
+        # handle events dispatched since the last update
+        if self.__events:
+            self.__handle_events()
+
+        # skip updating states whose inputs have not changed
+        changed = self.__changed_inputs
+        if self.__recheck_at is not None and now >= self.__recheck_at:
+            self.__recheck_at = None
+            changed = -1
+        self.__changed_inputs = 0
+
+        # update parents from the root, and then the current State
+        # unless a parent changes State
+        thing_class = type(self)
+        for parent in self.__parents:
+            if (
+                parent.inputs is not None
+                and changed != -1
+                and not changed & _input_mask(thing_class, parent)
+            ):
+                continue
+            next_state = parent.update(self)
+            if next_state is not parent:
+                break
+        else:
+            state = self.__current_state
+            if (
+                state.inputs is None
+                or changed == -1
+                or changed & _input_mask(thing_class, state)
+            ):
+                next_state = state.update(self)
+            else:
+                next_state = state
         if next_state != self.__current_state:
             self.__go_to_state(next_state)
 
+        # update each region with the same time tracking
+        for region in self.__regions:
+            region.tick(self.__time_elapsed)
+
+    def _input_changed(self, bit: int):
+        # called by Input when its value changes
+        self.__changed_inputs |= bit
+        if self.__wake_handler is not None:
+            self.__wake_handler(self, None)
+
+    def recheck_after(self, seconds: float):
+        """
+        Update the current `State` once a number of seconds have passed,
+        even if none of its :attr:`State.inputs` changed. Typically
+        called from :attr:`State.update` when waiting on
+        :attr:`time_active`.
+
+        Args:
+            seconds (float): seconds from now, on :attr:`clock`.
+        """
+        recheck_at = self.clock() + seconds
+        if self.__recheck_at is None or recheck_at < self.__recheck_at:
+            self.__recheck_at = recheck_at
+        if self.__wake_handler is not None:
+            self.__wake_handler(self, seconds)
+
+    def dispatch(
+        self, event: str, payload: object = None, coalesce: bool = False
+    ) -> bool:
+        """
+        Queue an event for the current `State` (see :attr:`State.on_event`)
+        and the states of every region. Queued events are handled in
+        order on the next :attr:`update`, and events dispatched while
+        handling them wait for the following update.
+
+        Args:
+            event (str): the name of the event.
+            payload (object, optional): data sent with the event.
+            coalesce (bool, optional): do not queue the event if an
+            equal event and payload is already waiting.
+
+        Returns:
+            bool: False if the event was dropped because
+            :attr:`max_events` are already waiting.
+        """
+        events = self.__events
+        if coalesce and (event, payload) in events:
+            return True
+        if len(events) >= self.max_events:
+            return False
+        events.append((event, payload))
+        if self.__wake_handler is not None:
+            self.__wake_handler(self, None)
+        return True
+
+    def __handle_events(self):
+        events = self.__events
+        self.__events = []
+        for event, payload in events:
+            state = self.__current_state
+            next_state = _handle_event(self, state, self.__parents, event, payload)
+            if next_state != state:
+                self.__go_to_state(next_state)
+
+            for region in self.__regions:
+                region.handle_event(event, payload)
+
+    def add_region(self, region: "Region") -> "Region":
+        """
+        Add a `Region` with its own `State` that advances independently
+        of this thing's :attr:`current_state`. Regions are updated in
+        the order they were added, after the current `State`.
+
+        Args:
+            region (Region): the `Region` to add.
+
+        Returns:
+            Region: the added `Region`.
+        """
+        assert region.thing is None, "region already belongs to a thing"
+        region.added_to(self)
+        self.__regions.append(region)
+        return region
+
+    def reset(self):
+        """
+        Return this thing to how it was constructed, so that it can be
+        reused. The current `State` is exited (without notifying
+        observers) and its context released, and the next
+        :attr:`update` enters the initial `State` again. Each region is
+        reset too, every `Input` returns to its default, and queued
+        events, events held back by :attr:`Observers.coalesce` and the
+        recorded history are discarded. Observers and their limits,
+        regions, the monitor and the history itself are kept.
+
+        Subclasses with their own data should extend this function to
+        reset it, and call ``super().reset()``.
+        """
+        if self.__current_state is not None:
+            self.__current_state.exit(self)
+            for parent in reversed(self.__parents):
+                parent.exit(self)
+        if self.__context is not None:
+            _release_context(self.__context)
+            self.__context = None
+
+        for region in self.__regions:
+            region.reset()
+        if self.__history is not None:
+            self.__history.clear()
+
+        self.__current_state = None
+        self.__previous_state = None
+        self.__parents = ()
+        self.__events = []
+        self.__observers.reset_limits()
+        _clear_inputs(self)
+        self.__changed_inputs = -1
+        self.__recheck_at = None
+        self.__time_last_update = 0
+        self.__time_elapsed = 0
+        self.__time_active = 0
+
     @property
     def name(self) -> str:
         """
@@ -233,7 +899,78 @@ class Thing:
         return self.__time_active
 
     @property
-    def observers(self) -> Observers:
+    def context(self) -> StateContext:
+        """
+        The context of the current `State`, created when the `State` was
+        entered (see :attr:`State.context_class`).
+
+        Returns:
+            StateContext: the current context, or None if the current
+            `State` does not have one.
+        """
+        return self.__context
+
+    @property
+    def regions(self) -> "Tuple[Region, ...]":
+        """
+        The regions added to this thing.
+
+        Returns:
+            Tuple[Region, ...]: the regions, in the order they are
+            updated.
+        """
+        return tuple(self.__regions)
+
+    @property
+    def monitor(self) -> IntervalMonitor:
+        """
+        Optional monitor that records :attr:`time_elapsed` on every
+        update of this thing.
+
+        Returns:
+            IntervalMonitor: the monitor, or None if not monitored.
+        """
+        return self.__monitor
+
+    @monitor.setter
+    def monitor(self, monitor: IntervalMonitor):
+        self.__monitor = monitor
+
+    @property
+    def wake_handler(self) -> "Callable[[Thing, float], None]":
+        """
+        Optional function called when this thing has work for its next
+        update: with None when an event is dispatched or an `Input`
+        changes, and with the seconds passed to :attr:`recheck_after`.
+        Set by a `CompositeThing` to only update children that need it
+        (and cleared by :attr:`CompositeThing.remove_child`), and by an
+        `AdaptiveScheduler` to stop backing off.
+
+        Returns:
+            Callable[[Thing, float], None]: the handler, or None.
+        """
+        return self.__wake_handler
+
+    @wake_handler.setter
+    def wake_handler(self, wake_handler: "Callable[[Thing, float], None]"):
+        self.__wake_handler = wake_handler
+
+    @property
+    def history(self) -> "TransitionHistory":
+        """
+        Optional history that records every transition of this thing.
+
+        Returns:
+            TransitionHistory: the history, or None if not recorded.
+        """
+        return self.__history
+
+    @history.setter
+    def history(self, history: "TransitionHistory"):
+        self.__history = history
+
+    @property
+    def observers(self) -> ThingObservers:
         """
         The observers that will be notified by this `Thing`. For instance,
         all observers that implement `ThingObserver` will be notified when
@@ -245,6 +982,6 @@ class Thing:
         released.
 
         Returns:
-            Observers: this `Thing`'s observers.
+            ThingObservers: this `Thing`'s observers.
         """
         return self.__observers
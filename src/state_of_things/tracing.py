@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+"""
+`state_of_things.tracing`
+================================================================================
+
+Record what selected things are doing (updates, transitions, entering
+and exiting states, and notifying observers) into a fixed-size
+in-memory buffer, and save it as a Chrome trace that can be opened in
+https://ui.perfetto.dev or chrome://tracing.
+
+Tracing can be started and stopped at any time, for instance from a
+debug command, and costs nothing more than an attribute check per update
+while stopped.
+
+.. code-block:: python
+
+    tracer = Tracer(capacity=100_000, names=["light-7"])
+    tracer.start()
+    ...
+    tracer.stop()
+    tracer.dump("light-7.trace.json")
+
+* Author(s): Aaron Silinskas
+
+"""
+
+import json
+import os
+import time
+
+try:
+    from typing import Callable, Dict, Iterable, List, Tuple, Type
+except ImportError:  # pragma: no cover
+    pass
+
+from .state_of_things import Thing
+
+
+class Tracer:
+    """
+    Records spans of `Thing` activity into a ring buffer that is
+    allocated up front. Once the buffer is full, the oldest spans are
+    overwritten.
+
+    Things are traced if their name is in `names` or they are an
+    instance of one of `classes`. If neither is set, every `Thing` is
+    traced.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        names: "Iterable[str]" = None,
+        classes: "Iterable[Type[Thing]]" = None,
+        clock: "Callable[[], float]" = time.perf_counter,
+    ):
+        """
+        Constructor that allocates the span buffer.
+
+        Args:
+            capacity (int, optional): maximum number of spans kept.
+            Defaults to 10000.
+            names (Iterable[str], optional): names of things to trace.
+            classes (Iterable[Type[Thing]], optional): classes of things
+            to trace, including subclasses.
+            clock (Callable[[], float], optional): clock used to time
+            spans, in seconds. Defaults to :func:`time.perf_counter`.
+        """
+        assert capacity > 0, "capacity must be greater than zero"
+        self.clock = clock
+        self.__names = frozenset(names) if names is not None else frozenset()
+        self.__classes = tuple(classes) if classes is not None else ()
+        self.__trace_all = names is None and classes is None
+        self.__thing_class: Type[Thing] = None
+
+        self.__capacity = capacity
+        self.__things: List[str] = [None] * capacity
+        self.__categories: List[str] = [None] * capacity
+        self.__span_names: List[str] = [None] * capacity
+        self.__starts: List[float] = [0.0] * capacity
+        self.__durations: List[float] = [0.0] * capacity
+        self.__next = 0
+        self.__count = 0
+
+    def start(self, thing_class: "Type[Thing]" = Thing):
+        """
+        Start tracing by setting :attr:`Thing.tracer`.
+
+        Args:
+            thing_class (Type[Thing], optional): the class to set the
+            tracer on. Defaults to `Thing`, to trace every matching
+            `Thing`.
+        """
+        self.__thing_class = thing_class
+        thing_class.tracer = self
+
+    def stop(self):
+        """Stop tracing, keeping the recorded spans."""
+        if self.__thing_class is not None:
+            self.__thing_class.tracer = None
+            self.__thing_class = None
+
+    def traces(self, thing: Thing) -> bool:
+        """
+        Whether a `Thing` is selected for tracing.
+
+        Args:
+            thing (Thing): the `Thing` to check.
+
+        Returns:
+            bool: True if the `Thing`'s activity is recorded.
+        """
+        return (
+            self.__trace_all
+            or thing.name in self.__names
+            or isinstance(thing, self.__classes)
+        )
+
+    def record(self, thing: Thing, category: str, name: str, started: float):
+        """
+        Record a span that ends now.
+
+        Args:
+            thing (Thing): the `Thing` that was active.
+            category (str): the kind of activity, such as ``"update"``.
+            name (str): what the activity was about, such as the name of
+            the `State` that was entered.
+            started (float): when the span started, from :attr:`clock`.
+        """
+        index = self.__next
+        self.__things[index] = thing.name
+        self.__categories[index] = category
+        self.__span_names[index] = name
+        self.__starts[index] = started
+        self.__durations[index] = self.clock() - started
+
+        self.__next = (index + 1) % self.__capacity
+        if self.__count < self.__capacity:
+            self.__count += 1
+
+    def spans(self) -> "List[Tuple[str, str, str, float, float]]":
+        """
+        The recorded spans, oldest first.
+
+        Returns:
+            List[Tuple[str, str, str, float, float]]: the thing name,
+            category, name, start and duration of each span, in seconds.
+        """
+        first = (self.__next - self.__count) % self.__capacity
+        indexes = [(first + offset) % self.__capacity for offset in range(self.__count)]
+        return [
+            (
+                self.__things[index],
+                self.__categories[index],
+                self.__span_names[index],
+                self.__starts[index],
+                self.__durations[index],
+            )
+            for index in indexes
+        ]
+
+    def clear(self):
+        """Discard the recorded spans."""
+        self.__next = 0
+        self.__count = 0
+
+    def chrome_trace(self) -> "Dict":
+        """
+        The recorded spans in the Chrome trace event format. Each `Thing`
+        is shown as its own thread.
+
+        Returns:
+            Dict: the trace, ready to be serialized as JSON.
+        """
+        pid = os.getpid()
+        thread_ids: Dict[str, int] = {}
+        events = []
+        for thing_name, category, name, started, duration in self.spans():
+            tid = thread_ids.get(thing_name)
+            if tid is None:
+                tid = thread_ids[thing_name] = len(thread_ids) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": tid,
+                        "args": {"name": thing_name},
+                    }
+                )
+            events.append(
+                {
+                    "name": f"{category} {name}",
+                    "cat": category,
+                    "ph": "X",
+                    "ts": started * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str):
+        """
+        Save the recorded spans to a Chrome trace file.
+
+        Args:
+            path (str): the file to write.
+        """
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+    def __len__(self) -> int:
+        return self.__count
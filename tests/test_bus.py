@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from src.state_of_things import EventBus, State, Thing
+from .fixtures.observer import CustomNotifierState
+from .fixtures.state import ImmediateChangeState
+
+
+class RecordingObserver:
+    def __init__(self) -> None:
+        self.events = []
+
+    def state_changed(self, thing: Thing, old_state: State, new_state: State):
+        self.events.append(("state_changed", thing, old_state, new_state))
+
+    def custom_event(self, *params):
+        self.events.append(("custom_event",) + params)
+
+
+class BusThing(Thing):
+    bus = EventBus()
+
+
+class OtherBusThing(Thing):
+    bus = BusThing.bus
+
+
+class TestEventBus:
+    def setup_method(self):
+        BusThing.bus = OtherBusThing.bus = EventBus()
+
+    def test_things_publish_state_changes(self):
+        observer = RecordingObserver()
+        BusThing.bus.subscribe(observer)
+
+        new_state = State()
+        initial_state = ImmediateChangeState(next_state=new_state)
+        thing = BusThing(initial_state)
+        thing.update()
+
+        assert observer.events == [("state_changed", thing, initial_state, new_state)]
+
+    def test_things_publish_custom_events(self):
+        observer = RecordingObserver()
+        BusThing.bus.subscribe(observer, events=["custom_event"])
+
+        thing = BusThing(CustomNotifierState("hello", 1))
+        thing.update()
+
+        assert observer.events == [("custom_event", "hello", 1)]
+
+    def test_subscriptions_filter_by_thing_class_and_state(self):
+        by_class = RecordingObserver()
+        by_state = RecordingObserver()
+
+        caution_state = State()
+        BusThing.bus.subscribe(by_class, thing_class=OtherBusThing)
+        BusThing.bus.subscribe(by_state, state=caution_state)
+
+        thing = BusThing(ImmediateChangeState(next_state=caution_state))
+        other_thing = OtherBusThing(ImmediateChangeState(next_state=State()))
+        thing.update()
+        other_thing.update()
+
+        assert [event[1] for event in by_class.events] == [other_thing]
+        assert [event[1] for event in by_state.events] == [thing]
+
+    def test_unsubscribed_observers_are_not_notified(self):
+        observer = RecordingObserver()
+        BusThing.bus.subscribe(observer)
+        BusThing.bus.unsubscribe(observer)
+
+        thing = BusThing(ImmediateChangeState(next_state=State()))
+        thing.update()
+
+        assert len(BusThing.bus) == 0
+        assert not observer.events
+
+    def test_things_without_bus_do_not_publish(self):
+        observer = RecordingObserver()
+        BusThing.bus.subscribe(observer)
+
+        Thing(ImmediateChangeState(next_state=State())).update()
+
+        assert not observer.events
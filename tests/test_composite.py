@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import Input, State, Thing, ThingPool
+from src.state_of_things.composite import CompositeObserver, CompositeThing
+from .fixtures.clock import FakeClock
+
+
+class CountingThing(Thing):
+    """Counts updates."""
+
+    level = Input(0)
+
+    def __init__(self, state: State) -> None:
+        super().__init__(state)
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+        super().update()
+
+
+class ToggleState(State):
+    """Changes to `next_state` on the "toggle" event."""
+
+    inputs = ()
+
+    def __init__(self) -> None:
+        self.next_state: State = self
+
+    def on_event(self, thing: Thing, event: str, payload: object) -> State:
+        if event == "toggle":
+            return self.next_state
+        return self
+
+
+class WaitingState(State):
+    """Waits one second, using `recheck_after`."""
+
+    inputs = ()
+
+    def update(self, thing: Thing) -> State:
+        if thing.time_active < 1:
+            thing.recheck_after(1 - thing.time_active)
+        return self
+
+
+class ChangesObserver(CompositeObserver):
+    def __init__(self) -> None:
+        self.notifications = []
+
+    def children_changed(self, composite, changes):
+        self.notifications.append(changes)
+
+
+class Site:
+    """A composite with five children that toggle between two states."""
+
+    def __init__(self) -> None:
+        self.clock = FakeClock()
+        self.off = ToggleState()
+        self.on = ToggleState()
+        self.off.next_state = self.on
+        self.on.next_state = self.off
+
+        self.composite = CompositeThing(State())
+        self.composite.clock = self.clock
+        self.children = [
+            self.composite.add_child(CountingThing(self.off)) for _ in range(5)
+        ]
+
+
+@pytest.fixture(name="site")
+def fixture_site():
+    return Site()
+
+
+class TestCompositeThing:
+    def test_children_are_only_updated_while_dirty(self, site):
+        assert site.composite.dirty_count == 5
+
+        site.composite.update()
+        site.composite.update()
+
+        assert [child.updates for child in site.children] == [1] * 5
+        assert site.composite.dirty_count == 0
+
+    def test_input_makes_child_dirty_and_changes_are_aggregated(self, site):
+        observer = ChangesObserver()
+        site.composite.observers.attach(observer)
+        site.composite.update()
+
+        site.composite.dispatch_to(site.children[1], "toggle")
+        site.composite.dispatch_to(site.children[3], "toggle")
+        site.composite.update()
+
+        assert [child.updates for child in site.children] == [1, 2, 1, 2, 1]
+        assert observer.notifications == [
+            [
+                (site.children[1], site.off, site.on),
+                (site.children[3], site.off, site.on),
+            ]
+        ]
+
+        # changed children are updated once more in their new State
+        site.composite.update()
+        assert [child.updates for child in site.children] == [1, 3, 1, 3, 1]
+        assert len(observer.notifications) == 1
+
+    def test_timers_make_child_dirty_when_due(self, site):
+        site.composite.update()
+        site.composite.wake_after(site.children[2], 1.0)
+
+        site.clock.advance(0.5)
+        site.composite.update()
+        assert site.children[2].updates == 1
+
+        site.clock.advance(0.5)
+        site.composite.update()
+        assert site.children[2].updates == 2
+
+    def test_mark_dirty(self, site):
+        site.composite.update()
+
+        site.composite.mark_dirty(site.children[0])
+        site.composite.update()
+
+        assert [child.updates for child in site.children] == [2, 1, 1, 1, 1]
+        assert site.composite.children == site.children
+
+    def test_direct_dispatch_and_input_changes_make_child_dirty(self, site):
+        site.composite.update()
+
+        site.children[1].dispatch("toggle")
+        site.children[2].level = 5
+        site.composite.update()
+
+        assert [child.updates for child in site.children] == [1, 2, 2, 1, 1]
+        assert site.children[1].current_state is site.on
+
+    def test_recheck_after_makes_child_dirty_when_due(self, site):
+        child = site.composite.add_child(CountingThing(WaitingState()))
+        child.clock = site.clock
+        site.composite.update()
+        assert site.composite.dirty_count == 0
+
+        site.clock.advance(0.5)
+        site.composite.update()
+        assert child.updates == 1
+
+        site.clock.advance(0.5)
+        site.composite.update()
+        assert child.updates == 2
+
+    def test_child_in_polling_state_stays_dirty(self, site):
+        child = site.composite.add_child(CountingThing(State()))
+        site.composite.update()
+        site.composite.update()
+
+        assert child.updates == 2
+        assert site.composite.dirty_count == 1
+
+    def test_removed_child_can_be_added_again(self, site):
+        child = site.children[0]
+        site.composite.update()
+        site.composite.wake_after(child, 1.0)
+
+        site.composite.remove_child(child)
+        site.clock.advance(1)
+        site.composite.update()
+
+        assert child.updates == 1
+        assert child.wake_handler is None
+        assert site.composite.children == site.children[1:]
+
+        other = CompositeThing(State())
+        other.add_child(child)
+        child.dispatch("toggle")
+        other.update()
+
+        assert child.current_state is site.on
+        assert child.updates == 2
+
+    def test_removed_child_can_be_pooled(self, site):
+        pool = ThingPool(lambda: CountingThing(site.off))
+        child = site.composite.add_child(pool.acquire())
+
+        site.composite.remove_child(child)
+        pool.release(child)
+
+        assert site.composite.add_child(pool.acquire()) is child
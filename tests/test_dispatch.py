@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import Region, State, Thing
+
+
+class EventLoggingState(State):
+    """Logs events, and changes state on the events in `transitions`."""
+
+    def __init__(self, name: str, log: list, parent: State = None) -> None:
+        self.__name = name
+        self.log = log
+        self.parent = parent
+        self.transitions = {}
+
+    @property
+    def name(self):
+        return self.__name
+
+    def on_event(self, thing: Thing, event: str, payload: object) -> State:
+        self.log.append((self.name, event, payload))
+        return self.transitions.get(event, self)
+
+
+class StopGoStates:
+    """Stopped and going states that change on "go" and "stop" events."""
+
+    def __init__(self) -> None:
+        self.log = []
+        self.stopped = EventLoggingState("stopped", self.log)
+        self.going = EventLoggingState("going", self.log)
+        self.stopped.transitions["go"] = self.going
+        self.going.transitions["stop"] = self.stopped
+
+
+@pytest.fixture(name="states")
+def fixture_states():
+    return StopGoStates()
+
+
+class TestDispatch:
+    def test_events_are_handled_in_order_on_update(self, states):
+        thing = Thing(states.stopped)
+        thing.update()
+
+        thing.dispatch("go", 1)
+        thing.dispatch("stop", 2)
+        thing.dispatch("go", 3)
+        assert not states.log
+
+        thing.update()
+
+        assert states.log == [
+            ("stopped", "go", 1),
+            ("going", "stop", 2),
+            ("stopped", "go", 3),
+        ]
+        assert thing.current_state is states.going
+
+    def test_events_before_first_update_go_to_initial_state(self, states):
+        thing = Thing(states.stopped)
+        thing.dispatch("go")
+
+        thing.update()
+
+        assert states.log == [("stopped", "go", None)]
+        assert thing.current_state is states.going
+
+    def test_coalesce_skips_equal_pending_events(self, states):
+        thing = Thing(states.stopped)
+        thing.update()
+
+        assert thing.dispatch("ping", 1, coalesce=True)
+        assert thing.dispatch("ping", 1, coalesce=True)
+        assert thing.dispatch("ping", 2, coalesce=True)
+        thing.update()
+
+        assert states.log == [("stopped", "ping", 1), ("stopped", "ping", 2)]
+
+    def test_queue_is_bounded(self, states):
+        class SmallQueueThing(Thing):
+            max_events = 2
+
+        thing = SmallQueueThing(states.stopped)
+
+        assert thing.dispatch("a")
+        assert thing.dispatch("b")
+        assert not thing.dispatch("c")
+
+        thing.update()
+        assert [event for _, event, _ in states.log] == ["a", "b"]
+
+    def test_unhandled_events_bubble_to_parents(self, states):
+        parent = EventLoggingState("parent", states.log)
+        child = EventLoggingState("child", states.log, parent)
+        parent.transitions["reset"] = states.stopped
+        thing = Thing(child)
+        thing.update()
+
+        thing.dispatch("reset")
+        thing.update()
+
+        assert states.log == [("child", "reset", None), ("parent", "reset", None)]
+        assert thing.current_state is states.stopped
+
+    def test_events_are_sent_to_regions(self, states):
+        region_log = []
+        region_state = EventLoggingState("region", region_log)
+        thing = Thing(states.stopped)
+        region = thing.add_region(Region(region_state))
+
+        thing.dispatch("go")
+        thing.update()
+
+        assert region_log == [("region", "go", None)]
+        assert region.current_state is region_state
+
+    def test_reset_discards_events(self, states):
+        thing = Thing(states.stopped)
+        thing.dispatch("go")
+
+        thing.reset()
+        thing.update()
+
+        assert not states.log
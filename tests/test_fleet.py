@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import Fleet, FleetObserver, State, Thing
+from .fixtures.state import NeverChangeState
+
+
+class AddedObserver(FleetObserver):
+    def __init__(self) -> None:
+        self.added = []
+
+    def thing_added(self, fleet: Fleet, thing: Thing, thing_id: int):
+        self.added.append((fleet, thing, thing_id))
+
+
+class TestFleet:
+    def test_things_are_assigned_dense_ids(self):
+        things = [Thing(State()) for _ in range(3)]
+        fleet = Fleet(things)
+
+        assert len(fleet) == 3
+        for expected_id, thing in enumerate(things):
+            assert fleet.id_of(thing) == expected_id
+            assert fleet[expected_id] is thing
+        assert list(fleet) == things
+
+    def test_thing_can_only_be_added_once(self):
+        thing = Thing(State())
+        fleet = Fleet([thing])
+
+        with pytest.raises(AssertionError) as expected_error:
+            fleet.add(thing)
+
+        assert str(expected_error.value) == "thing is already in this fleet"
+
+    def test_update_updates_every_thing(self):
+        states = [NeverChangeState() for _ in range(3)]
+        things = [Thing(state) for state in states]
+        fleet = Fleet(things)
+
+        fleet.update()
+
+        for thing, state in zip(things, states):
+            assert thing.current_state is state
+            state.assert_entered(thing)
+
+    def test_added_things_are_observed(self):
+        fleet = Fleet()
+        observer = AddedObserver()
+        fleet.observers.attach(observer)
+
+        thing = Thing(State())
+        thing_id = fleet.add(thing)
+
+        assert observer.added == [(fleet, thing, thing_id)]
+
+    def test_select_combines_filters(self):
+        stopped = NeverChangeState()
+        things = [Thing(stopped, name=f"light-{index}") for index in range(6)]
+        things.append(Thing(State()))
+        fleet = Fleet(things)
+        fleet.update()
+
+        assert fleet.select() == things
+        assert fleet.select(ids=[1, 6]) == [things[1], things[6]]
+        assert fleet.select(state=stopped) == things[:6]
+        assert fleet.select(
+            ids=range(4), state=stopped, predicate=lambda thing: thing.name != "light-2"
+        ) == [things[0], things[1], things[3]]
+
+    def test_apply_calls_function_or_dispatches_event(self):
+        received = []
+
+        class ReceivingState(State):
+            def on_event(self, thing, event, payload):
+                received.append((thing, event, payload))
+                return self
+
+        things = [Thing(ReceivingState()) for _ in range(3)]
+        fleet = Fleet(things)
+        called = []
+
+        assert fleet.apply(called.append, ids=[0, 2]) == 2
+        assert called == [things[0], things[2]]
+
+        assert fleet.apply("ping", payload=7, ids=[1]) == 1
+        fleet.update()
+        assert received == [(things[1], "ping", 7)]
+
+    def test_select_state_matches_nested_states(self):
+        parent = NeverChangeState()
+        child = NeverChangeState()
+        child.parent = parent
+        things = [Thing(child), Thing(parent), Thing(State())]
+        fleet = Fleet(things)
+        fleet.update()
+
+        assert fleet.select(state=parent) == things[:2]
+        assert fleet.select(state=child) == things[:1]
+
+    def test_apply_event_with_single_update(self):
+        class GoState(State):
+            pass
+
+        go_state = GoState()
+
+        class StoppedState(State):
+            def on_event(self, thing, event, payload):
+                return go_state if event == "go" else self
+
+        stopped = StoppedState()
+        fleet = Fleet(Thing(stopped) for _ in range(3))
+        fleet.update()
+
+        assert fleet.apply("go", ids=[0, 1], update=True) == 2
+
+        assert [thing.current_state for thing in fleet] == [
+            go_state,
+            go_state,
+            stopped,
+        ]
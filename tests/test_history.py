@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from src.state_of_things import State, Thing, TransitionHistory
+from .fixtures.clock import FakeClock
+from .fixtures.state import NeverChangeState
+
+
+class FlappingState(State):
+    """Changes to `next_state` after one second."""
+
+    def __init__(self) -> None:
+        self.next_state: State = self
+
+    def update(self, thing: Thing) -> State:
+        if thing.time_active >= 1:
+            return self.next_state
+        return self
+
+
+class ClockedThing(Thing):
+    pass
+
+
+class TestTransitionHistory:
+    def test_records_transitions_with_dwell(self):
+        clock = FakeClock()
+        ClockedThing.clock = clock
+        on_state = FlappingState()
+        off_state = FlappingState()
+        on_state.next_state = off_state
+        off_state.next_state = on_state
+        thing = ClockedThing(on_state)
+        thing.history = TransitionHistory(capacity=3)
+
+        for _ in range(4):
+            thing.update()
+            clock.advance(0.5)
+
+        assert thing.history.entries() == [
+            (None, on_state, 0.0, 0.0),
+            (on_state, off_state, 1.0, 1.0),
+        ]
+
+    def test_reset_clears_history(self):
+        thing = Thing(NeverChangeState())
+        thing.history = TransitionHistory()
+        thing.update()
+
+        thing.reset()
+
+        assert not thing.history.entries()
+        thing.update()
+        assert len(thing.history) == 1
+
+    def test_oldest_transitions_are_overwritten(self):
+        history = TransitionHistory(capacity=2)
+        states = [State() for _ in range(3)]
+
+        history.record(None, states[0], 0.0, 0.0)
+        history.record(states[0], states[1], 1.0, 1.0)
+        history.record(states[1], states[2], 3.0, 2.0)
+
+        assert len(history) == 2
+        assert history.capacity == 2
+        assert history.entries() == [
+            (states[0], states[1], 1.0, 1.0),
+            (states[1], states[2], 3.0, 2.0),
+        ]
+
+        history.clear()
+        assert not history.entries()
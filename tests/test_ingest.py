@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import json
+import socket
+import pytest
+from src.state_of_things import Fleet, State, Thing
+from src.state_of_things.ingest import FileSource, Ingestor, SocketSource
+from .fixtures.clock import FakeClock
+
+
+class ReadingState(State):
+    """Keeps the readings dispatched to a Thing."""
+
+    def on_event(self, thing: Thing, event: str, payload: object) -> State:
+        thing.readings.append(payload["value"])
+        return self
+
+
+class SensorThing(Thing):
+    def __init__(self, name: str) -> None:
+        super().__init__(ReadingState(), name=name)
+        self.readings = []
+
+
+def record(name: str, value: int, at: float = 0.0) -> bytes:
+    return json.dumps({"name": name, "value": value, "at": at}).encode() + b"\n"
+
+
+class TestFileSource:
+    def test_reads_appended_lines(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(b"one\ntwo\nthr")
+        source = FileSource(str(path), chunk_size=4)
+        try:
+            assert list(source.lines(10)) == [b"one", b"two"]
+            assert not list(source.lines(10))
+
+            with open(path, "ab") as file:
+                file.write(b"ee\nfour\n")
+
+            assert list(source.lines(1)) == [b"three"]
+            assert list(source.lines(10)) == [b"four"]
+            assert source.bytes_read == 19
+        finally:
+            source.close()
+
+    def test_long_lines_are_discarded(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(b"x" * 100)
+        source = FileSource(str(path), chunk_size=16, max_line=32)
+        try:
+            assert not list(source.lines(10))
+            assert source.discarded == 1
+
+            with open(path, "ab") as file:
+                file.write(b"xxxx\nnext\n")
+
+            # the rest of the long line is skipped
+            assert list(source.lines(10)) == [b"next"]
+            assert source.discarded == 1
+        finally:
+            source.close()
+
+
+class TestSocketSource:
+    def test_reads_lines_until_closed(self):
+        writer, reader = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        source = SocketSource(reader)
+        try:
+            assert not list(source.lines(10))
+
+            writer.sendall(b"one\ntw")
+            assert list(source.lines(10)) == [b"one"]
+
+            writer.sendall(b"o")
+            writer.close()
+            assert list(source.lines(10)) == [b"two"]
+            assert source.closed
+        finally:
+            source.close()
+
+
+class TestIngestor:
+    def test_records_are_routed_and_applied_in_batches(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(
+            record("a", 1)
+            + record("b", 2)
+            + b"not json\n"
+            + record("missing", 3)
+            + record("a", 4)
+        )
+        fleet = Fleet([SensorThing("a"), SensorThing("b")])
+        source = FileSource(str(path))
+        ingestor = Ingestor(fleet, [source], batch_size=2)
+        try:
+            assert ingestor.poll() == 2
+            # an invalid and an unrouted line
+            assert ingestor.poll() == 0
+            assert ingestor.poll() == 1
+            assert ingestor.poll() == 0
+
+            # events are handled by the next fleet update
+            fleet.update()
+            assert fleet[0].readings == [1, 4]
+            assert fleet[1].readings == [2]
+
+            assert ingestor.records == 3
+            assert ingestor.errors == 1
+            assert ingestor.unrouted == 1
+            assert ingestor.bytes_read == path.stat().st_size
+        finally:
+            source.close()
+
+    def test_records_wait_for_full_event_queues(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(b"".join(record("a", value) for value in range(40)))
+        fleet = Fleet([SensorThing("a")])
+        source = FileSource(str(path))
+        ingestor = Ingestor(fleet, [source], batch_size=30)
+        try:
+            assert ingestor.poll() == Thing.max_events
+            assert ingestor.backlog == 30 - Thing.max_events
+
+            for _ in range(3):
+                fleet.update()
+                ingestor.poll()
+            fleet.update()
+
+            assert fleet[0].readings == list(range(40))
+            assert ingestor.records == 40
+            assert ingestor.backlog == 0
+            assert ingestor.deferred > 0
+        finally:
+            source.close()
+
+    def test_long_lines_are_counted_as_errors(self, tmp_path):
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(b"x" * 100 + b"\n" + record("a", 1))
+        fleet = Fleet([SensorThing("a")])
+        source = FileSource(str(path), chunk_size=16, max_line=32)
+        ingestor = Ingestor(fleet, [source])
+        try:
+            ingestor.update()
+            fleet.update()
+
+            assert ingestor.errors == 1
+            assert fleet[0].readings == [1]
+        finally:
+            source.close()
+
+    def test_thing_keys_must_be_unique(self):
+        fleet = Fleet([SensorThing("a")])
+
+        # unnamed things of the same class share their class name
+        with pytest.raises(AssertionError, match="'Thing'"):
+            Ingestor(Fleet([Thing(ReadingState()), Thing(ReadingState())]), [])
+
+        Ingestor(fleet, [])
+        with pytest.raises(AssertionError, match="'a'"):
+            fleet.add(SensorThing("a"))
+        assert len(fleet) == 1
+
+    def test_things_added_later_are_routed(self):
+        writer, reader = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        fleet = Fleet()
+        source = SocketSource(reader)
+        ingestor = Ingestor(fleet, [source])
+        try:
+            fleet.add(SensorThing("late"))
+            writer.sendall(record("late", 7))
+
+            ingestor.update()
+            fleet.update()
+
+            assert fleet[0].readings == [7]
+        finally:
+            writer.close()
+            source.close()
+
+    def test_counters_use_clock(self, tmp_path):
+        clock = FakeClock(100.0)
+        path = tmp_path / "input.jsonl"
+        path.write_bytes(record("a", 1, at=99.0) + record("a", 2, at=99.5))
+        fleet = Fleet([SensorThing("a")])
+        source = FileSource(str(path))
+        ingestor = Ingestor(
+            fleet,
+            [source],
+            apply=lambda thing, record: thing.readings.append(record["value"]),
+            timestamp=lambda record: record["at"],
+            clock=clock,
+        )
+        try:
+            ingestor.poll()
+            clock.advance(2)
+
+            assert fleet[0].readings == [1, 2]
+            assert ingestor.lag == 0.5
+            assert ingestor.records_per_second == 1.0
+        finally:
+            source.close()
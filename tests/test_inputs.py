@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import Input, State, Thing
+from .fixtures.clock import FakeClock
+
+
+class LightThing(Thing):
+    should_go = Input(False)
+    caution_mode = Input(False)
+    clock = FakeClock()
+
+    def __init__(self, initial_state: State) -> None:
+        super().__init__(initial_state)
+        self.brightness = 0
+
+
+class CountingState(State):
+    """Counts updates, and changes to `next_state` when should_go is set."""
+
+    inputs = ("should_go",)
+
+    def __init__(self) -> None:
+        self.updates = 0
+        self.next_state: State = self
+
+    def update(self, thing: Thing) -> State:
+        self.updates += 1
+        if thing.should_go:
+            return self.next_state
+        return self
+
+
+class WaitingState(State):
+    """Waits for one second of time_active without polling."""
+
+    inputs = ()
+
+    def __init__(self) -> None:
+        self.updates = 0
+        self.next_state: State = self
+
+    def update(self, thing: Thing) -> State:
+        self.updates += 1
+        if thing.time_active >= 1:
+            return self.next_state
+        thing.recheck_after(1 - thing.time_active)
+        return self
+
+
+class TestInputs:
+    def test_update_is_skipped_until_input_changes(self):
+        state = CountingState()
+        thing = LightThing(state)
+
+        thing.update()
+        thing.update()
+        thing.caution_mode = True
+        thing.update()
+        assert state.updates == 1
+
+        thing.should_go = False
+        thing.update()
+        assert state.updates == 1
+
+        thing.should_go = True
+        thing.update()
+        thing.update()
+        assert state.updates == 2
+
+    def test_new_state_is_always_updated_once(self):
+        first = CountingState()
+        second = CountingState()
+        first.next_state = second
+        thing = LightThing(first)
+        thing.update()
+
+        thing.should_go = True
+        thing.update()
+        assert thing.current_state is second
+        assert second.updates == 0
+
+        thing.update()
+        assert second.updates == 1
+
+    def test_recheck_after_wakes_state(self):
+        clock = LightThing.clock
+        waiting = WaitingState()
+        waiting.next_state = State()
+        thing = LightThing(waiting)
+
+        thing.update()
+        clock.advance(0.5)
+        thing.update()
+        assert waiting.updates == 1
+
+        clock.advance(0.5)
+        thing.update()
+        assert waiting.updates == 2
+        assert thing.current_state is waiting.next_state
+
+    def test_inputs_must_be_input_attributes(self):
+        class BrightnessState(State):
+            inputs = ("brightness",)
+
+        thing = LightThing(BrightnessState())
+        thing.update()
+        thing.should_go = True
+
+        with pytest.raises(AssertionError):
+            thing.update()
+
+    def test_inputs_have_defaults_per_thing(self):
+        first = LightThing(State())
+        second = LightThing(State())
+
+        first.should_go = True
+
+        assert first.should_go
+        assert not second.should_go
+        assert isinstance(LightThing.should_go, Input)
+
+    def test_reset_restores_input_defaults(self):
+        thing = LightThing(State())
+        thing.should_go = True
+
+        thing.reset()
+
+        assert not thing.should_go
+
+    def test_input_bits_are_allocated_per_class(self):
+        class BrightLightThing(LightThing):
+            brightness = Input(0)
+
+        class OtherThing(Thing):
+            power = Input(0)
+
+        assert LightThing.should_go.bit == 1
+        assert LightThing.caution_mode.bit == 2
+        # after the inherited inputs
+        assert BrightLightThing.brightness.bit == 4
+        assert OtherThing.power.bit == 1
@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from src.state_of_things.loadtest import (
+    LoadTestConfig,
+    build_states,
+    main,
+    run_load_test,
+)
+
+
+class TestLoadTest:
+    def test_build_states_is_seeded(self):
+        config = LoadTestConfig(states=6, branching=3, seed=7)
+        first = build_states(config)
+        second = build_states(config)
+
+        assert [state.name for state in first] == [state.name for state in second]
+        for state in first:
+            assert len(set(state.next_states)) == 3
+
+    def test_run_load_test(self):
+        result = run_load_test(
+            LoadTestConfig(things=20, states=4, observers=2, ticks=200)
+        )
+
+        assert result.tick_latency.count == 200
+        assert result.transitions > 0
+        assert result.updates_per_second > 0
+        assert result.peak_memory > 0
+        assert "updates/second" in result.report()
+
+    def test_main(self, capsys):
+        assert main(["--things", "5", "--ticks", "10"]) == 0
+        assert "things:              5" in capsys.readouterr().out
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import time
+import pytest
+from src.state_of_things import (
+    AdaptiveScheduler,
+    DependencyScheduler,
+    Fleet,
+    IntervalMonitor,
+    RoundRobinScheduler,
+    State,
+    Thing,
+)
+from .fixtures.clock import FakeClock
+
+
+class TestIntervalMonitor:
+    def test_window_statistics(self):
+        monitor = IntervalMonitor(window=4)
+        for elapsed in (0.5, 0.1, 0.2, 0.3, 0.4):
+            monitor.record(elapsed)
+
+        # 0.5 has slid out of the window
+        assert monitor.count == 5
+        assert monitor.min == 0.1
+        assert monitor.max == 0.4
+        assert monitor.percentile(50) == 0.2
+        assert monitor.percentile(100) == 0.4
+
+    def test_empty_window_statistics(self):
+        monitor = IntervalMonitor()
+
+        assert monitor.min == 0
+        assert monitor.max == 0
+        assert monitor.percentile(99) == 0
+
+    def test_histogram_counts_every_interval(self):
+        monitor = IntervalMonitor(window=1, buckets=(0.01, 0.1))
+        for elapsed in (0.005, 0.01, 0.05, 2):
+            monitor.record(elapsed)
+
+        assert monitor.buckets == (0.01, 0.1)
+        assert monitor.histogram == [2, 1, 1]
+
+    def test_threshold_callbacks(self):
+        exceeded = []
+        monitor = IntervalMonitor()
+        monitor.add_threshold(0.1, lambda elapsed, thing: exceeded.append(0.1))
+        monitor.add_threshold(0.5, lambda elapsed, thing: exceeded.append(0.5))
+
+        monitor.record(0.05)
+        monitor.record(0.2, "thing")
+        monitor.record(0.8)
+
+        assert exceeded == [0.1, 0.1, 0.5]
+
+    def test_thing_records_time_elapsed(self):
+        thing = Thing(State())
+        thing.monitor = IntervalMonitor()
+
+        thing.update()
+        time.sleep(0.05)
+        thing.update()
+
+        assert thing.monitor.count == 2
+        assert thing.monitor.max == thing.time_elapsed
+
+    def test_fleet_records_time_elapsed(self):
+        fleet = Fleet([Thing(State()), Thing(State())])
+        fleet.monitor = IntervalMonitor()
+
+        fleet.update()
+
+        assert fleet.monitor.count == 2
+
+    @pytest.mark.parametrize(
+        "make_scheduler",
+        [
+            lambda fleet: RoundRobinScheduler(fleet, budget=1),
+            AdaptiveScheduler,
+            DependencyScheduler,
+        ],
+    )
+    def test_schedulers_record_time_elapsed(self, make_scheduler):
+        fleet = Fleet([Thing(State()), Thing(State())])
+        fleet.monitor = IntervalMonitor()
+        scheduler = make_scheduler(fleet)
+
+        scheduler.update()
+
+        assert fleet.monitor.count == 2
+
+    def test_adaptive_scheduler_does_not_record_back_off(self):
+        clock = FakeClock()
+        fleet = Fleet([Thing(State())])
+        fleet[0].clock = clock
+        fleet.monitor = IntervalMonitor()
+        exceeded = []
+        fleet.monitor.add_threshold(
+            0.05, lambda elapsed, thing: exceeded.append(elapsed)
+        )
+        scheduler = AdaptiveScheduler(
+            fleet, min_interval=0.01, max_interval=1, clock=clock
+        )
+
+        for _ in range(200):
+            scheduler.update()
+            clock.advance(0.01)
+
+        assert scheduler.interval(fleet[0]) > 0.05
+        # only the updates before backing off are recorded
+        assert fleet.monitor.count == 2
+        assert not exceeded
@@ -1,7 +1,13 @@
 # SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
 #
 # SPDX-License-Identifier: MIT
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
 from src.state_of_things import Observers
+from .fixtures.clock import FakeClock
 from .fixtures.observer import CapturingObserver
 
 
@@ -52,3 +58,347 @@ class TestObservers:
         observers.notify("test_unhandled_event", 1234, "Hello!", 0.54321)
 
         test_observer.assert_not_notified()
+
+    def test_clear_detaches_all_observers(self):
+        observers = Observers()
+
+        test_observer = CapturingObserver()
+        observers.attach(test_observer)
+        observers.attach(CapturingObserver())
+        assert len(observers) == 2
+
+        observers.clear()
+        observers.notify(CapturingObserver.test_event.__name__, 1234)
+
+        assert len(observers) == 0
+        test_observer.assert_not_notified()
+
+    def test_anotify_awaits_async_handlers_concurrently(self):
+        events = []
+
+        class SlowObserver:
+            async def test_event(self, value):
+                await asyncio.sleep(0.1)
+                events.append(("slow", value))
+
+        class SyncObserver:
+            def test_event(self, value):
+                events.append(("sync", value))
+
+        observers = Observers()
+        for _ in range(5):
+            observers.attach(SlowObserver())
+        observers.attach(SyncObserver())
+
+        started = time.monotonic()
+        asyncio.run(observers.anotify("test_event", 42))
+
+        assert time.monotonic() - started < 0.3
+        assert events[0] == ("sync", 42)
+        assert events.count(("slow", 42)) == 5
+
+    def test_anotify_times_out_slow_handlers(self):
+        finished = []
+
+        class HangingObserver:
+            async def test_event(self):
+                await asyncio.sleep(10)
+
+        class FastObserver:
+            async def test_event(self):
+                finished.append(True)
+
+        observers = Observers()
+        observers.attach(HangingObserver())
+        observers.attach(FastObserver())
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(observers.anotify("test_event", timeout=0.05))
+
+        assert finished == [True]
+
+    def test_observer_is_only_notified_of_subscribed_events(self):
+        observers = Observers()
+
+        test_observer = CapturingObserver()
+        observers.attach(test_observer, events=["other_event"])
+
+        observers.notify(CapturingObserver.test_event.__name__, 1234)
+
+        test_observer.assert_not_notified()
+        assert observers.handlers(CapturingObserver.test_event.__name__) == ()
+
+    def test_handlers_are_indexed_by_event_name(self):
+        observers = Observers()
+
+        test_observer = CapturingObserver()
+        observers.attach(test_observer)
+        observers.attach(object())
+
+        assert observers.handlers(CapturingObserver.test_event.__name__) == (
+            test_observer.test_event,
+        )
+        assert observers.handlers("test_unhandled_event") == ()
+
+    def test_rate_limit_drops_events_over_the_limit(self):
+        received = []
+
+        class ReceivingObserver:
+            def test_event(self, value):
+                received.append(value)
+
+        clock = FakeClock()
+        observers = Observers(clock=clock)
+        observers.attach(ReceivingObserver())
+        observers.rate_limit("test_event", max_events=2, seconds=0.1)
+
+        for value in range(5):
+            observers.notify("test_event", value)
+        clock.advance(0.11)
+        observers.notify("test_event", 5)
+
+        assert received == [0, 1, 5]
+        assert observers.suppressed("test_event") == 3
+
+    def test_coalesce_delivers_latest_event_per_window(self):
+        received = []
+
+        class ReceivingObserver:
+            def test_event(self, value):
+                received.append(value)
+
+        clock = FakeClock()
+        observers = Observers(clock=clock)
+        observers.attach(ReceivingObserver())
+        observers.coalesce("test_event", seconds=0.1)
+
+        for value in range(5):
+            observers.notify("test_event", value)
+        observers.flush()
+
+        # only the first event is delivered within the window
+        assert received == [0]
+
+        clock.advance(0.11)
+        observers.flush()
+
+        assert received == [0, 4]
+        assert observers.suppressed("test_event") == 3
+
+    def test_notify_warns_about_async_handlers(self):
+        class AsyncObserver:
+            async def test_event(self):
+                pass
+
+        observers = Observers()
+        observers.attach(AsyncObserver())
+
+        with pytest.warns(RuntimeWarning, match="test_event"):
+            observers.notify("test_event")
+
+        observers.start_profiling()
+        with pytest.warns(RuntimeWarning, match="test_event"):
+            observers.notify("test_event")
+
+    def test_reset_limits_discards_held_back_events(self):
+        received = []
+
+        class ReceivingObserver:
+            def test_event(self, value):
+                received.append(value)
+
+        clock = FakeClock()
+        observers = Observers(clock=clock)
+        observers.attach(ReceivingObserver())
+        observers.coalesce("test_event", seconds=0.1)
+        observers.rate_limit("other_event", max_events=1, seconds=0.1)
+
+        observers.notify("test_event", 0)
+        observers.notify("test_event", 1)
+        observers.notify("other_event", 0)
+        observers.reset_limits()
+        clock.advance(0.11)
+        observers.flush()
+
+        assert received == [0]
+        assert observers.suppressed("test_event") == 0
+
+        # new windows start straight away, and the limits are kept
+        observers.notify("test_event", 2)
+        observers.notify("test_event", 3)
+        assert received == [0, 2]
+
+    def test_anotify_is_rate_limited_and_profiled(self):
+        received = []
+
+        class ReceivingObserver:
+            async def test_event(self, value):
+                received.append(value)
+
+        observer = ReceivingObserver()
+        observers = Observers(clock=FakeClock())
+        observers.attach(observer)
+        observers.rate_limit("test_event", max_events=1, seconds=1)
+        observers.start_profiling()
+
+        async def notify_all():
+            for value in range(5):
+                await observers.anotify("test_event", value)
+
+        asyncio.run(notify_all())
+
+        assert received == [0]
+        assert observers.suppressed("test_event") == 4
+        report = observers.profile_report()
+        assert report[(observer, "test_event")].count == 1
+
+    def test_unlimit_delivers_held_back_event(self):
+        received = []
+
+        class ReceivingObserver:
+            def test_event(self, value):
+                received.append(value)
+
+        observers = Observers()
+        observers.attach(ReceivingObserver())
+        observers.coalesce("test_event", seconds=10)
+
+        observers.notify("test_event", 0)
+        observers.notify("test_event", 1)
+        observers.unlimit("test_event")
+        observers.notify("test_event", 2)
+
+        assert received == [0, 1, 2]
+        assert observers.suppressed("test_event") == 0
+
+    def test_profiling_reports_cost_per_observer_and_event(self):
+        slow_handlers = []
+
+        class SlowObserver:
+            def test_event(self):
+                time.sleep(0.02)
+
+        slow_observer = SlowObserver()
+        capturing_observer = CapturingObserver()
+        observers = Observers()
+        observers.attach(slow_observer)
+        observers.attach(capturing_observer)
+        observers.start_profiling(
+            slow_threshold=0.01,
+            on_slow=lambda observer, event, seconds: slow_handlers.append(event),
+        )
+
+        observers.notify("test_event")
+        observers.notify("test_event")
+        observers.stop_profiling()
+        observers.notify("test_event")
+
+        report = observers.profile_report()
+        slow_cost = report[(slow_observer, "test_event")]
+        assert slow_cost.observer_class.endswith("SlowObserver")
+        assert slow_cost.count == 2
+        assert slow_cost.max_time >= 0.02
+        assert slow_cost.total_time >= 0.04
+        assert report[(capturing_observer, "test_event")].count == 2
+        assert slow_handlers == ["test_event", "test_event"]
+
+    def test_profiling_reports_observers_of_a_class_separately(self):
+        first, second = CapturingObserver(), CapturingObserver()
+        observers = Observers()
+        observers.attach(first)
+        observers.attach(second)
+        observers.start_profiling()
+
+        observers.notify("test_event")
+        observers.detach(second)
+        observers.notify("test_event")
+
+        report = observers.profile_report()
+        assert report[(first, "test_event")].count == 2
+        assert report[(second, "test_event")].count == 1
+        assert report[(first, "test_event")].observer_class == "CapturingObserver"
+
+    def test_profile_report_is_empty_before_profiling(self):
+        observers = Observers()
+        observers.attach(CapturingObserver())
+
+        observers.notify("test_event")
+
+        assert observers.profile_report() == {}
+
+
+class TestExecutorObserver:
+    def test_executor_observer_preserves_event_order(self):
+        received = []
+
+        class BlockingObserver:
+            def test_event(self, value):
+                time.sleep(0.001)
+                received.append((threading.get_ident(), value))
+
+        observers = Observers()
+        executor = ThreadPoolExecutor(max_workers=4)
+        attached = observers.attach(BlockingObserver(), executor=executor)
+
+        for value in range(20):
+            observers.notify("test_event", value)
+        executor.shutdown(wait=True)
+
+        assert [value for _, value in received] == list(range(20))
+        assert all(thread != threading.get_ident() for thread, _ in received)
+        assert attached.handled == 20
+        assert attached.queue_depth == 0
+        assert attached.max_queue_depth >= 1
+        assert attached.max_handler_time >= attached.average_handler_time > 0
+
+    def test_executor_observer_is_shared_between_observers(self):
+        received = []
+
+        class BlockingObserver:
+            def test_event(self, value):
+                received.append(value)
+                time.sleep(0.001)
+
+        observer = BlockingObserver()
+        first, second = Observers(), Observers()
+        executor = ThreadPoolExecutor(max_workers=4)
+        attached = first.attach(observer, executor=executor)
+
+        assert second.attach(observer, executor=executor) is attached
+
+        for value in range(0, 20, 2):
+            first.notify("test_event", value)
+            second.notify("test_event", value + 1)
+        executor.shutdown(wait=True)
+
+        assert received == list(range(20))
+        assert attached.handled == 20
+
+    def test_executor_observer_counts_failures(self):
+        class FailingObserver:
+            def test_event(self):
+                raise ValueError("failed")
+
+        observers = Observers()
+        executor = ThreadPoolExecutor(max_workers=1)
+        attached = observers.attach(FailingObserver(), executor=executor)
+
+        observers.notify("test_event")
+        observers.notify("test_unhandled_event")
+        executor.shutdown(wait=True)
+
+        assert attached.failures == 1
+        assert str(attached.last_error) == "failed"
+
+    def test_executor_observer_can_be_detached(self):
+        observer = CapturingObserver()
+        observers = Observers()
+        executor = ThreadPoolExecutor(max_workers=1)
+        observers.attach(observer, executor=executor)
+
+        observers.detach(observer)
+        observers.notify(CapturingObserver.test_event.__name__, 1234)
+        executor.shutdown(wait=True)
+
+        assert len(observers) == 0
+        observer.assert_not_notified()
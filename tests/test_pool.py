@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from src.state_of_things import State, Thing, ThingObserver, ThingPool
+from .fixtures.clock import FakeClock
+from .fixtures.state import EnterExitTrackingState, ImmediateChangeState
+
+
+class TestThingReset:
+    def test_reset_returns_to_initial_state(self):
+        new_state = EnterExitTrackingState()
+        initial_state = ImmediateChangeState(next_state=new_state)
+        thing = Thing(initial_state)
+        observer = ThingObserver()
+        thing.observers.attach(observer)
+
+        thing.update()
+        thing.reset()
+
+        new_state.assert_exited(thing)
+        assert thing.current_state is None
+        assert thing.previous_state is None
+        assert thing.time_active == 0
+        assert list(thing.observers) == [observer]
+
+        thing.update()
+
+        assert thing.current_state is new_state
+        assert thing.previous_state is initial_state
+
+    def test_reset_discards_coalesced_events(self):
+        received = []
+
+        class ReceivingObserver:
+            def test_event(self, value):
+                received.append(value)
+
+        clock = FakeClock()
+        thing = Thing(State())
+        thing.clock = clock
+        thing.observers.attach(ReceivingObserver())
+        thing.observers.coalesce("test_event", seconds=1)
+
+        thing.observers.notify("test_event", 0)
+        thing.observers.notify("test_event", 1)
+        thing.reset()
+        clock.advance(2)
+        thing.update()
+
+        assert received == [0]
+
+
+class TestThingPool:
+    def test_released_things_are_reused(self):
+        pool = ThingPool(lambda: Thing(State()))
+
+        thing = pool.acquire()
+        thing.update()
+        pool.release(thing)
+
+        assert len(pool) == 1
+        assert pool.acquire() is thing
+        assert thing.current_state is None
+        assert pool.created == 1
+
+    def test_template_observers_are_kept(self):
+        template = ThingObserver()
+        pool = ThingPool(lambda: Thing(State()), observers=[template])
+
+        thing = pool.acquire()
+        assert list(thing.observers) == [template]
+
+        thing.observers.attach(ThingObserver())
+        pool.release(thing)
+
+        assert list(pool.acquire().observers) == [template]
+
+    def test_pool_size_is_bounded(self):
+        pool = ThingPool(lambda: Thing(State()), max_size=1)
+
+        things = [pool.acquire(), pool.acquire()]
+        for thing in things:
+            pool.release(thing)
+
+        assert pool.created == 2
+        assert len(pool) == 1
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import (
+    Region,
+    RegionObserver,
+    State,
+    StateContext,
+    Thing,
+    ThingObserver,
+)
+from .fixtures.clock import FakeClock
+from .fixtures.state import NeverChangeState
+
+
+class PowerContext(StateContext):
+    __slots__ = ("updates",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.updates = 0
+
+
+class OnBatteryState(State):
+    """Changes back to mains when the thing has power again."""
+
+    context_class = PowerContext
+
+    def update(self, thing: Thing) -> State:
+        thing.context.updates += 1
+        if thing.has_mains:
+            return PowerStates.mains
+        return self
+
+
+class MainsState(State):
+    def update(self, thing: Thing) -> State:
+        if not thing.has_mains:
+            return PowerStates.battery
+        return self
+
+
+class PowerStates:
+    battery = OnBatteryState()
+    mains = MainsState()
+
+
+class DeviceThing(Thing):
+    def __init__(self):
+        super().__init__(NeverChangeState())
+        self.has_mains = True
+        self.power = self.add_region(Region(PowerStates.mains, name="power"))
+
+
+class ChangeObserver(ThingObserver, RegionObserver):
+    def __init__(self) -> None:
+        self.changes = []
+        self.region_changes = []
+        self.region_entered = []
+
+    def state_changed(self, thing: Thing, old_state: State, new_state: State):
+        self.changes.append((thing, old_state, new_state))
+
+    def region_state_changed(self, region: Region, old_state: State, new_state: State):
+        self.region_changes.append((region, old_state, new_state))
+
+    def region_state_entered(self, region: Region, state: State):
+        self.region_entered.append((region, state))
+
+
+class TestRegion:
+    def test_region_advances_independently(self):
+        thing = DeviceThing()
+        observer = ChangeObserver()
+        thing.observers.attach(observer)
+
+        thing.update()
+        main_state = thing.current_state
+        assert thing.power.current_state is PowerStates.mains
+
+        thing.has_mains = False
+        thing.update()
+
+        assert thing.current_state is main_state
+        assert thing.power.current_state is PowerStates.battery
+        assert thing.power.previous_state is PowerStates.mains
+        # region changes are not changes of the Thing's own State
+        assert not observer.changes
+        assert observer.region_changes == [
+            (thing.power, PowerStates.mains, PowerStates.battery)
+        ]
+        assert observer.region_entered == [
+            (thing.power, PowerStates.mains),
+            (thing.power, PowerStates.battery),
+        ]
+
+    def test_region_tracks_its_own_time_and_context(self):
+        clock = FakeClock()
+        thing = DeviceThing()
+        thing.clock = clock
+
+        thing.update()
+        clock.advance(1)
+        thing.update()
+        thing.has_mains = False
+        clock.advance(1)
+        thing.update()
+        clock.advance(0.5)
+        thing.update()
+
+        assert thing.time_active == 2.5
+        assert thing.power.time_elapsed == 0.5
+        assert thing.power.time_active == 0.5
+        assert thing.power.context.updates == 1
+        assert thing.context is None
+
+    def test_region_looks_up_other_attributes_on_thing(self):
+        thing = DeviceThing()
+
+        assert thing.power.thing is thing
+        assert thing.power.has_mains
+        assert thing.power.observers is thing.observers
+        assert thing.regions == (thing.power,)
+
+    def test_region_assigns_thing_attributes_on_thing(self):
+        thing = DeviceThing()
+
+        thing.power.has_mains = False
+
+        assert not thing.has_mains
+        assert "has_mains" not in vars(thing.power)
+        with pytest.raises(AttributeError):
+            thing.power.current_state = PowerStates.battery
+
+    def test_reset_resets_regions(self):
+        thing = DeviceThing()
+        thing.update()
+        thing.has_mains = False
+        thing.update()
+
+        thing.reset()
+
+        assert thing.power.current_state is None
+        assert thing.power.previous_state is None
+        assert thing.power.context is None
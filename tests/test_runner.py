@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import TickRunner
+from .fixtures.clock import FakeClock
+
+
+class WorkingTarget:
+    """Counts updates, taking a fixed amount of clock time for each."""
+
+    def __init__(self, clock: FakeClock, work_seconds: float) -> None:
+        self.clock = clock
+        self.work_seconds = work_seconds
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+        self.clock.advance(self.work_seconds)
+
+
+class TestTickRunner:
+    def test_runs_at_target_rate(self):
+        clock = FakeClock()
+        target = WorkingTarget(clock, work_seconds=0.002)
+        runner = TickRunner(target, rate=100, clock=clock, sleep=clock.sleep)
+
+        runner.run(seconds=1)
+
+        assert target.updates == 100
+        assert runner.ticks == 100
+        assert runner.overruns == 0
+        assert runner.achieved_rate == pytest.approx(100)
+        assert runner.jitter == pytest.approx(0, abs=1e-9)
+
+    def test_oversleeping_does_not_drift(self):
+        clock = FakeClock()
+        target = WorkingTarget(clock, work_seconds=0)
+        oversleep = 0.003
+
+        def sloppy_sleep(seconds: float):
+            clock.sleep(seconds + oversleep)
+
+        runner = TickRunner(target, rate=100, clock=clock, sleep=sloppy_sleep)
+        runner.run(seconds=1)
+
+        # each tick is late by the oversleep, but the lateness does not
+        # accumulate across ticks
+        assert target.updates == 100
+        assert runner.max_lateness == pytest.approx(oversleep)
+
+    def test_oversleeping_with_work_is_not_an_overrun(self):
+        clock = FakeClock()
+        target = WorkingTarget(clock, work_seconds=0.008)
+        oversleep = 0.003
+
+        def sloppy_sleep(seconds: float):
+            clock.sleep(seconds + oversleep)
+
+        runner = TickRunner(target, rate=100, clock=clock, sleep=sloppy_sleep)
+        runner.run(seconds=1)
+
+        assert target.updates == 100
+        assert runner.overruns == 0
+        assert runner.max_lateness == pytest.approx(oversleep)
+
+    def test_slow_ticks_are_overruns(self):
+        clock = FakeClock()
+        target = WorkingTarget(clock, work_seconds=0.025)
+        runner = TickRunner(target, rate=100, clock=clock, sleep=clock.sleep)
+
+        runner.run(seconds=1)
+
+        assert runner.overruns == runner.ticks
+        assert runner.achieved_rate == pytest.approx(40, rel=0.05)
+
+    def test_runs_until_condition(self):
+        clock = FakeClock()
+        target = WorkingTarget(clock, work_seconds=0)
+        runner = TickRunner(target, rate=10, clock=clock, sleep=clock.sleep)
+
+        runner.run(until=lambda: target.updates == 5)
+
+        assert target.updates == 5
+        assert clock.now == pytest.approx(0.5)
@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from src.state_of_things import (
+    AdaptiveScheduler,
+    DependencyScheduler,
+    Fleet,
+    Input,
+    Priority,
+    RoundRobinScheduler,
+    State,
+    Thing,
+)
+from .fixtures.clock import FakeClock
+
+
+class WorkingThing(Thing):
+    """Counts updates, taking a fixed amount of clock time for each."""
+
+    def __init__(self, clock: FakeClock, work_seconds: float = 0.001) -> None:
+        super().__init__(State())
+        self.clock = clock
+        self.work_seconds = work_seconds
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+        self.clock.advance(self.work_seconds)
+
+
+class TestRoundRobinScheduler:
+    def test_tick_stops_when_budget_is_spent(self):
+        clock = FakeClock()
+        fleet = Fleet(WorkingThing(clock) for _ in range(10))
+        scheduler = RoundRobinScheduler(fleet, budget=0.003, clock=clock)
+
+        scheduler.update()
+
+        assert [thing.updates for thing in fleet] == [1, 1, 1] + [0] * 7
+
+    def test_next_tick_resumes_where_last_stopped(self):
+        clock = FakeClock()
+        fleet = Fleet(WorkingThing(clock) for _ in range(5))
+        scheduler = RoundRobinScheduler(fleet, budget=0.003, clock=clock)
+
+        scheduler.update()
+        scheduler.update()
+
+        # wraps around to the start of the fleet
+        assert [thing.updates for thing in fleet] == [2, 1, 1, 1, 1]
+
+    def test_tick_updates_each_thing_at_most_once(self):
+        clock = FakeClock()
+        fleet = Fleet(WorkingThing(clock) for _ in range(3))
+        scheduler = RoundRobinScheduler(fleet, budget=1, clock=clock)
+
+        scheduler.update()
+
+        assert [thing.updates for thing in fleet] == [1, 1, 1]
+
+    def test_critical_things_update_every_tick(self):
+        clock = FakeClock()
+        fleet = Fleet(WorkingThing(clock) for _ in range(10))
+        scheduler = RoundRobinScheduler(fleet, budget=0.002, clock=clock)
+        scheduler.set_priority(fleet[9], Priority.CRITICAL)
+
+        for _ in range(3):
+            scheduler.update()
+
+        assert scheduler.priority(fleet[9]) == Priority.CRITICAL
+        assert fleet[9].updates == 3
+        # critical updates spend the budget, but background things
+        # still make progress
+        assert [thing.updates for thing in fleet][:4] == [1, 1, 1, 0]
+
+    def test_staleness_is_time_since_last_update(self):
+        clock = FakeClock()
+        fleet = Fleet(WorkingThing(clock) for _ in range(4))
+        scheduler = RoundRobinScheduler(fleet, budget=0.002, clock=clock)
+
+        scheduler.update()
+        clock.advance(1)
+
+        assert scheduler.staleness(fleet[0]) == pytest.approx(1.001)
+        assert scheduler.staleness(fleet[1]) == pytest.approx(1)
+        # never updated, so stale since the scheduler started
+        assert scheduler.max_staleness == pytest.approx(1.002)
+
+
+class CountingState(State):
+    """Counts updates, changing to a next State when requested."""
+
+    def __init__(self) -> None:
+        self.updates = 0
+        self.next_state = self
+        self.recheck = None
+
+    def update(self, thing: Thing) -> State:
+        self.updates += 1
+        if self.recheck is not None:
+            thing.recheck_after(self.recheck)
+        return self.next_state
+
+
+class LevelThing(Thing):
+    level = Input(0)
+
+
+class TestAdaptiveScheduler:
+    def test_unchanged_state_backs_off(self):
+        clock = FakeClock()
+        state = CountingState()
+        fleet = Fleet([Thing(state)])
+        scheduler = AdaptiveScheduler(
+            fleet, min_interval=0.01, max_interval=0.04, clock=clock
+        )
+
+        # tick every 10ms for 200ms
+        for _ in range(20):
+            scheduler.update()
+            clock.advance(0.01)
+
+        assert scheduler.interval(fleet[0]) == pytest.approx(0.04)
+        assert state.updates < 10
+        assert scheduler.skipped == 20 - state.updates
+
+    def test_wake_snaps_back_to_every_tick(self):
+        clock = FakeClock()
+        state = CountingState()
+        fleet = Fleet([Thing(state)])
+        scheduler = AdaptiveScheduler(fleet, clock=clock)
+
+        for _ in range(5):
+            scheduler.update()
+            clock.advance(0.001)
+        updates = state.updates
+
+        scheduler.wake(fleet[0])
+        scheduler.update()
+
+        assert state.updates == updates + 1
+
+    def test_transition_snaps_back_and_limits_backoff(self):
+        clock = FakeClock()
+        first_state = CountingState()
+        second_state = CountingState()
+        fleet = Fleet([Thing(first_state)])
+        scheduler = AdaptiveScheduler(
+            fleet, min_interval=0.01, max_interval=10, dwell_fraction=0.5, clock=clock
+        )
+
+        # enter first_state, and then change to second_state after 1 second
+        scheduler.update()
+        clock.advance(1)
+        first_state.next_state = second_state
+        scheduler.update()
+
+        assert fleet[0].current_state is second_state
+        assert scheduler.interval(fleet[0]) == 0
+
+        # first_state is now known to last 1 second, so back off at most
+        # half of that
+        second_state.next_state = first_state
+        first_state.next_state = first_state
+        for _ in range(20):
+            scheduler.update()
+            clock.advance(1)
+
+        assert fleet[0].current_state is first_state
+        assert scheduler.interval(fleet[0]) == pytest.approx(0.5)
+
+    def test_dispatch_and_input_changes_wake(self):
+        clock = FakeClock()
+        state = CountingState()
+        fleet = Fleet([LevelThing(state), LevelThing(state)])
+        scheduler = AdaptiveScheduler(fleet, max_interval=10, clock=clock)
+
+        for _ in range(5):
+            scheduler.update()
+            clock.advance(0.01)
+        assert scheduler.interval(fleet[0]) > 0
+        assert scheduler.interval(fleet[1]) > 0
+
+        fleet[0].dispatch("ping")
+        fleet[1].level = 1
+
+        assert scheduler.interval(fleet[0]) == 0
+        assert scheduler.interval(fleet[1]) == 0
+
+    def test_recheck_after_limits_backoff(self):
+        clock = FakeClock()
+        state = CountingState()
+        state.recheck = 0.05
+        fleet = Fleet([Thing(state)])
+        scheduler = AdaptiveScheduler(fleet, max_interval=10, clock=clock)
+
+        for _ in range(100):
+            scheduler.update()
+            clock.advance(0.01)
+
+        # backed off, but updated at least every recheck
+        assert scheduler.interval(fleet[0]) > 0.05
+        assert state.updates >= 20
+
+
+class OrderedThing(Thing):
+    """Records the order that things are updated in."""
+
+    def __init__(self, name: str, order: list) -> None:
+        super().__init__(State(), name=name)
+        self.order = order
+
+    def update(self):
+        self.order.append(self.name)
+
+
+class TestDependencyScheduler:
+    def test_dependencies_are_updated_first(self):
+        order = []
+        reader = OrderedThing("reader", order)
+        light_a = OrderedThing("a", order)
+        light_b = OrderedThing("b", order)
+        fleet = Fleet([reader, light_a, light_b])
+        scheduler = DependencyScheduler(fleet)
+        scheduler.depends_on(reader, light_a)
+        scheduler.depends_on(reader, light_b)
+
+        scheduler.update()
+
+        assert order == ["a", "b", "reader"]
+        assert scheduler.levels == [[light_a, light_b], [reader]]
+
+    def test_levels_include_things_added_later(self):
+        order = []
+        first = OrderedThing("first", order)
+        fleet = Fleet([first])
+        scheduler = DependencyScheduler(fleet)
+        assert scheduler.levels == [[first]]
+
+        second = OrderedThing("second", order)
+        fleet.add(second)
+        scheduler.depends_on(first, second)
+
+        assert scheduler.levels == [[second], [first]]
+
+    def test_cycles_are_rejected(self):
+        first = OrderedThing("first", [])
+        second = OrderedThing("second", [])
+        scheduler = DependencyScheduler(Fleet([first, second]))
+        scheduler.depends_on(first, second)
+        scheduler.depends_on(second, first)
+
+        with pytest.raises(AssertionError):
+            scheduler.update()
+
+    def test_levels_run_on_executor(self):
+        order = []
+        things = [OrderedThing(f"light-{index}", order) for index in range(4)]
+        reader = OrderedThing("reader", order)
+        fleet = Fleet(things + [reader])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scheduler = DependencyScheduler(fleet, executor=executor)
+            for thing in things:
+                scheduler.depends_on(reader, thing)
+
+            scheduler.update()
+
+        assert sorted(order[:4]) == [thing.name for thing in things]
+        assert order[4] == "reader"
+
+    def test_process_pool_is_rejected(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(AssertionError):
+                DependencyScheduler(Fleet(), executor=executor)
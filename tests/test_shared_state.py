@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import time
+from multiprocessing import shared_memory
+import pytest
+from src.state_of_things import Fleet, State, Thing
+from src.state_of_things.shared_state import SharedStateReader, SharedStateTable
+from .fixtures.state import ImmediateChangeState, NeverChangeState
+
+
+@pytest.fixture(name="states")
+def fixture_states():
+    final_state = NeverChangeState()
+    return [ImmediateChangeState(next_state=final_state), final_state]
+
+
+class TestSharedState:
+    def test_reader_sees_current_states(self, states):
+        fleet = Fleet([Thing(states[0]), Thing(states[1])])
+        table = SharedStateTable(fleet, states)
+        reader = SharedStateReader(table.name)
+        try:
+            # things have not entered their initial State yet
+            assert len(reader) == 2
+            assert reader.read(0) == (None, 0.0)
+
+            before = time.time()
+            fleet.update()
+
+            state_name, entered_at = reader.read(0)
+            assert state_name == "NeverChangeState"
+            assert entered_at >= before
+            assert reader.read_ids(1)[0] == states[1].id + 1
+            assert reader.state_names[states[0].id + 1] == "ImmediateChangeState"
+            assert reader.state_names[states[1].id + 1] == "NeverChangeState"
+        finally:
+            reader.close()
+            table.close()
+            table.unlink()
+
+    def test_things_added_later_are_mirrored(self, states):
+        fleet = Fleet()
+        table = SharedStateTable(fleet, states, capacity=1)
+        reader = SharedStateReader(table.name)
+        try:
+            assert len(reader) == 0
+
+            fleet.add(Thing(states[1]))
+            fleet.update()
+
+            assert len(reader) == 1
+            assert reader.read(0)[0] == "NeverChangeState"
+
+            with pytest.raises(IndexError):
+                fleet.add(Thing(states[1]))
+            # the rejected Thing was not added
+            assert len(fleet) == 1
+        finally:
+            reader.close()
+            table.close()
+            table.unlink()
+
+    def test_read_gives_up_on_a_record_left_mid_write(self, states):
+        fleet = Fleet([Thing(states[1])])
+        table = SharedStateTable(fleet, states)
+        reader = SharedStateReader(table.name)
+        try:
+            # a writer that died after marking the record as being written
+            memory = shared_memory.SharedMemory(name=table.name)
+            offset = memory.size - 16
+            memory.buf[offset] |= 1
+            memory.close()
+
+            with pytest.raises(TimeoutError):
+                reader.read(0, retries=10)
+        finally:
+            reader.close()
+            table.close()
+            table.unlink()
+
+    def test_every_registered_state_is_known_by_default(self, states):
+        fleet = Fleet([Thing(states[1])])
+        table = SharedStateTable(fleet)
+        reader = SharedStateReader(table.name)
+        try:
+            fleet.update()
+
+            assert reader.read(0)[0] == "NeverChangeState"
+            assert len(reader.state_names) == len(State.registry) + 1
+        finally:
+            reader.close()
+            table.close()
+            table.unlink()
+
+    def test_unknown_states_have_no_name(self, states):
+        fleet = Fleet([Thing(State())])
+        table = SharedStateTable(fleet, states)
+        reader = SharedStateReader(table.name)
+        try:
+            fleet.update()
+
+            assert reader.read(0)[0] is None
+        finally:
+            reader.close()
+            table.close()
+            table.unlink()
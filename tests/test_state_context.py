@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import State, StateContext, Thing
+
+
+class CounterContext(StateContext):
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+
+class CountingState(State):
+    """Counts updates in its context, changing state after two."""
+
+    context_class = CounterContext
+
+    def __init__(self) -> None:
+        self.next_state: State = self
+
+    def update(self, thing: Thing) -> State:
+        thing.context.count += 1
+        if thing.context.count == 2:
+            return self.next_state
+        return self
+
+
+class TestStateContext:
+    def test_context_is_available_while_in_state(self):
+        state = CountingState()
+        thing = Thing(state)
+
+        assert thing.context is None
+
+        thing.update()
+
+        assert isinstance(thing.context, CounterContext)
+        assert thing.context.count == 1
+
+    def test_context_is_slotted(self):
+        context = CounterContext()
+
+        with pytest.raises(AttributeError):
+            setattr(context, "other", 1)
+
+    def test_context_is_released_and_reused_on_exit(self):
+        first_state = CountingState()
+        second_state = CountingState()
+        first_state.next_state = second_state
+        second_state.next_state = State()
+        thing = Thing(first_state)
+
+        thing.update()
+        first_context = thing.context
+        thing.update()
+
+        # the exited State's context was recycled and reset for the
+        # entered State
+        assert thing.current_state is second_state
+        assert thing.context is first_context
+        assert thing.context.count == 0
+
+        thing.update()
+        thing.update()
+
+        # State without a context
+        assert thing.context is None
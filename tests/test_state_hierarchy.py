@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from src.state_of_things import State, StateContext, Thing, ThingObserver
+
+
+class RecordingState(State):
+    """Records enters, exits and updates into a shared log."""
+
+    def __init__(self, name: str, log: list, parent: State = None) -> None:
+        self.__name = name
+        self.log = log
+        self.parent = parent
+        self.next_state: State = self
+
+    @property
+    def name(self):
+        return self.__name
+
+    def enter(self, thing: Thing):
+        self.log.append(f"enter {self.name}")
+
+    def exit(self, thing: Thing):
+        self.log.append(f"exit {self.name}")
+
+    def update(self, thing: Thing) -> State:
+        self.log.append(f"update {self.name}")
+        return self.next_state
+
+
+class EnteredObserver(ThingObserver):
+    def __init__(self) -> None:
+        self.entered = []
+
+    def state_entered(self, thing: Thing, state: State):
+        self.entered.append(state.name)
+
+
+class Hierarchy:
+    """
+    Nested recording states::
+
+        root
+        ├── a
+        │   ├── a1
+        │   └── a2
+        └── b
+    """
+
+    def __init__(self) -> None:
+        self.log = []
+        self.root = RecordingState("root", self.log)
+        self.a = RecordingState("a", self.log, self.root)
+        self.a1 = RecordingState("a1", self.log, self.a)
+        self.a2 = RecordingState("a2", self.log, self.a)
+        self.b = RecordingState("b", self.log, self.root)
+
+
+@pytest.fixture(name="states")
+def fixture_states():
+    return Hierarchy()
+
+
+class TestStateHierarchy:
+    def test_initial_state_enters_ancestors_from_root(self, states):
+        thing = Thing(states.a1)
+        observer = EnteredObserver()
+        thing.observers.attach(observer)
+
+        thing.update()
+
+        assert states.log == [
+            "enter root",
+            "enter a",
+            "enter a1",
+            "update root",
+            "update a",
+            "update a1",
+        ]
+        assert observer.entered == ["root", "a", "a1"]
+        assert thing.current_state is states.a1
+
+    def test_sibling_transition_keeps_shared_parents(self, states):
+        thing = Thing(states.a1)
+        thing.update()
+        states.log.clear()
+
+        states.a1.next_state = states.a2
+        thing.update()
+
+        assert states.log == [
+            "update root",
+            "update a",
+            "update a1",
+            "exit a1",
+            "enter a2",
+        ]
+
+    def test_transition_exits_and_enters_up_to_common_ancestor(self, states):
+        thing = Thing(states.a1)
+        thing.update()
+        states.log.clear()
+
+        states.a1.next_state = states.b
+        thing.update()
+        assert states.log[-3:] == ["exit a1", "exit a", "enter b"]
+
+        states.log.clear()
+        states.b.next_state = states.a2
+        thing.update()
+        assert states.log[-3:] == ["exit b", "enter a", "enter a2"]
+
+    def test_parent_transition_skips_children(self, states):
+        thing = Thing(states.a1)
+        thing.update()
+        states.log.clear()
+
+        states.a.next_state = states.b
+        thing.update()
+
+        assert states.log == [
+            "update root",
+            "update a",
+            "exit a1",
+            "exit a",
+            "enter b",
+        ]
+        assert thing.previous_state is states.a1
+        assert thing.current_state is states.b
+
+    def test_child_to_parent_transition_notifies_parent(self, states):
+        thing = Thing(states.a1)
+        observer = EnteredObserver()
+        thing.observers.attach(observer)
+        thing.update()
+        states.log.clear()
+
+        states.a1.next_state = states.a
+        thing.update()
+
+        assert states.log == ["update root", "update a", "update a1", "exit a1"]
+        assert observer.entered == ["root", "a", "a1", "a"]
+        assert thing.current_state is states.a
+
+    def test_flat_state_to_nested_state(self, states):
+        flat = RecordingState("flat", states.log)
+        flat.next_state = states.a2
+        thing = Thing(flat)
+        thing.update()
+
+        assert states.log == [
+            "enter flat",
+            "update flat",
+            "exit flat",
+            "enter root",
+            "enter a",
+            "enter a2",
+        ]
+
+    def test_reset_exits_parents(self, states):
+        thing = Thing(states.a1)
+        thing.update()
+        states.log.clear()
+
+        thing.reset()
+
+        assert states.log == ["exit a1", "exit a", "exit root"]
+
+    def test_parent_state_can_not_have_context(self, states):
+        states.a.context_class = StateContext
+        thing = Thing(states.a1)
+
+        with pytest.raises(AssertionError, match="context_class"):
+            thing.update()
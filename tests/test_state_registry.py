@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+from src.state_of_things import State
+from .fixtures.state import ImmediateChangeState, NeverChangeState
+
+
+class TestStateRegistry:
+    def test_states_get_dense_ids(self):
+        first = NeverChangeState()
+        second = ImmediateChangeState(next_state=first)
+        third = State()
+
+        assert second.id == first.id + 1
+        assert third.id == first.id + 2
+        assert State.registry[first.id] is first
+        assert State.registry[third.id] is third
+        assert len(State.registry) > third.id
+
+    def test_name_is_cached_class_name(self):
+        state = ImmediateChangeState(next_state=State())
+
+        assert state.name == "ImmediateChangeState"
+        assert State().name == "State"
@@ -4,6 +4,7 @@
 import time
 import pytest
 from src.state_of_things import Thing, State
+from .fixtures.clock import FakeClock
 from .fixtures.state import (
     EnterExitTrackingState,
     ImmediateChangeState,
@@ -116,6 +117,41 @@ class TestThing:
         expected_active_time = sleep_time * sleep_count
         assert time_tracking_state.time_active - expected_active_time < 0.05
 
+    def test_thing_uses_class_clock(self):
+        clock = FakeClock()
+
+        class ClockedThing(Thing):
+            pass
+
+        ClockedThing.clock = clock
+
+        thing = ClockedThing(NeverChangeState())
+        thing.update()
+        clock.advance(0.5)
+        thing.update()
+
+        assert thing.time_elapsed == 0.5
+        assert thing.time_active == 0.5
+        assert Thing.clock is not clock
+
+    def test_thing_can_use_plain_function_clock(self):
+        now = [0.0]
+
+        def read_clock():
+            return now[0]
+
+        class ClockedThing(Thing):
+            pass
+
+        ClockedThing.clock = read_clock
+
+        thing = ClockedThing(NeverChangeState())
+        thing.update()
+        now[0] = 0.25
+        thing.update()
+
+        assert thing.time_elapsed == 0.25
+
     def test_thing_name_defaults_to_class_name(self):
         class ExpectedNameThing(Thing):
             pass
@@ -78,3 +78,84 @@ class TestThingObservers:
         observer = ThingObserver()
 
         observer.state_changed(Thing(State()), State(), State())
+
+    def test_state_entered_is_notified_for_initial_state(self):
+        """
+        Observers should be notified of every State entered, including
+        the initial State.
+        """
+        entered = []
+
+        class EnteredObserver(ThingObserver):
+            def state_entered(self, thing: Thing, state: State):
+                entered.append((thing, state))
+
+        new_state = State()
+        initial_state = ImmediateChangeState(next_state=new_state)
+
+        thing = Thing(initial_state)
+        thing.observers.attach(EnteredObserver())
+
+        thing.update()
+
+        assert entered == [(thing, initial_state), (thing, new_state)]
+
+    def test_state_change_subscriptions_are_filtered(self):
+        """
+        Observers can subscribe to only state changes from and/or to a
+        specific State.
+        """
+        final_state = State()
+        middle_state = ImmediateChangeState(next_state=final_state)
+        initial_state = ImmediateChangeState(next_state=middle_state)
+
+        into_middle = StateChangeObserver()
+        into_final = StateChangeObserver()
+        from_initial_to_final = StateChangeObserver()
+
+        thing = Thing(initial_state)
+        thing.observers.attach(into_middle, new_state=middle_state)
+        thing.observers.attach(into_final, new_state=final_state)
+        thing.observers.attach(
+            from_initial_to_final, old_state=initial_state, new_state=final_state
+        )
+
+        # change into middle_state
+        thing.update()
+
+        into_middle.assert_notified(thing, initial_state, middle_state)
+        into_final.assert_not_notified()
+
+        # change into final_state
+        thing.update()
+
+        into_final.assert_notified(thing, middle_state, final_state)
+        from_initial_to_final.assert_not_notified()
+
+    def test_state_change_subscriptions_can_be_detached(self):
+        new_state = State()
+        initial_state = ImmediateChangeState(next_state=new_state)
+        observer = StateChangeObserver()
+
+        thing = Thing(initial_state)
+        thing.observers.attach(observer, new_state=new_state)
+        thing.observers.detach(observer)
+
+        thing.update()
+
+        observer.assert_not_notified()
+        assert len(thing.observers) == 0
+
+    def test_state_change_subscriptions_are_profiled(self):
+        new_state = State()
+        initial_state = ImmediateChangeState(next_state=new_state)
+        observer = StateChangeObserver()
+
+        thing = Thing(initial_state)
+        thing.observers.attach(observer, new_state=new_state)
+        thing.observers.start_profiling()
+
+        thing.update()
+
+        report = thing.observers.profile_report()
+        assert report[(observer, "state_changed")].count == 1
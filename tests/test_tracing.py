@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Aaron Silinskas for Mindwidgets
+#
+# SPDX-License-Identifier: MIT
+import json
+from src.state_of_things import State, Thing
+from src.state_of_things.tracing import Tracer
+from .fixtures.observer import CustomNotifierState
+from .fixtures.state import ImmediateChangeState
+
+
+class TracedThing(Thing):
+    pass
+
+
+class TestTracer:
+    def test_records_thing_activity(self):
+        tracer = Tracer(names=["traced"])
+        tracer.start()
+        try:
+            new_state = CustomNotifierState("hello")
+            thing = Thing(ImmediateChangeState(next_state=new_state), name="traced")
+            thing.update()
+        finally:
+            tracer.stop()
+
+        # spans are recorded in the order they end
+        assert [(category, name) for _, category, name, _, _ in tracer.spans()] == [
+            ("enter", "ImmediateChangeState"),
+            ("notify", "state_entered"),
+            ("transition", "None -> ImmediateChangeState"),
+            ("exit", "ImmediateChangeState"),
+            ("notify", "state_changed"),
+            ("notify", "custom_event"),
+            ("enter", "CustomNotifierState"),
+            ("notify", "state_entered"),
+            ("transition", "ImmediateChangeState -> CustomNotifierState"),
+            ("update", "CustomNotifierState"),
+        ]
+        assert all(duration >= 0 for _, _, _, _, duration in tracer.spans())
+
+    def test_only_selected_things_are_traced(self):
+        tracer = Tracer(classes=[TracedThing])
+        tracer.start()
+        try:
+            Thing(State()).update()
+            TracedThing(State(), name="by class").update()
+        finally:
+            tracer.stop()
+
+        assert {thing_name for thing_name, _, _, _, _ in tracer.spans()} == {"by class"}
+
+    def test_stopped_tracer_records_nothing(self):
+        tracer = Tracer()
+        tracer.start()
+        tracer.stop()
+
+        Thing(State()).update()
+
+        assert Thing.tracer is None
+        assert len(tracer) == 0
+
+    def test_ring_buffer_keeps_latest_spans(self):
+        tracer = Tracer(capacity=3)
+        thing = Thing(State())
+        for index in range(5):
+            tracer.record(thing, "update", str(index), tracer.clock())
+
+        assert len(tracer) == 3
+        assert [name for _, _, name, _, _ in tracer.spans()] == ["2", "3", "4"]
+
+    def test_dump_chrome_trace(self, tmp_path):
+        tracer = Tracer()
+        thing = Thing(State(), name="dumped")
+        tracer.record(thing, "update", "State", tracer.clock())
+
+        path = tmp_path / "trace.json"
+        tracer.dump(str(path))
+
+        events = json.loads(path.read_text())["traceEvents"]
+        assert events[0]["ph"] == "M"
+        assert events[0]["args"] == {"name": "dumped"}
+        assert events[1]["ph"] == "X"
+        assert events[1]["name"] == "update State"
+        assert events[1]["tid"] == events[0]["tid"]